@@ -0,0 +1,46 @@
+"""add table outbox_event
+
+Revision ID: 3b1f6d2a9c41
+Revises: 7ae2222bd204
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b1f6d2a9c41'
+down_revision: Union[str, None] = '7ae2222bd204'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('el_outbox_event',
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('task_name', sa.String(length=100), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('created', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('published', sa.DateTime(), nullable=True),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_error', sa.String(length=500), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_el_outbox_event'))
+    )
+    op.create_index(
+        'ix_el_outbox_event_not_published',
+        'el_outbox_event',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text('published IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_el_outbox_event_not_published', table_name='el_outbox_event')
+    op.drop_table('el_outbox_event')
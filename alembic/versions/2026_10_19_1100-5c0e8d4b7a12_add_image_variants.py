@@ -0,0 +1,33 @@
+"""add image variants
+
+Revision ID: 5c0e8d4b7a12
+Revises: 3b1f6d2a9c41
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c0e8d4b7a12'
+down_revision: Union[str, None] = '3b1f6d2a9c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+IMAGE_TABLES = ('el_brand_image', 'el_rubric_image', 'el_product_image')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table_name in IMAGE_TABLES:
+        op.add_column(table_name, sa.Column('variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in IMAGE_TABLES:
+        op.drop_column(table_name, 'variants')
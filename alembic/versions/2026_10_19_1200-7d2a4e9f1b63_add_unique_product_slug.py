@@ -0,0 +1,40 @@
+"""add unique product slug
+
+Revision ID: 7d2a4e9f1b63
+Revises: 5c0e8d4b7a12
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a4e9f1b63'
+down_revision: Union[str, None] = '5c0e8d4b7a12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # titles are unique, but different titles may give the same slug: keeping the first one
+    op.execute(
+        sa.text(
+            """
+            UPDATE el_product SET slug = el_product.slug || '-' || el_product.id
+            FROM (
+                SELECT id, row_number() OVER (PARTITION BY slug ORDER BY id) AS position FROM el_product
+            ) AS duplicates
+            WHERE el_product.id = duplicates.id AND duplicates.position > 1
+            """
+        )
+    )
+    op.create_unique_constraint(op.f('uq_el_product_slug'), 'el_product', ['slug'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(op.f('uq_el_product_slug'), 'el_product', type_='unique')
@@ -0,0 +1,65 @@
+"""add table order_item
+
+Revision ID: 9a3c5e7b2d14
+Revises: 7d2a4e9f1b63
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a3c5e7b2d14'
+down_revision: Union[str, None] = '7d2a4e9f1b63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('el_order_item',
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('price', sa.DECIMAL(precision=8, scale=2), nullable=False),
+    sa.Column('snapshot', sa.JSON(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.CheckConstraint('quantity > 0', name=op.f('ck_el_order_item_check_quantity_min_value')),
+    sa.ForeignKeyConstraint(['order_id'], ['el_order.id'], name=op.f('fk_el_order_item_order_id_el_order'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['product_id'], ['el_product.id'], name=op.f('fk_el_order_item_product_id_el_product'), ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_el_order_item'))
+    )
+
+    # backfill from order_content snapshots before building indexes;
+    # products deleted since the order was placed keep only the snapshot
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO el_order_item (order_id, product_id, quantity, price, snapshot)
+            SELECT
+                el_order.id,
+                el_product.id,
+                (item ->> 'quantity')::integer,
+                (item ->> 'price')::numeric(8, 2),
+                item -> 'product'
+            FROM el_order
+            CROSS JOIN LATERAL json_array_elements(el_order.order_content) WITH ORDINALITY AS content(item, position)
+            LEFT JOIN el_product ON el_product.id = (item -> 'product' ->> 'id')::integer
+            WHERE (item ->> 'quantity')::integer > 0
+            ORDER BY el_order.id, content.position
+            """
+        )
+    )
+
+    op.create_index(op.f('ix_el_order_item_order_id'), 'el_order_item', ['order_id'], unique=False)
+    op.create_index(op.f('ix_el_order_item_product_id'), 'el_order_item', ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_el_order_item_product_id'), table_name='el_order_item')
+    op.drop_index(op.f('ix_el_order_item_order_id'), table_name='el_order_item')
+    op.drop_table('el_order_item')
@@ -0,0 +1,45 @@
+"""add table sales_rollup
+
+Revision ID: b4e8d1f6a3c7
+Revises: 9a3c5e7b2d14
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e8d1f6a3c7'
+down_revision: Union[str, None] = '9a3c5e7b2d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    metrics = []
+    for kind in ('placed', 'delivered', 'cancelled'):
+        metrics += [
+            sa.Column(f'orders_{kind}', sa.Integer(), server_default='0', nullable=False),
+            sa.Column(f'units_{kind}', sa.Integer(), server_default='0', nullable=False),
+            sa.Column(f'revenue_{kind}', sa.DECIMAL(precision=14, scale=2), server_default='0', nullable=False),
+        ]
+    op.create_table('el_sales_rollup',
+    sa.Column('granularity', sa.String(length=5), nullable=False),
+    sa.Column('period_start', sa.DateTime(), nullable=False),
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('dimension_id', sa.Integer(), nullable=False),
+    *metrics,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_el_sales_rollup')),
+    sa.UniqueConstraint('granularity', 'dimension', 'period_start', 'dimension_id', name='granularity_dimension_period')
+    )
+    # existing orders are rolled up by `python -m src.scripts.rebuild_sales_rollups`
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('el_sales_rollup')
@@ -0,0 +1,118 @@
+"""partition order by time_placed
+
+Revision ID: c6f2a9d4e8b1
+Revises: b4e8d1f6a3c7
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f2a9d4e8b1'
+down_revision: Union[str, None] = 'b4e8d1f6a3c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    'id, user_id, phonenumber, total_cost, order_content, person_content, address_content, '
+    'time_placed, time_delivered, move_to, payment_conditions, status'
+)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def create_order_table(partitioned: bool) -> None:
+    op.create_table('el_order',
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('phonenumber', sa.String(length=20), nullable=False),
+    sa.Column('total_cost', sa.DECIMAL(precision=8, scale=2), nullable=False),
+    sa.Column('order_content', sa.JSON(), nullable=False),
+    sa.Column('person_content', sa.JSON(), nullable=False),
+    sa.Column('address_content', sa.JSON(), nullable=False),
+    sa.Column('time_placed', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('time_delivered', sa.DateTime(), nullable=True),
+    sa.Column('move_to', sa.Integer(), nullable=False),
+    sa.Column('payment_conditions', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('el_order_id_seq')"), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['el_user.id'], name=op.f('fk_el_order_user_id_el_user'), ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint(*(('id', 'time_placed') if partitioned else ('id', )), name=op.f('pk_el_order')),
+    **({'postgresql_partition_by': 'RANGE (time_placed)'} if partitioned else {})
+    )
+    op.execute("ALTER SEQUENCE el_order_id_seq OWNED BY el_order.id")
+    op.create_index('ix_el_order_user_id_time_placed', 'el_order', ['user_id', 'time_placed'], unique=False)
+    op.create_index('ix_el_order_status_time_placed', 'el_order', ['status', 'time_placed'], unique=False)
+
+
+def rename_order_table() -> None:
+    # constraint names are reused by the new table; the id sequence must survive the old table drop
+    op.execute("ALTER TABLE el_order RENAME TO el_order_old")
+    op.execute("ALTER TABLE el_order_old RENAME CONSTRAINT pk_el_order TO pk_el_order_old")
+    op.execute("ALTER TABLE el_order_old RENAME CONSTRAINT fk_el_order_user_id_el_user TO fk_el_order_old_user_id")
+    op.execute("ALTER SEQUENCE el_order_id_seq OWNED BY NONE")
+    op.execute("DROP INDEX IF EXISTS ix_el_order_user_id_time_placed")
+    op.execute("DROP INDEX IF EXISTS ix_el_order_status_time_placed")
+    op.drop_constraint('fk_el_order_item_order_id_el_order', 'el_order_item', type_='foreignkey')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    rename_order_table()
+    create_order_table(partitioned=True)
+
+    # monthly partitions from the first order up to MONTHS_AHEAD months ahead,
+    # later ones are created by the task_maintain_order_partitions beat job
+    first_placed = op.get_bind().execute(sa.text("SELECT min(time_placed) FROM el_order_old")).scalar()
+    current = date.today().replace(day=1)
+    month = first_placed.date().replace(day=1) if first_placed else current
+    while month <= add_months(current, MONTHS_AHEAD):
+        op.execute(
+            f"CREATE TABLE el_order_y{month.year}m{month.month:02d} PARTITION OF el_order "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        )
+        month = add_months(month, 1)
+    # safety net for rows outside of created partitions, expected to stay empty
+    op.execute("CREATE TABLE el_order_default PARTITION OF el_order DEFAULT")
+
+    op.execute(f"INSERT INTO el_order ({COLUMNS}) SELECT {COLUMNS} FROM el_order_old")
+
+    op.add_column('el_order_item', sa.Column('order_time_placed', sa.DateTime(), nullable=True))
+    op.execute(
+        "UPDATE el_order_item SET order_time_placed = el_order_old.time_placed "
+        "FROM el_order_old WHERE el_order_old.id = el_order_item.order_id"
+    )
+    op.alter_column('el_order_item', 'order_time_placed', nullable=False)
+    op.create_foreign_key(
+        op.f('fk_el_order_item_order_id_el_order'), 'el_order_item', 'el_order',
+        ['order_id', 'order_time_placed'], ['id', 'time_placed'], ondelete='CASCADE',
+    )
+
+    op.drop_table('el_order_old')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # archived partitions are not restored
+    rename_order_table()
+    create_order_table(partitioned=False)
+    op.execute(f"INSERT INTO el_order ({COLUMNS}) SELECT {COLUMNS} FROM el_order_old")
+
+    op.drop_column('el_order_item', 'order_time_placed')
+    op.create_foreign_key(
+        op.f('fk_el_order_item_order_id_el_order'), 'el_order_item', 'el_order',
+        ['order_id'], ['id'], ondelete='CASCADE',
+    )
+
+    # partitions are dropped together with the partitioned table
+    op.drop_table('el_order_old')
@@ -0,0 +1,51 @@
+"""add foreign key and listing indexes
+
+Revision ID: d1e7b3a9c5f2
+Revises: c6f2a9d4e8b1
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1e7b3a9c5f2'
+down_revision: Union[str, None] = 'c6f2a9d4e8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# name, table, columns, options
+INDEXES = (
+    ('ix_el_product_brand_id', 'el_product', ['brand_id'], {}),
+    ('ix_el_product_available_price', 'el_product', ['price'], {'postgresql_where': sa.text('available')}),
+    ('ix_el_product_image_product_id', 'el_product_image', ['product_id'], {}),
+    ('ix_el_vote_user_id', 'el_vote', ['user_id'], {}),
+    ('ix_el_post_product_id', 'el_post', ['product_id'], {}),
+    ('ix_el_post_user_id', 'el_post', ['user_id'], {}),
+    ('ix_el_cart_item_cart_id', 'el_cart_item', ['cart_id'], {}),
+    ('ix_el_rubric_product_association_product_id', 'el_rubric_product_association', ['product_id'], {}),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # partitioned tables do not support CONCURRENTLY, the index is created on every partition
+    op.create_index(op.f('ix_el_order_time_placed'), 'el_order', ['time_placed'], unique=False)
+
+    # built without locking writes; CONCURRENTLY is not allowed inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            op.create_index(op.f(name), table, columns, unique=False, postgresql_concurrently=True, **options)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(op.f(name), table_name=table, postgresql_concurrently=True)
+
+    op.drop_index(op.f('ix_el_order_time_placed'), table_name='el_order')
@@ -0,0 +1,132 @@
+"""
+Authenticated request overhead: what current_user adds to a request.
+
+A bare app with the real auth dependencies (bearer token, JWT strategy, user manager, DB session)
+and two routes, one anonymous and one with current_user, is called in process. The difference of
+their latencies is the authentication cost. It is measured for:
+
+    pem        - PEM keys parsed on every verification, no caches (the previous behaviour)
+    keys       - parsed keys, no caches
+    claims     - parsed keys, verified tokens cached
+    cached     - parsed keys, verified tokens and users cached
+
+The user is any existing one, e.g. generated by src.scripts.generate_data.
+
+    python -m benchmarks.auth --requests 2000
+    python -m benchmarks.auth --email bench-0@example.com --concurrency 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from fastapi_users.authentication import JWTStrategy
+from sqlalchemy import select
+
+from src.api.v1.auth import backend
+from src.api.v1.auth.cache import claims_cache, user_cache
+from src.api.v1.users.user.dependencies import current_user
+from src.core.config import DBConfigurer
+from src.core.models import User
+from src.core.settings import settings
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/anonymous")
+    async def anonymous():
+        return {"ok": True}
+
+    @app.get("/authenticated")
+    async def authenticated(user: User = Depends(current_user)):
+        return {"id": user.id}
+
+    return app
+
+
+def get_pem_strategy() -> JWTStrategy:
+    return JWTStrategy(
+        secret=settings.auth.AUTH_PRIVATE_KEY.read_text(),
+        lifetime_seconds=settings.auth.AUTH_TOKEN_LIFETIME,
+        algorithm="RS256",
+        public_key=settings.auth.AUTH_PUBLIC_KEY.read_text(),
+    )
+
+
+def set_mode(app: FastAPI, mode: str) -> None:
+    app.dependency_overrides.clear()
+    if mode == "pem":
+        app.dependency_overrides[backend.get_jwt_strategy] = get_pem_strategy
+    elif mode == "keys":
+        strategy = backend.get_jwt_strategy()
+        app.dependency_overrides[backend.get_jwt_strategy] = lambda: JWTStrategy(
+            secret=strategy.secret,
+            lifetime_seconds=strategy.lifetime_seconds,
+            algorithm=strategy.algorithm,
+            public_key=strategy.public_key,
+        )
+    claims_cache.clear()
+    user_cache.local.clear()
+    claims_cache.maxsize = settings.auth.AUTH_CLAIMS_CACHE_SIZE if mode in ("claims", "cached") else 0
+    user_cache.local.maxsize = settings.auth.AUTH_USER_CACHE_LOCAL_SIZE if mode == "cached" else 0
+    user_cache.ttl = settings.auth.AUTH_USER_CACHE_TTL_SECONDS if mode == "cached" else 0
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int, concurrency: int) -> list[float]:
+    timings = []
+    queue = iter(range(requests))
+
+    async def worker():
+        for _ in queue:
+            started = time.perf_counter()
+            response = await client.get(path)
+            timings.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise SystemExit(f"{path}: {response.status_code} {response.text}")
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return sorted(timings)
+
+
+async def main(args) -> None:
+    async with DBConfigurer.Session() as session:
+        stmt = select(User).where(User.is_active, User.is_verified)
+        user = await session.scalar(stmt.where(User.email == args.email) if args.email else stmt.limit(1))
+    if user is None:
+        raise SystemExit("no active verified user found, generate data first")
+    token = await backend.get_jwt_strategy().write_token(user)
+
+    app = make_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver", headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        print(f"{args.requests} requests by {args.concurrency}, latency in ms\n")
+        print(f"{'mode':<10}{'route':<16}{'p50':>9}{'p95':>9}{'p99':>9}{'overhead p50':>15}")
+        for mode in ("pem", "keys", "claims", "cached"):
+            set_mode(app, mode)
+            results = {}
+            for path in ("/anonymous", "/authenticated"):
+                await measure(client, path, args.warmup, args.concurrency)
+                results[path] = await measure(client, path, args.requests, args.concurrency)
+            base = statistics.median(results["/anonymous"])
+            for path, timings in results.items():
+                overhead = f"{(statistics.median(timings) - base) * 1000:>15.2f}" if path != "/anonymous" else ""
+                print(
+                    f"{mode:<10}{path:<16}{timings[len(timings) // 2] * 1000:>9.2f}"
+                    f"{timings[int(len(timings) * 0.95) - 1] * 1000:>9.2f}"
+                    f"{timings[int(len(timings) * 0.99) - 1] * 1000:>9.2f}{overhead}"
+                )
+    await DBConfigurer.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--email", help="user to authenticate as, any active verified one by default")
+    parser.add_argument("--requests", type=int, default=1000, help="measured requests per route and mode")
+    parser.add_argument("--warmup", type=int, default=100, help="requests per route and mode before measuring")
+    parser.add_argument("--concurrency", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,133 @@
+"""
+Response compression: bytes on the wire and latency.
+
+In-process (default): a representative order list JSON body goes through CompressionMiddleware
+for every gzip level / brotli quality, reporting size, ratio and compression time per response.
+
+    python -m benchmarks.compression --orders 300
+
+Against a running app, every path is requested with identity, gzip and br:
+
+    python -m benchmarks.compression --url http://localhost:8000 --token <superuser jwt> \\
+        --path /api/v1/orders/full --path /api/v1/carts/full --path /api/v1/store/products/full
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import orjson
+
+from src.tools.compression import CompressionMiddleware, brotli
+
+
+def make_orders_payload(orders: int) -> bytes:
+    # same shape as OrderRead with embedded order_content
+    random.seed(orders)
+    started = datetime(2025, 1, 1)
+    return orjson.dumps([
+        {
+            "id": order_id,
+            "user_id": random.randint(1, 500),
+            "phone": f"+7999{random.randint(1000000, 9999999)}",
+            "status": random.choice(["placed", "paid", "delivered"]),
+            "created": (started + timedelta(minutes=order_id * 7)).isoformat(),
+            "total_cost": f"{random.uniform(100, 50000):.2f}",
+            "order_content": {
+                str(product_id): {
+                    "title": f"Product {product_id}",
+                    "slug": f"product-{product_id}",
+                    "quantity": random.randint(1, 5),
+                    "price": f"{random.uniform(10, 10000):.2f}",
+                    "image_file": f"media/images/{product_id:02x}/{'%064x' % product_id}.thumb.jpg",
+                }
+                for product_id in random.sample(range(1, 2000), random.randint(1, 8))
+            },
+        }
+        for order_id in range(1, orders + 1)
+    ])
+
+
+async def compress_in_process(body: bytes, encoding: str, level: int, chunk_size: int) -> tuple[int, float]:
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        for offset in range(0, len(body), chunk_size):
+            await send({
+                "type": "http.response.body",
+                "body": body[offset:offset + chunk_size],
+                "more_body": offset + chunk_size < len(body),
+            })
+
+    middleware = CompressionMiddleware(app, gzip_level=level, brotli_quality=level)
+    sent = 0
+
+    async def send(message):
+        nonlocal sent
+        if message["type"] == "http.response.body":
+            sent += len(message["body"])
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", encoding.encode())]}
+    started = time.perf_counter()
+    await middleware(scope, None, send)
+    return sent, time.perf_counter() - started
+
+
+async def run_in_process(args) -> None:
+    body = make_orders_payload(args.orders)
+    print(f"order list JSON: {len(body) / 1024:.1f} KiB, streamed by {args.chunk_size} B chunks\n")
+    print(f"{'encoding':<10}{'level':>6}{'KiB':>10}{'ratio':>8}{'ms':>10}")
+
+    variants = [("gzip", level) for level in (1, 3, 5, 6, 9)]
+    if brotli is not None:
+        variants += [("br", quality) for quality in (1, 3, 4, 5, 7, 11)]
+    for encoding, level in variants:
+        timings = []
+        for _ in range(args.repeat):
+            size, elapsed = await compress_in_process(body, encoding, level, args.chunk_size)
+            timings.append(elapsed)
+        print(f"{encoding:<10}{level:>6}{size / 1024:>10.1f}{len(body) / size:>8.1f}{statistics.median(timings) * 1000:>10.2f}")
+
+
+async def run_against_server(args) -> None:
+    import httpx
+
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, timeout=60) as client:
+        print(f"{'path':<40}{'encoding':<10}{'wire KiB':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        for path in args.path:
+            for encoding in ("identity", "gzip", "br"):
+                timings, wire_bytes = [], 0
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    response = await client.get(path, headers={"Accept-Encoding": encoding})
+                    await response.aread()
+                    timings.append(time.perf_counter() - started)
+                    wire_bytes = response.num_bytes_downloaded
+                timings.sort()
+                print(
+                    f"{path:<40}{response.headers.get('content-encoding', 'identity'):<10}{wire_bytes / 1024:>10.1f}"
+                    f"{timings[len(timings) // 2] * 1000:>10.1f}{timings[int(len(timings) * 0.95) - 1] * 1000:>10.1f}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=300, help="orders in the in-process payload")
+    parser.add_argument("--chunk-size", type=int, default=64 * 1024)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--url", help="benchmark a running app instead of the in-process middleware")
+    parser.add_argument("--path", action="append", default=[])
+    parser.add_argument("--token", help="superuser access token for /full endpoints")
+    args = parser.parse_args()
+
+    asyncio.run(run_against_server(args) if args.url else run_in_process(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Streaming export memory: peak Python allocations and RSS while exporting orders.
+
+Seeds synthetic orders (marked by phonenumber prefix, removed by --cleanup) and consumes
+the same chunk iterator the /orders/export endpoint streams, so memory is measured
+without an HTTP client in between.
+
+    python -m benchmarks.exports --seed 1000000
+    python -m benchmarks.exports --format csv
+    python -m benchmarks.exports --compare-full 50000    # old /orders/full path for reference
+    python -m benchmarks.exports --cleanup
+"""
+import argparse
+import asyncio
+import resource
+import time
+import tracemalloc
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import joinedload
+
+from src.core.config import DBConfigurer
+from src.core.models import Order
+from src.tools.exports import iter_export
+from src.tools.moveto_choices import MoveToChoices
+from src.tools.payment_conditions_choices import PaymentChoices
+from src.tools.status_choices import StatusChoices
+
+PHONE_PREFIX = "+0bench"
+
+SEED_SQL = f"""
+INSERT INTO {Order.__tablename__} (
+    user_id, phonenumber, total_cost, order_content, person_content, address_content,
+    time_placed, move_to, payment_conditions, status
+)
+SELECT
+    NULL,
+    '{PHONE_PREFIX}' || n,
+    (n % 50000) / 100.0 + 1,
+    json_build_array(
+        json_build_object(
+            'product', json_build_object('id', n % 2000 + 1, 'title', 'Product ' || (n % 2000 + 1)),
+            'quantity', n % 5 + 1,
+            'price', '100.00'
+        ),
+        json_build_object(
+            'product', json_build_object('id', n % 1500 + 1, 'title', 'Product ' || (n % 1500 + 1)),
+            'quantity', 1,
+            'price', '250.00'
+        )
+    ),
+    json_build_object('name', 'Bench', 'surname', 'Customer', 'email', 'bench@example.com'),
+    json_build_object('city', 'Bench city', 'street', 'Main', 'house', n % 200 + 1),
+    now() - n * interval '1 minute',
+    :move_to, :payment_conditions, :status
+FROM generate_series(:start, :stop) AS n
+"""
+
+
+def max_rss_mib() -> float:
+    # kilobytes on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def seed(count: int, batch: int = 100_000) -> None:
+    async with DBConfigurer.Session() as session:
+        started = time.perf_counter()
+        for start in range(1, count + 1, batch):
+            await session.execute(text(SEED_SQL), {
+                "start": start,
+                "stop": min(start + batch - 1, count),
+                "move_to": MoveToChoices.TO_CUSTOMER_ADDRESS.value,
+                "payment_conditions": PaymentChoices.P_WAITS.value,
+                "status": StatusChoices.S_ORDERED.value,
+            })
+            await session.commit()
+        print(f"seeded {count} orders in {time.perf_counter() - started:.1f}s")
+
+
+async def cleanup() -> None:
+    async with DBConfigurer.Session() as session:
+        result = await session.execute(delete(Order).where(Order.phonenumber.startswith(PHONE_PREFIX)))
+        await session.commit()
+        print(f"removed {result.rowcount} orders")
+
+
+async def run_export(file_format: str, yield_per: int) -> None:
+    stmt = select(*Order.__table__.columns).order_by(Order.time_placed, Order.id)
+    rss_before = max_rss_mib()
+    tracemalloc.start()
+    started = time.perf_counter()
+    first_chunk_at, chunks, size = None, 0, 0
+    async for chunk in iter_export(stmt, file_format=file_format, yield_per=yield_per):
+        if first_chunk_at is None:
+            first_chunk_at = time.perf_counter() - started
+        chunks += 1
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"export {file_format}, yield_per={yield_per}: {size / 1024 ** 2:.1f} MiB in {chunks} chunks, "
+        f"{elapsed:.1f}s, first chunk {(first_chunk_at or 0) * 1000:.0f} ms\n"
+        f"  peak python allocations {peak / 1024 ** 2:.1f} MiB, "
+        f"max RSS {rss_before:.0f} -> {max_rss_mib():.0f} MiB"
+    )
+
+
+async def run_full(limit: int) -> None:
+    from src.api.v1.orders.order.utils import get_schema_from_orm
+
+    rss_before = max_rss_mib()
+    tracemalloc.start()
+    started = time.perf_counter()
+    async with DBConfigurer.Session() as session:
+        # what /orders/full does before paginating
+        stmt = select(Order).options(joinedload(Order.user)).order_by(Order.id).limit(limit)
+        orm_models = (await session.execute(stmt)).unique().scalars().all()
+        schemas = [await get_schema_from_orm(orm_model=orm_model) for orm_model in orm_models]
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"full list of {len(schemas)} orders: {elapsed:.1f}s\n"
+        f"  peak python allocations {peak / 1024 ** 2:.1f} MiB, "
+        f"max RSS {rss_before:.0f} -> {max_rss_mib():.0f} MiB"
+    )
+
+
+async def main(args) -> None:
+    if args.cleanup:
+        await cleanup()
+    else:
+        if args.seed:
+            await seed(args.seed)
+        if args.compare_full:
+            await run_full(args.compare_full)
+        await run_export(args.format, args.yield_per)
+    await DBConfigurer.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="insert this many synthetic orders first")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--yield-per", type=int, default=1000)
+    parser.add_argument("--compare-full", type=int, default=0, help="also load N orders the /full way")
+    parser.add_argument("--cleanup", action="store_true", help="remove seeded orders and exit")
+    asyncio.run(main(parser.parse_args()))
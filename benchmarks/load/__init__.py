@@ -0,0 +1,24 @@
+"""
+End-to-end load: browse, session cart, login with cart merge, checkout and vote flows
+driven through the whole app stack (middleware, dependencies, services, Postgres, Redis).
+
+The app runs in-process behind httpx.ASGITransport by default, or --url points the
+virtual users at a running server. Every virtual user gets its own cookie jar, so
+anonymous sessions and carts are separate. Latency is reported per route template.
+
+    RATE_LIMITER_CALLS=1000000 python -m benchmarks.load --seed 20000
+    RATE_LIMITER_CALLS=1000000 python -m benchmarks.load --users 50 --duration 60 --output results/main.json
+    python -m benchmarks.load --users 50 --duration 60 --compare results/main.json
+    python -m benchmarks.load --url http://localhost:8000 --scenario browse=8 --scenario checkout=1
+    python -m benchmarks.load --cleanup
+
+p99 of catalog routes under a burst of logins, password hashing in the event loop vs in the pool:
+
+    AUTH_PASSWORD_WORKERS=0 python -m benchmarks.load --scenario browse=4 --scenario login_only=1 --output results/inline.json
+    python -m benchmarks.load --scenario browse=4 --scenario login_only=1 --compare results/inline.json
+
+Needs local Postgres and Redis configured in src/.env (the same databases the app uses,
+migrated with alembic). The rate limiter is part of the app, raise RATE_LIMITER_CALLS
+for the run or most requests end with 429. --compare exits with 1 when p95 latency or
+throughput of an endpoint is worse than the saved run by more than --tolerance.
+"""
@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+import orjson
+
+from benchmarks.load import __doc__ as description
+from benchmarks.load.runner import compare, print_summary, run
+from benchmarks.load.scenarios import DEFAULT_WEIGHTS, SCENARIOS
+from benchmarks.load.seed import cleanup, load_catalog, seed
+from src.core.config import DBConfigurer
+
+
+def get_weights(values: list[str]) -> dict[str, int]:
+    if not values:
+        return DEFAULT_WEIGHTS
+    weights = {}
+    for value in values:
+        name, _, weight = value.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"unknown scenario {name!r}, one of: {', '.join(SCENARIOS)}")
+        weights[name] = int(weight or 1)
+    return weights
+
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args) -> int:
+    if args.cleanup:
+        await cleanup()
+        await DBConfigurer.dispose()
+        return 0
+    if args.seed:
+        await seed(args.seed)
+    catalog = await load_catalog()
+    weights = get_weights(args.scenario)
+
+    if args.url:
+        def make_client() -> httpx.AsyncClient:
+            return httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        from src.main import app
+
+        transport = httpx.ASGITransport(app=app)
+
+        def make_client() -> httpx.AsyncClient:
+            return httpx.AsyncClient(transport=transport, base_url="http://testserver", timeout=args.timeout)
+
+    if args.warmup:
+        await run(make_client, SCENARIOS, weights, catalog, args.users, args.warmup, seed=args.random_seed + 1)
+    started = time.perf_counter()
+    recorder, flows = await run(make_client, SCENARIOS, weights, catalog, args.users, args.duration, args.random_seed)
+    duration = time.perf_counter() - started
+    await DBConfigurer.dispose()
+
+    summary = recorder.summary(duration)
+    print(f"flows: {', '.join(f'{name} {count}' for name, count in flows.most_common())}")
+    print_summary(summary, duration)
+
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(orjson.dumps({
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "commit": get_commit(),
+            "target": args.url or "in-process",
+            "users": args.users,
+            "duration": round(duration, 2),
+            "weights": weights,
+            "flows": dict(flows),
+            "endpoints": summary,
+        }, option=orjson.OPT_INDENT_2))
+        print(f"saved to {path}")
+
+    if args.compare:
+        baseline = orjson.loads(Path(args.compare).read_bytes())
+        return compare(summary, baseline["endpoints"], args.tolerance)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=description, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="insert this many synthetic products with relations first")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds run before measuring, not reported")
+    parser.add_argument(
+        "--scenario", action="append", default=[], metavar="NAME[=WEIGHT]",
+        help=f"flows to run with relative weights, default: {' '.join(f'{k}={v}' for k, v in DEFAULT_WEIGHTS.items())}",
+    )
+    parser.add_argument("--url", help="base url of a running app instead of the in-process one")
+    parser.add_argument("--timeout", type=float, default=30, help="request timeout, seconds")
+    parser.add_argument("--random-seed", type=int, default=1, help="flows and products chosen by visitors")
+    parser.add_argument("--output", help="save results as JSON")
+    parser.add_argument("--compare", help="JSON of a previous run, exit with 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 / throughput change for --compare")
+    parser.add_argument("--cleanup", action="store_true", help="remove seeded data and checkout orders and exit")
+    sys.exit(1 if asyncio.run(main(parser.parse_args())) else 0)
@@ -0,0 +1,132 @@
+import asyncio
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable
+
+import httpx
+
+
+def get_percentile(values: list[float], percent: float) -> float:
+    # nearest rank, values are sorted
+    return values[min(len(values) - 1, max(0, round(percent / 100 * len(values)) - 1))]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+
+    def add(self, name: str, elapsed: float, status: int | str) -> None:
+        self.latencies[name].append(elapsed)
+        self.statuses[name][status] += 1
+
+    def summary(self, duration: float) -> dict[str, dict[str, Any]]:
+        result = {}
+        for name, latencies in sorted(self.latencies.items()):
+            latencies = sorted(latencies)
+            statuses = self.statuses[name]
+            result[name] = {
+                "requests": len(latencies),
+                "rps": round(len(latencies) / duration, 2),
+                "p50_ms": round(get_percentile(latencies, 50) * 1000, 2),
+                "p95_ms": round(get_percentile(latencies, 95) * 1000, 2),
+                "p99_ms": round(get_percentile(latencies, 99) * 1000, 2),
+                "max_ms": round(latencies[-1] * 1000, 2),
+                "errors": sum(
+                    count for status, count in statuses.items() if not isinstance(status, int) or status >= 400
+                ),
+                "statuses": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+            }
+        return result
+
+
+class VirtualUser:
+    """
+    One visitor: own cookie jar (anonymous session), bearer token after login.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder):
+        self.client = client
+        self.recorder = recorder
+        self.token: str | None = None
+
+    async def request(self, method: str, name: str, url: str, **kwargs) -> httpx.Response | None:
+        if self.token:
+            kwargs["headers"] = {"Authorization": f"Bearer {self.token}", **kwargs.get("headers", {})}
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.recorder.add(f"{method} {name}", time.perf_counter() - started, type(exc).__name__)
+            return None
+        self.recorder.add(f"{method} {name}", time.perf_counter() - started, response.status_code)
+        return response
+
+    async def get(self, name: str, url: str, **kwargs) -> httpx.Response | None:
+        return await self.request("GET", name, url, **kwargs)
+
+    async def post(self, name: str, url: str, **kwargs) -> httpx.Response | None:
+        return await self.request("POST", name, url, **kwargs)
+
+
+async def run(
+        make_client: Callable[[], httpx.AsyncClient],
+        scenarios: dict[str, Callable],
+        weights: dict[str, int],
+        catalog: Any,
+        users: int,
+        duration: float,
+        seed: int,
+) -> tuple[Recorder, Counter]:
+    """
+    `users` visitors run flows chosen by `weights` back to back until `duration` runs out;
+    every flow starts with a new client, i.e. a new visitor without cookies.
+    """
+    recorder = Recorder()
+    flows: Counter = Counter()
+    deadline = time.perf_counter() + duration
+    names, flow_weights = list(weights), list(weights.values())
+
+    async def visitor(number: int) -> None:
+        rng = random.Random(seed * 1000 + number)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, flow_weights)[0]
+            async with make_client() as client:
+                await scenarios[name](VirtualUser(client, recorder), catalog, rng)
+            flows[name] += 1
+
+    await asyncio.gather(*(visitor(number) for number in range(users)))
+    return recorder, flows
+
+
+def print_summary(summary: dict[str, dict[str, Any]], duration: float) -> None:
+    print(f"\n{'endpoint':<48}{'req':>8}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'err':>7}")
+    for name, row in summary.items():
+        print(
+            f"{name:<48}{row['requests']:>8}{row['rps']:>9.1f}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+            f"{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}{row['errors']:>7}"
+        )
+    total = sum(row["requests"] for row in summary.values())
+    errors = sum(row["errors"] for row in summary.values())
+    print(f"\n{total} requests in {duration:.0f}s, {total / duration:.1f} rps, {errors} errors (latency in ms)")
+
+
+def compare(summary: dict[str, dict[str, Any]], baseline: dict[str, dict[str, Any]], tolerance: float) -> int:
+    """
+    Endpoints whose p95 grew or throughput fell by more than `tolerance` (a share) against the baseline.
+    """
+    regressions = 0
+    print(f"\n{'endpoint':<48}{'p95 base':>10}{'p95 now':>10}{'rps base':>10}{'rps now':>10}")
+    for name, row in summary.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        worse = row["p95_ms"] > base["p95_ms"] * (1 + tolerance) or row["rps"] < base["rps"] * (1 - tolerance)
+        regressions += worse
+        print(
+            f"{name:<48}{base['p95_ms']:>10.1f}{row['p95_ms']:>10.1f}{base['rps']:>10.1f}{row['rps']:>10.1f}"
+            f"{'  REGRESSION' if worse else ''}"
+        )
+    print(f"\n{regressions} endpoint(s) regressed by more than {tolerance:.0%}")
+    return regressions
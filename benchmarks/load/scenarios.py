@@ -0,0 +1,121 @@
+import random
+from typing import Awaitable, Callable
+
+from src.core.settings import settings
+from .runner import VirtualUser
+from .seed import PASSWORD, PERSON_NAME, Catalog
+
+API = f"{settings.app.API_PREFIX}{settings.app.API_V1_PREFIX}"
+PRODUCTS = f"{API}{settings.tags.PRODUCTS_PREFIX}"
+BRANDS = f"{API}{settings.tags.BRANDS_PREFIX}"
+RUBRICS = f"{API}{settings.tags.RUBRICS_PREFIX}"
+VOTES = f"{API}{settings.tags.VOTES_PREFIX}"
+SESSIONS = f"{API}{settings.tags.SESSIONS_PREFIX}"
+CARTS = f"{API}{settings.tags.CARTS_PREFIX}"
+AUTH = f"{API}{settings.tags.AUTH_PREFIX}"
+PERSONS = f"{API}{settings.tags.PERSONS_PREFIX}"
+ADDRESSES = f"{API}{settings.tags.ADDRESSES_PREFIX}"
+ORDERS = f"{API}{settings.tags.ORDERS_PREFIX}"
+
+Scenario = Callable[[VirtualUser, Catalog, random.Random], Awaitable[None]]
+
+
+async def browse(user: VirtualUser, catalog: Catalog, rng: random.Random) -> None:
+    await user.get("/products", PRODUCTS, params={"page": rng.randint(1, 20), "size": 20})
+    await user.get("/rubrics/title/{slug}", f"{RUBRICS}/title/{rng.choice(catalog.rubrics)}")
+    await user.get("/brands/title/{slug}", f"{BRANDS}/title/{rng.choice(catalog.brands)}")
+    for _ in range(3):
+        product_id, slug = catalog.product(rng)
+        await user.get("/products/title/{slug}", f"{PRODUCTS}/title/{slug}")
+    await user.get("/products/{id}/votes", f"{PRODUCTS}/{product_id}/votes")
+
+
+async def start_session(user: VirtualUser) -> None:
+    await user.post("/sessions/create_session", f"{SESSIONS}/create_session", json={})
+
+
+async def fill_cart(user: VirtualUser, catalog: Catalog, rng: random.Random, items: int) -> list[int]:
+    product_ids = list({catalog.product(rng)[0] for _ in range(items)})
+    for product_id in product_ids:
+        await user.post(
+            "/carts/get-or-create-item/me-session",
+            f"{CARTS}/get-or-create-item/me-session",
+            data={"product_id": product_id},
+        )
+    return product_ids
+
+
+async def cart(user: VirtualUser, catalog: Catalog, rng: random.Random) -> None:
+    await start_session(user)
+    product_ids = await fill_cart(user, catalog, rng, items=3)
+    await user.post(
+        "/carts/change-quantity/me-session",
+        f"{CARTS}/change-quantity/me-session",
+        data={"product_id": product_ids[0], "delta": 1},
+    )
+    await user.get("/carts/me-session/normalize", f"{CARTS}/me-session/normalize")
+    await user.post("/carts/get-or-create/me-session/full", f"{CARTS}/get-or-create/me-session/full")
+
+
+async def login(user: VirtualUser, catalog: Catalog, rng: random.Random) -> None:
+    # the anonymous session cart is merged into the user's cart on login
+    await start_session(user)
+    await fill_cart(user, catalog, rng, items=2)
+    response = await user.post(
+        "/auth/login",
+        f"{AUTH}/login",
+        data={"username": rng.choice(catalog.users), "password": PASSWORD},
+    )
+    if response is not None and response.status_code == 200:
+        user.token = response.json()["access_token"]
+        await user.get("/carts/me/full", f"{CARTS}/me/full")
+
+
+async def login_only(user: VirtualUser, catalog: Catalog, rng: random.Random) -> None:
+    # password verification only, to see how a burst of logins affects other flows
+    await user.post("/auth/login", f"{AUTH}/login", data={"username": rng.choice(catalog.users), "password": PASSWORD})
+
+
+async def checkout(user: VirtualUser, catalog: Catalog, rng: random.Random) -> None:
+    await start_session(user)
+    await fill_cart(user, catalog, rng, items=rng.randint(1, 4))
+    await user.post("/persons", PERSONS, data={"firstname": PERSON_NAME, "lastname": "Customer"})
+    await user.post("/addresses", ADDRESSES, data={
+        "address": "Bench street, 1",
+        "city": "Moscow",
+        "phonenumber": f"+7999{rng.randint(1000000, 9999999)}",
+    })
+    await user.get("/carts/me-session/normalize", f"{CARTS}/me-session/normalize")
+    await user.post("/orders", ORDERS, data={})
+
+
+async def vote(user: VirtualUser, catalog: Catalog, rng: random.Random) -> None:
+    await login(user, catalog, rng)
+    if user.token:
+        # uniform choice: a user votes for a product once, repeated votes would end with 4xx
+        product_id, _ = rng.choice(catalog.products)
+        await user.post("/votes", VOTES, data={
+            "product_id": product_id,
+            "name": "Bench",
+            "review": "Load benchmark review",
+            "stars": rng.randint(1, 5),
+        })
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "browse": browse,
+    "cart": cart,
+    "login": login,
+    "login_only": login_only,
+    "checkout": checkout,
+    "vote": vote,
+}
+
+# relative frequency of flows, most visitors only browse
+DEFAULT_WEIGHTS = {
+    "browse": 10,
+    "cart": 4,
+    "login": 2,
+    "checkout": 2,
+    "vote": 1,
+}
@@ -0,0 +1,61 @@
+import random
+from dataclasses import dataclass
+
+from sqlalchemy import text
+
+from src.core.config import DBConfigurer
+from src.core.models import Brand, Order, Product, Rubric, User
+from src.scripts.generate_data import PASSWORD, PREFIX, Scale, cleanup as cleanup_generated, generate
+
+# persons of checkout orders, their orders are removed by cleanup
+PERSON_NAME = "Loadbench"
+
+
+@dataclass
+class Catalog:
+    products: list[tuple[int, str]]
+    brands: list[str]
+    rubrics: list[str]
+    users: list[str]
+
+    def product(self, rng: random.Random) -> tuple[int, str]:
+        # a few popular products get most of the traffic, as on a real storefront
+        # (first 10% of the list get about half of the views)
+        return self.products[int(len(self.products) * rng.random() ** 3)]
+
+
+async def seed(products: int) -> None:
+    # users get a real hash of PASSWORD, so logins measure the real verification
+    await generate(Scale.from_products(products))
+
+
+async def load_catalog(limit: int = 5000) -> Catalog:
+    pattern = f"{PREFIX}-%"
+    async with DBConfigurer.Session() as session:
+        products = (await session.execute(text(
+            f"SELECT id, slug FROM {Product.__tablename__} "
+            "WHERE slug LIKE :pattern AND available AND quantity > 0 ORDER BY id LIMIT :limit"
+        ), {"pattern": pattern, "limit": limit})).all()
+        brands = (await session.execute(text(
+            f"SELECT slug FROM {Brand.__tablename__} WHERE slug LIKE :pattern ORDER BY id LIMIT :limit"
+        ), {"pattern": pattern, "limit": limit})).scalars().all()
+        rubrics = (await session.execute(text(
+            f"SELECT slug FROM {Rubric.__tablename__} WHERE slug LIKE :pattern ORDER BY id LIMIT :limit"
+        ), {"pattern": pattern, "limit": limit})).scalars().all()
+        users = (await session.execute(text(
+            f"SELECT email FROM {User.__tablename__} WHERE email LIKE :pattern ORDER BY id LIMIT :limit"
+        ), {"pattern": pattern, "limit": limit})).scalars().all()
+    if not (products and brands and rubrics and users):
+        raise SystemExit("no seeded catalog found, run with --seed first")
+    return Catalog(products=[tuple(row) for row in products], brands=list(brands), rubrics=list(rubrics), users=list(users))
+
+
+async def cleanup() -> None:
+    async with DBConfigurer.Session() as session:
+        result = await session.execute(
+            text(f"DELETE FROM {Order.__tablename__} WHERE person_content ->> 'firstname' = :name"),
+            {"name": PERSON_NAME},
+        )
+        await session.commit()
+        print(f"DELETE FROM {Order.__tablename__}: {result.rowcount}")
+    await cleanup_generated()
@@ -0,0 +1,203 @@
+"""
+Throughput of celery message tasks: per-task event loop and transports (old behavior)
+against the worker async runtime with pooled SMTP connections and a shared telegram session.
+
+Needs a local SMTP sink (aiosmtpd, `pip install aiosmtpd`); telegram API is replaced
+with a stub HTTP server started in-process. Run from the project root:
+
+    python -m benchmarks.message_senders --messages 500 --concurrency 8
+"""
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import aiosmtplib
+import telegram
+
+from src.api.v1.celery_tasks.runtime import WorkerAsyncRuntime
+from src.api.v1.message_senders import CustomMessageSchema
+from src.scripts.mail_sender.pool import SmtpConnectionPool, compose_email_message
+from src.scripts.telegram_message_sender.utils import get_shared_bot
+
+HOST = "127.0.0.1"
+TG_TOKEN = "123456:benchmark"
+TG_CHAT_ID = "1"
+
+
+class SmtpSinkHandler:
+    def __init__(self):
+        self.messages = 0
+        self.connections = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages += 1
+        return "250 Message accepted"
+
+
+class TgStubServer:
+    """Minimal HTTP/1.1 keep-alive server answering every bot method with a sent message."""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.port: int | None = None
+        self.loop = asyncio.new_event_loop()
+        self.started = threading.Event()
+
+    def start(self) -> None:
+        threading.Thread(target=self.run_forever, daemon=True).start()
+        self.started.wait()
+
+    def run_forever(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        server = self.loop.run_until_complete(asyncio.start_server(self.handle, HOST, 0))
+        self.port = server.sockets[0].getsockname()[1]
+        self.started.set()
+        self.loop.run_forever()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = dict(
+                    line.split(":", 1) for line in head.decode().split("\r\n")[1:] if ":" in line
+                )
+                length = int({key.lower(): val for key, val in headers.items()}.get("content-length", 0))
+                if length:
+                    await reader.readexactly(length)
+                self.requests += 1
+                body = json.dumps({
+                    "ok": True,
+                    "result": {
+                        "message_id": self.requests,
+                        "date": int(time.time()),
+                        "chat": {"id": int(TG_CHAT_ID), "type": "private"},
+                        "text": "ok",
+                    },
+                }).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{HOST}:{self.port}/bot"
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def get_schema(number: int) -> CustomMessageSchema:
+    return CustomMessageSchema(
+        recipients=["benchmark@example.com"],
+        subject=f"Benchmark message {number}",
+        body=f"<p>Benchmark message body {number}</p>",
+    )
+
+
+def per_task_mail(smtp_port: int, number: int) -> None:
+    # old behavior: new loop, new connection per task
+    asyncio.run(aiosmtplib.send(
+        compose_email_message(get_schema(number), sender="noreply@example.com"),
+        hostname=HOST,
+        port=smtp_port,
+        start_tls=False,
+    ))
+
+
+def per_task_tg(base_url: str, number: int) -> None:
+    async def send():
+        async with telegram.Bot(token=TG_TOKEN, base_url=base_url) as bot:
+            await bot.send_message(chat_id=TG_CHAT_ID, text=f"message {number}")
+    asyncio.run(send())
+
+
+def measure(name: str, func, messages: int, concurrency: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(func, range(messages)))
+    elapsed = time.perf_counter() - started
+    print(f"{name:<28} {messages / elapsed:>10.1f} msg/s  ({elapsed:.2f}s)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8, help="celery pool threads")
+    parser.add_argument("--smtp-pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    try:
+        from aiosmtpd.controller import Controller
+    except ImportError:
+        raise SystemExit("aiosmtpd is required for this benchmark: pip install aiosmtpd")
+
+    smtp_handler = SmtpSinkHandler()
+    smtp_port = get_free_port()
+    controller = Controller(smtp_handler, hostname=HOST, port=smtp_port)
+    controller.start()
+
+    tg_server = TgStubServer()
+    tg_server.start()
+
+    runtime = WorkerAsyncRuntime()
+    runtime.start()
+
+    async def setup_runtime_transports():
+        runtime.smtp_pool = SmtpConnectionPool(
+            size=args.smtp_pool_size, hostname=HOST, port=smtp_port,
+            username=None, password=None, start_tls=False,
+        )
+        runtime.tg_bot = await get_shared_bot(token=TG_TOKEN, base_url=tg_server.base_url)
+    runtime.run(setup_runtime_transports())
+
+    async def runtime_mail(number: int):
+        pool = await runtime.get_smtp_pool()
+        await pool.send_message(compose_email_message(get_schema(number), sender="noreply@example.com"))
+
+    async def runtime_tg(number: int):
+        bot = await runtime.get_tg_bot()
+        await bot.send_message(chat_id=TG_CHAT_ID, text=f"message {number}")
+
+    print(f"{args.messages} messages, {args.concurrency} worker threads\n")
+    try:
+        connections = smtp_handler.connections
+        measure("mail: per-task loop", lambda n: per_task_mail(smtp_port, n), args.messages, args.concurrency)
+        print(f"{'':<28} {smtp_handler.connections - connections} SMTP connection(s)")
+        connections = smtp_handler.connections
+        measure("mail: runtime + pool", lambda n: runtime.run(runtime_mail(n)), args.messages, args.concurrency)
+        print(f"{'':<28} {smtp_handler.connections - connections} SMTP connection(s)")
+
+        connections = tg_server.connections
+        measure("telegram: per-task loop", lambda n: per_task_tg(tg_server.base_url, n), args.messages, args.concurrency)
+        print(f"{'':<28} {tg_server.connections - connections} HTTP connection(s)")
+        connections = tg_server.connections
+        measure("telegram: runtime + shared", lambda n: runtime.run(runtime_tg(n)), args.messages, args.concurrency)
+        print(f"{'':<28} {tg_server.connections - connections} HTTP connection(s)")
+    finally:
+        runtime.stop()
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Orders partitioning: plans and timings of the typical order queries on the monthly partitioned table.
+
+Seeds synthetic orders spread over --months (marked by phonenumber prefix, removed by --cleanup),
+creates the partitions they need and runs EXPLAIN (ANALYZE, BUFFERS) for the queries behind
+"my orders", admin listings and lookups by id. For every query the number of scanned partitions
+shows whether pruning happened.
+
+    python -m benchmarks.order_partitions --seed 10000000 --months 36
+    python -m benchmarks.order_partitions --compare-flat    # same queries on an unpartitioned copy
+    python -m benchmarks.order_partitions --cleanup
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date
+
+import orjson
+from sqlalchemy import text, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from benchmarks.exports import PHONE_PREFIX, cleanup
+from src.api.v1.orders.order.partitions import ORDER_TABLE, add_months, create_partitions
+from src.core.config import DBConfigurer
+from src.tools.status_choices import StatusChoices
+
+FLAT_TABLE = f"{ORDER_TABLE}_flat_bench"
+
+SEED_SQL = text(f"""
+INSERT INTO {ORDER_TABLE} (
+    user_id, phonenumber, total_cost, order_content, person_content, address_content,
+    time_placed, time_delivered, move_to, payment_conditions, status
+)
+SELECT
+    CASE WHEN cardinality(:user_ids) > 0 THEN (:user_ids)[n % cardinality(:user_ids) + 1] END,
+    '{PHONE_PREFIX}' || n,
+    (n % 50000) / 100.0 + 1,
+    '[]'::json,
+    '{{"name": "Bench"}}'::json,
+    '{{"city": "Bench city"}}'::json,
+    now() - (n::float / :count * :span_seconds) * interval '1 second',
+    CASE WHEN n % 10 <> 0 THEN now() - (n::float / :count * :span_seconds - 86400) * interval '1 second' END,
+    n % 2, n % 4,
+    CASE n % 10 WHEN 0 THEN {StatusChoices.S_ORDERED.value} WHEN 1 THEN {StatusChoices.S_CANCELLED.value}
+        ELSE {StatusChoices.S_DELIVERED.value} END
+FROM generate_series(:start, :stop) AS n
+""").bindparams(bindparam("user_ids", type_=ARRAY(Integer)))
+
+QUERIES = {
+    "my orders, last 90 days": (
+        "SELECT * FROM {table} WHERE user_id = :user_id AND time_placed >= now() - interval '90 days' "
+        "ORDER BY time_placed DESC LIMIT 20"
+    ),
+    "my orders, all time": (
+        "SELECT * FROM {table} WHERE user_id = :user_id ORDER BY time_placed DESC LIMIT 20"
+    ),
+    "admin: open orders of last month": (
+        f"SELECT * FROM {{table}} WHERE status = {StatusChoices.S_ORDERED.value} "
+        "AND time_placed >= date_trunc('month', now()) - interval '1 month' AND time_placed < date_trunc('month', now()) ORDER BY time_placed LIMIT 50"
+    ),
+    "admin: orders count of one month": (
+        "SELECT count(*) FROM {table} WHERE time_placed >= date_trunc('month', now()) - interval '6 months' "
+        "AND time_placed < date_trunc('month', now()) - interval '5 months'"
+    ),
+    "order by id": (
+        "SELECT * FROM {table} WHERE id = :order_id"
+    ),
+}
+
+
+async def seed(count: int, months: int, batch: int = 200_000) -> None:
+    async with DBConfigurer.Session() as session:
+        await create_partitions(session=session, since=add_months(date.today().replace(day=1), -months))
+        user_ids = list((await session.scalars(text("SELECT id FROM el_user ORDER BY id LIMIT 1000"))).all())
+        started = time.perf_counter()
+        for start in range(1, count + 1, batch):
+            await session.execute(SEED_SQL, {
+                "user_ids": user_ids,
+                "start": start,
+                "stop": min(start + batch - 1, count),
+                "count": count,
+                "span_seconds": months * 30 * 86400,
+            })
+            await session.commit()
+            print(f"  {min(start + batch - 1, count)} / {count}", end="\r", flush=True)
+        await session.execute(text(f"ANALYZE {ORDER_TABLE}"))
+        await session.commit()
+        print(f"seeded {count} orders over {months} months in {time.perf_counter() - started:.1f}s")
+
+
+async def create_flat_copy() -> None:
+    async with DBConfigurer.Session() as session:
+        await session.execute(text(f"DROP TABLE IF EXISTS {FLAT_TABLE}"))
+        await session.execute(text(f"CREATE TABLE {FLAT_TABLE} AS SELECT * FROM {ORDER_TABLE}"))
+        await session.execute(text(f"ALTER TABLE {FLAT_TABLE} ADD PRIMARY KEY (id)"))
+        await session.execute(text(f"CREATE INDEX ON {FLAT_TABLE} (user_id, time_placed)"))
+        await session.execute(text(f"CREATE INDEX ON {FLAT_TABLE} (status, time_placed)"))
+        await session.execute(text(f"ANALYZE {FLAT_TABLE}"))
+        await session.commit()
+
+
+def count_scanned(plan: dict, table: str) -> int:
+    # partitions pruned at execution time are left in the plan as never executed nodes
+    scanned = 1 if plan.get("Relation Name", "").startswith(table) and plan.get("Actual Loops") else 0
+    return scanned + sum(count_scanned(child, table) for child in plan.get("Plans", []))
+
+
+async def explain(table: str, repeat: int) -> None:
+    async with DBConfigurer.Session() as session:
+        params = {
+            "user_id": await session.scalar(text(f"SELECT user_id FROM {table} WHERE user_id IS NOT NULL LIMIT 1")),
+            "order_id": await session.scalar(text(f"SELECT id FROM {table} ORDER BY time_placed LIMIT 1 OFFSET 1000")),
+        }
+        print(f"\n{table}")
+        print(f"{'query':<36}{'partitions':>12}{'buffers':>10}{'p50 ms':>10}{'max ms':>10}")
+        for name, query in QUERIES.items():
+            timings, plan = [], None
+            for _ in range(repeat):
+                raw = await session.scalar(
+                    text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query.format(table=table)}"), params,
+                )
+                result = raw[0] if isinstance(raw, list) else orjson.loads(raw)[0]
+                timings.append(result["Execution Time"])
+                plan = result["Plan"]
+            buffers = plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0)
+            print(
+                f"{name:<36}{count_scanned(plan, table):>12}{buffers:>10}"
+                f"{statistics.median(timings):>10.2f}{max(timings):>10.2f}"
+            )
+
+
+async def main(args) -> None:
+    if args.cleanup:
+        await cleanup()
+        async with DBConfigurer.Session() as session:
+            await session.execute(text(f"DROP TABLE IF EXISTS {FLAT_TABLE}"))
+            await session.commit()
+    else:
+        if args.seed:
+            await seed(args.seed, args.months)
+        await explain(ORDER_TABLE, args.repeat)
+        if args.compare_flat:
+            await create_flat_copy()
+            await explain(FLAT_TABLE, args.repeat)
+    await DBConfigurer.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="insert this many synthetic orders first")
+    parser.add_argument("--months", type=int, default=36, help="seeded orders are spread over that many months")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--compare-flat", action="store_true", help="also run queries on an unpartitioned copy")
+    parser.add_argument("--cleanup", action="store_true", help="remove seeded orders and the flat copy")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,152 @@
+"""
+Query plan regression: EXPLAIN of the hot repository queries on a large synthetic dataset.
+
+Calls repository methods the way the views do, records every statement they send
+and runs EXPLAIN (FORMAT JSON) for it with the same parameters. Exits with 1 when a
+hot query reads one of the large tables by sequential scan, so a dropped or unusable
+index fails the run instead of showing up as a slow endpoint.
+
+    python -m benchmarks.query_plans --seed 200000 --orders 1000000
+    python -m benchmarks.query_plans             # check only, the data is kept between runs
+    python -m benchmarks.query_plans --verbose   # print plans of all statements
+    python -m benchmarks.query_plans --cleanup
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+import orjson
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.v1.carts.repository import CartsRepository
+from src.api.v1.orders.order.filters import OrderFilter
+from src.api.v1.orders.order.repository import OrdersRepository
+from src.api.v1.posts.post.filters import PostFilter
+from src.api.v1.posts.post.repository import PostsRepository
+from src.api.v1.store.brands.repository import BrandsRepository
+from src.api.v1.store.products.repository import ProductsRepository
+from src.api.v1.store.rubrics.repository import RubricsRepository
+from src.api.v1.store.votes.filters import VoteFilter
+from src.api.v1.store.votes.repository import VotesRepository
+from src.core.config import DBConfigurer
+from src.core.models import (
+    Brand, CartItem, Order, OrderItem, Post, Product, ProductImage, Rubric, RubricProductAssociation, Vote,
+)
+from src.scripts.generate_data import PHONE_PREFIX, PREFIX, Scale, cleanup, generate
+
+# seeded large, a sequential scan of them in a hot query is a regression
+LARGE_TABLES = {
+    model.__tablename__
+    for model in (Product, ProductImage, RubricProductAssociation, Vote, Post, CartItem, Order, OrderItem)
+}
+ORDER_PARTITION_PREFIX = f"{Order.__tablename__}_y"
+
+SAMPLES_SQL = f"""
+SELECT
+    (SELECT slug FROM {Product.__tablename__} WHERE slug LIKE '{PREFIX}-%' ORDER BY id DESC LIMIT 1) AS product_slug,
+    (SELECT id FROM {Product.__tablename__} WHERE slug LIKE '{PREFIX}-%' ORDER BY id DESC LIMIT 1) AS product_id,
+    (SELECT id FROM {Brand.__tablename__} WHERE slug LIKE '{PREFIX}-%' ORDER BY id DESC LIMIT 1) AS brand_id,
+    (SELECT id FROM {Rubric.__tablename__} WHERE slug LIKE '{PREFIX}-%' ORDER BY id DESC LIMIT 1) AS rubric_id,
+    (SELECT cart_id FROM {CartItem.__tablename__} ORDER BY id DESC LIMIT 1) AS cart_id,
+    (SELECT user_id FROM {Order.__tablename__}
+        WHERE phonenumber LIKE '{PHONE_PREFIX}%' AND user_id IS NOT NULL LIMIT 1) AS order_user_id,
+    (SELECT id FROM {Order.__tablename__} WHERE phonenumber LIKE '{PHONE_PREFIX}%' LIMIT 1) AS order_id
+"""
+
+# name -> repository call the way the views make it
+CASES = {
+    "product by slug": lambda session, s: ProductsRepository(session).get_one_complex(slug=s["product_slug"]),
+    "product full by slug": lambda session, s: ProductsRepository(session).get_one_complex_full(
+        slug=s["product_slug"],
+    ),
+    "brand with products": lambda session, s: BrandsRepository(session).get_one_complex(id=s["brand_id"]),
+    "rubric with products": lambda session, s: RubricsRepository(session).get_one_complex(id=s["rubric_id"]),
+    "votes of product": lambda session, s: VotesRepository(session).get_all(
+        filter_model=VoteFilter(product_id=s["product_id"]),
+    ),
+    "posts of product": lambda session, s: PostsRepository(session).get_all(
+        filter_model=PostFilter(product_id=s["product_id"]),
+    ),
+    "cart with items": lambda session, s: CartsRepository(session).get_one_complex(id=s["cart_id"]),
+    "orders of user": lambda session, s: OrdersRepository(session).get_all(
+        filter_model=OrderFilter(), user_id=s["order_user_id"],
+    ),
+    "orders of last day": lambda session, s: OrdersRepository(session).get_all(
+        filter_model=OrderFilter(time_placed__gte=datetime.now() - timedelta(days=1)),
+    ),
+    "order with items": lambda session, s: OrdersRepository(session).get_one_complex(id=s["order_id"]),
+}
+
+
+async def seed(products: int, orders: int, months: int) -> None:
+    await generate(Scale.from_products(products, orders=orders, months=months))
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    found = []
+    relation = plan.get("Relation Name", "")
+    if plan["Node Type"] == "Seq Scan" and (relation in LARGE_TABLES or relation.startswith(ORDER_PARTITION_PREFIX)):
+        found.append(relation)
+    for child in plan.get("Plans", []):
+        found += find_seq_scans(child)
+    return found
+
+
+async def record_statements(session: AsyncSession, name: str, samples: dict) -> list[tuple]:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(DBConfigurer.engine.sync_engine, "before_cursor_execute", record)
+    try:
+        await CASES[name](session, samples)
+    finally:
+        event.remove(DBConfigurer.engine.sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+async def check(verbose: bool) -> int:
+    failed = 0
+    async with DBConfigurer.Session() as session:
+        samples = (await session.execute(text(SAMPLES_SQL))).mappings().one()
+        for name in CASES:
+            statements = await record_statements(session, name, samples)
+            connection = await session.connection()
+            seq_scans = []
+            for statement, parameters in statements:
+                raw = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar()
+                plan = (raw if isinstance(raw, list) else orjson.loads(raw))[0]["Plan"]
+                seq_scans += find_seq_scans(plan)
+                if verbose:
+                    print(f"\n{statement}\n{orjson.dumps(plan, option=orjson.OPT_INDENT_2).decode()}")
+            failed += bool(seq_scans)
+            verdict = f"FAIL, seq scan of {', '.join(sorted(set(seq_scans)))}" if seq_scans else "ok"
+            print(f"{name:<24}{len(statements):>3} statement(s)  {verdict}")
+            session.expunge_all()
+    print(f"\n{len(CASES) - failed} of {len(CASES)} hot queries use indexes")
+    return failed
+
+
+async def main(args) -> int:
+    failed = 0
+    if args.cleanup:
+        await cleanup()
+    else:
+        if args.seed:
+            await seed(args.seed, args.orders, args.months)
+        failed = await check(args.verbose)
+    await DBConfigurer.dispose()
+    return failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="insert this many synthetic products with relations first")
+    parser.add_argument("--orders", type=int, default=1_000_000, help="synthetic orders seeded with --seed")
+    parser.add_argument("--months", type=int, default=36, help="seeded orders are spread over that many months")
+    parser.add_argument("--verbose", action="store_true", help="print plans of all recorded statements")
+    parser.add_argument("--cleanup", action="store_true", help="remove seeded data and exit")
+    sys.exit(1 if asyncio.run(main(parser.parse_args())) else 0)
@@ -0,0 +1,104 @@
+"""
+Cold start: import time of the app, time to the first OpenAPI schema and an import profile.
+
+Every measurement runs in a fresh interpreter. The profile comes from `python -X importtime`:
+the modules with the largest cumulative import time and the self time summed by top level package,
+so an eager import of a heavy dependency shows up at the top.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeat 5 --top 40
+    python -m benchmarks.startup --max-import-seconds 3 --max-openapi-seconds 0.5   # budget check for CI
+
+The schema is measured without the cache (generated from the routes) and with the cache file,
+as after `python -m src.scripts.build_openapi` at build time.
+Exits with 1 when a budget is exceeded.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+import orjson
+
+MEASURE = """
+import time, orjson
+started = time.perf_counter()
+from src.main import app
+imported = time.perf_counter()
+from src.core.config import AppConfigurer
+AppConfigurer.get_openapi_json(app)
+print(orjson.dumps({"import": imported - started, "openapi": time.perf_counter() - imported}).decode())
+"""
+
+
+def run_python(code: str, env: dict[str, str] | None = None, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True, text=True, check=True, env={**os.environ, **(env or {})},
+    )
+
+
+def measure(cache: bool, repeat: int) -> dict[str, float]:
+    env = {"OPENAPI_CACHE_ENABLED": str(cache)}
+    if cache:
+        # writes the cache file if the code changed since the last build
+        run_python(MEASURE, env)
+    runs = [orjson.loads(run_python(MEASURE, env).stdout.strip().splitlines()[-1]) for _ in range(repeat)]
+    return {key: statistics.median(run[key] for run in runs) for key in ("import", "openapi")}
+
+
+def get_import_profile() -> list[tuple[str, int, int]]:
+    # import time: self [us] | cumulative | imported package
+    stderr = run_python("import src.main", {"OPENAPI_CACHE_ENABLED": "False"}, "-X", "importtime").stderr
+    profile = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile.append((name.strip(), int(self_us), int(cumulative_us)))
+    return profile
+
+
+def print_profile(profile: list[tuple[str, int, int]], top: int) -> None:
+    print(f"\n{'module':<60}{'cumulative ms':>15}")
+    for name, _, cumulative in sorted(profile, key=lambda row: row[2], reverse=True)[:top]:
+        print(f"{name[:60]:<60}{cumulative / 1000:>15.1f}")
+
+    packages = Counter()
+    for name, self_us, _ in profile:
+        packages[name.split(".")[0]] += self_us
+    print(f"\n{'package':<60}{'self ms':>15}")
+    for package, self_us in packages.most_common(top):
+        print(f"{package:<60}{self_us / 1000:>15.1f}")
+    print(f"\n{len(profile)} modules, {sum(packages.values()) / 1e6:.2f}s in total")
+
+
+def main(args) -> int:
+    print_profile(get_import_profile(), args.top)
+
+    print(f"\nmedian of {args.repeat} cold starts, seconds")
+    print(f"{'openapi cache':<16}{'import':>10}{'first schema':>15}")
+    results = {}
+    for cache in (False, True):
+        results[cache] = measure(cache, args.repeat)
+        print(f"{'on' if cache else 'off':<16}{results[cache]['import']:>10.2f}{results[cache]['openapi']:>15.3f}")
+
+    failed = 0
+    if args.max_import_seconds and results[True]["import"] > args.max_import_seconds:
+        print(f"import takes {results[True]['import']:.2f}s, more than {args.max_import_seconds}s")
+        failed += 1
+    if args.max_openapi_seconds and results[True]["openapi"] > args.max_openapi_seconds:
+        print(f"cached schema takes {results[True]['openapi']:.3f}s, more than {args.max_openapi_seconds}s")
+        failed += 1
+    return failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="cold starts per variant")
+    parser.add_argument("--top", type=int, default=25, help="rows of the import profile")
+    parser.add_argument("--max-import-seconds", type=float, default=None)
+    parser.add_argument("--max-openapi-seconds", type=float, default=None)
+    sys.exit(1 if main(parser.parse_args()) else 0)
@@ -1,6 +1,28 @@
+from datetime import timedelta
+
+from celery_home.settings import settings
 from .crontabs import Crontabs
 
 schedule = {
+    'dispatch-outbox': {
+        'task': 'task_dispatch_outbox',
+        'schedule': timedelta(seconds=settings.celery.CELERY_OUTBOX_DISPATCH_INTERVAL_SECONDS),
+        'options': {'expires': settings.celery.CELERY_OUTBOX_DISPATCH_INTERVAL_SECONDS},
+    },
+    'persist-usertools-every-10-minutes': {
+        'task': 'task_persist_usertools',
+        'schedule': Crontabs.every_10_minutes,
+        'args': (None, )
+    },
+    'backfill-image-variants-every-hour': {
+        'task': 'task_generate_image_variants',
+        'schedule': Crontabs.every_hour,
+        'args': (None, )
+    },
+    'maintain-order-partitions-every-day': {
+        'task': 'task_maintain_order_partitions',
+        'schedule': Crontabs.every_day,
+    },
     # 'run-every-minute': {
     #     'task': 'task_beat_test_every_minute',
     #     'schedule': Crontabs.every_minute,
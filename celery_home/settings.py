@@ -18,6 +18,8 @@ class CeleryCustom(CustomSettings):
     CELERY_RESULT_EXPIRES_DAYS: int
     CELERY_RESULT_EXPIRES_HOURS: int
     APP_TIMEZONE: str
+    CELERY_OUTBOX_DISPATCH_INTERVAL_SECONDS: int = 5
+    CELERY_ASYNC_TASK_TIMEOUT_SECONDS: int = 60
 
     @property
     def CELERY_BROKER_URL(self):
@@ -7,6 +7,7 @@ from .store import router as store_router
 from .posts import router as posts_router
 from .carts import router as carts_router
 from .orders import router as orders_router
+from .analytics import router as analytics_router
 
 
 from src.core.settings import settings
@@ -49,3 +50,9 @@ router.include_router(
 router.include_router(
     orders_router,
 )
+
+router.include_router(
+    analytics_router,
+    prefix=settings.tags.ANALYTICS_PREFIX,
+    tags=[settings.tags.ANALYTICS_TAG]
+)
@@ -0,0 +1,11 @@
+from src.tools.errors_base import ErrorsBase
+
+
+class Errors(ErrorsBase):
+
+    CLASS = "Analytics"
+    _CLASS = "analytics"
+
+    @staticmethod
+    def WRONG_PERIOD():
+        return "date_from must be earlier than date_to"
@@ -0,0 +1,73 @@
+import logging
+from datetime import datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import select, func, Result
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.models import SalesRollup
+from src.tools.tracing import traced
+from .rollups import METRICS
+
+
+@traced
+class AnalyticsRepository:
+    def __init__(
+            self,
+            session: AsyncSession,
+    ):
+        self.session = session
+        self.logger = logging.getLogger(__name__)
+
+    async def get_series(
+            self,
+            dimension: str,
+            granularity: str,
+            date_from: datetime,
+            date_to: datetime,
+            dimension_ids: Optional[list[int]] = None,
+    ) -> Sequence:
+        # range scan of the (granularity, dimension, period_start, dimension_id) unique index
+        stmt = select(
+            SalesRollup.period_start,
+            SalesRollup.dimension_id,
+            *(getattr(SalesRollup, metric) for metric in METRICS),
+        ).where(
+            SalesRollup.granularity == granularity,
+            SalesRollup.dimension == dimension,
+            SalesRollup.period_start >= date_from,
+            SalesRollup.period_start < date_to,
+        )
+        if dimension_ids:
+            stmt = stmt.where(SalesRollup.dimension_id.in_(dimension_ids))
+        stmt = stmt.order_by(SalesRollup.period_start, SalesRollup.dimension_id)
+
+        result: Result = await self.session.execute(stmt)
+        return result.mappings().all()
+
+    async def get_totals(
+            self,
+            dimension: str,
+            granularity: str,
+            date_from: datetime,
+            date_to: datetime,
+            order_by: str,
+            limit: int,
+    ) -> Sequence:
+        metrics = [func.sum(getattr(SalesRollup, metric)).label(metric) for metric in METRICS]
+        stmt = select(
+            SalesRollup.dimension_id,
+            *metrics,
+        ).where(
+            SalesRollup.granularity == granularity,
+            SalesRollup.dimension == dimension,
+            SalesRollup.period_start >= date_from,
+            SalesRollup.period_start < date_to,
+        ).group_by(
+            SalesRollup.dimension_id
+        ).order_by(
+            func.sum(getattr(SalesRollup, order_by)).desc(), SalesRollup.dimension_id
+        ).limit(limit)
+
+        result: Result = await self.session.execute(stmt)
+        return result.mappings().all()
@@ -0,0 +1,241 @@
+import logging
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import Connection, select, delete, func, text, literal_column, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.models import SalesRollup, Order, OrderItem, Product, RubricProductAssociation
+from src.tools.status_choices import StatusChoices
+
+if TYPE_CHECKING:
+    from sqlalchemy import Select
+
+logger = logging.getLogger(__name__)
+
+
+GRANULARITIES = ("hour", "day")
+DIMENSIONS = ("total", "product", "brand", "rubric", "move_to", "payment_conditions")
+
+PLACED = "placed"
+DELIVERED = "delivered"
+CANCELLED = "cancelled"
+KINDS = (PLACED, DELIVERED, CANCELLED)
+
+METRICS = tuple(f"{metric}_{kind}" for kind in KINDS for metric in ("orders", "units", "revenue"))
+
+# incremental updates take it shared, rebuild exclusively: a rebuild never races with placed orders
+ROLLUPS_LOCK_KEY = 738_201
+
+UNIQUE_CONSTRAINT = "granularity_dimension_period"
+
+
+def truncate(moment: datetime, granularity: str) -> datetime:
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def get_kind_columns(kind: str) -> tuple[str, str, str]:
+    return f"orders_{kind}", f"units_{kind}", f"revenue_{kind}"
+
+
+# incremental updates
+
+def get_order_aggregates(
+        connection: Connection,
+        order: Order,
+) -> dict[tuple[str, int], list]:
+    """
+    (dimension, dimension_id) -> [orders, units, revenue] of one order.
+    Brand and rubrics are taken as they are at the moment of the event.
+    """
+    items = [
+        (item.product_id, item.quantity, Decimal(str(item.price)) * item.quantity)
+        for item in order.order_items
+    ]
+    aggregates: dict[tuple[str, int], list] = defaultdict(lambda: [1, 0, Decimal(0)])
+
+    units = sum(quantity for _, quantity, _ in items)
+    for key in (("total", 0), ("move_to", int(order.move_to)), ("payment_conditions", int(order.payment_conditions))):
+        aggregates[key][1] += units
+        aggregates[key][2] += Decimal(str(order.total_cost))
+
+    product_ids = [product_id for product_id, _, _ in items if product_id is not None]
+    brand_ids, rubric_ids = {}, defaultdict(list)
+    if product_ids:
+        brand_ids = dict(connection.execute(
+            select(Product.id, Product.brand_id).where(Product.id.in_(product_ids))
+        ).all())
+        for rubric_id, product_id in connection.execute(
+            select(RubricProductAssociation.rubric_id, RubricProductAssociation.product_id)
+            .where(RubricProductAssociation.product_id.in_(product_ids))
+        ).all():
+            rubric_ids[product_id].append(rubric_id)
+
+    for product_id, quantity, revenue in items:
+        if product_id is None:
+            continue
+        keys = [("product", product_id)]
+        if product_id in brand_ids:
+            keys.append(("brand", brand_ids[product_id]))
+        keys += [("rubric", rubric_id) for rubric_id in rubric_ids[product_id]]
+        for key in keys:
+            aggregates[key][1] += quantity
+            aggregates[key][2] += revenue
+    return aggregates
+
+
+def apply_order_to_rollups(
+        connection: Connection,
+        order: Order,
+        kind: str,
+) -> None:
+    # Called from mapper events with the flushing connection: rollups are committed
+    # or rolled back together with the order.
+    moment = (order.time_placed if kind == PLACED else order.time_delivered) or datetime.now()
+    aggregates = get_order_aggregates(connection=connection, order=order)
+    orders_column, units_column, revenue_column = get_kind_columns(kind)
+
+    rows = [
+        {
+            "granularity": granularity,
+            "period_start": truncate(moment, granularity),
+            "dimension": dimension,
+            "dimension_id": dimension_id,
+            orders_column: orders,
+            units_column: units,
+            revenue_column: revenue,
+        }
+        for granularity in GRANULARITIES
+        for (dimension, dimension_id), (orders, units, revenue) in aggregates.items()
+    ]
+    stmt = pg_insert(SalesRollup).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        constraint=UNIQUE_CONSTRAINT,
+        set_={
+            column: getattr(SalesRollup, column) + stmt.excluded[column]
+            for column in (orders_column, units_column, revenue_column)
+        },
+    )
+    connection.execute(text("SELECT pg_advisory_xact_lock_shared(:key)"), {"key": ROLLUPS_LOCK_KEY})
+    connection.execute(stmt)
+
+
+# full rebuild
+
+def get_kind_filter(kind: str):
+    if kind == PLACED:
+        return Order.time_placed, None
+    status = StatusChoices.S_DELIVERED if kind == DELIVERED else StatusChoices.S_CANCELLED
+    return Order.time_delivered, Order.status == status.value
+
+
+def get_rebuild_select(
+        kind: str,
+        granularity: str,
+        dimension: str,
+        since: Optional[datetime] = None,
+) -> "Select":
+    time_column, status_filter = get_kind_filter(kind)
+    # granularity is one of GRANULARITIES, inlined so the same expression is in SELECT and GROUP BY
+    period = func.date_trunc(literal_column(f"'{granularity}'"), time_column)
+    constants = (literal_column(f"'{granularity}'"), period, literal_column(f"'{dimension}'"))
+
+    if dimension in ("total", "move_to", "payment_conditions"):
+        units = select(
+            OrderItem.order_id,
+            func.sum(OrderItem.quantity).label("units"),
+        ).group_by(OrderItem.order_id).subquery()
+        dimension_id = literal_column("0") if dimension == "total" else getattr(Order, dimension)
+        stmt = select(
+            *constants,
+            dimension_id,
+            func.count(Order.id),
+            func.coalesce(func.sum(units.c.units), 0),
+            func.coalesce(func.sum(Order.total_cost), 0),
+        ).select_from(Order).outerjoin(units, units.c.order_id == Order.id)
+        group_by = (period, ) if dimension == "total" else (period, dimension_id)
+    else:
+        if dimension == "product":
+            dimension_id = OrderItem.product_id
+        elif dimension == "brand":
+            dimension_id = Product.brand_id
+        else:
+            dimension_id = RubricProductAssociation.rubric_id
+        stmt = select(
+            *constants,
+            dimension_id,
+            func.count(func.distinct(OrderItem.order_id)),
+            func.sum(OrderItem.quantity),
+            func.sum(OrderItem.price * OrderItem.quantity),
+        ).select_from(OrderItem).join(
+            Order, and_(Order.id == OrderItem.order_id, Order.time_placed == OrderItem.order_time_placed),
+        )
+        if dimension == "brand":
+            stmt = stmt.join(Product, Product.id == OrderItem.product_id)
+        elif dimension == "rubric":
+            stmt = stmt.join(
+                RubricProductAssociation, RubricProductAssociation.product_id == OrderItem.product_id,
+            )
+        stmt = stmt.where(OrderItem.product_id.is_not(None))
+        group_by = (period, dimension_id)
+
+    stmt = stmt.where(time_column.is_not(None))
+    if status_filter is not None:
+        stmt = stmt.where(status_filter)
+    if since:
+        stmt = stmt.where(time_column >= since)
+    return stmt.group_by(*group_by)
+
+
+async def rebuild_sales_rollups(
+        session: AsyncSession,
+        since: Optional[datetime] = None,
+) -> dict[str, int]:
+    """
+    Recomputes rollups from orders and order items in one transaction,
+    all of them or starting from the day of `since`.
+
+    Orders of archived partitions are not in the order table anymore, so rollups of the days
+    with their events are kept: `since` is moved forward to the end of the archive.
+    """
+    from src.api.v1.orders.order.partitions import get_archived_until
+
+    since = truncate(since, "day") if since else None
+    await session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ROLLUPS_LOCK_KEY})
+
+    archived_until = await get_archived_until(session)
+    if archived_until and (since is None or since < archived_until):
+        logger.info("Sales rollups before %s are of archived orders, they are kept" % archived_until)
+        since = archived_until
+
+    stmt = delete(SalesRollup)
+    if since:
+        stmt = stmt.where(SalesRollup.period_start >= since)
+    deleted = (await session.execute(stmt)).rowcount
+
+    for kind in KINDS:
+        columns = get_kind_columns(kind)
+        for granularity in GRANULARITIES:
+            for dimension in DIMENSIONS:
+                stmt = pg_insert(SalesRollup).from_select(
+                    ["granularity", "period_start", "dimension", "dimension_id", *columns],
+                    get_rebuild_select(kind=kind, granularity=granularity, dimension=dimension, since=since),
+                )
+                # the same row gets other kinds' metrics from previous statements
+                stmt = stmt.on_conflict_do_update(
+                    constraint=UNIQUE_CONSTRAINT,
+                    set_={column: stmt.excluded[column] for column in columns},
+                )
+                await session.execute(stmt)
+    await session.commit()
+
+    rows = await session.scalar(select(func.count(SalesRollup.id)))
+    result = {"deleted": deleted, "rows": rows}
+    logger.info("Sales rollups were rebuilt%s: %s" % (f" since {since}" if since else "", result))
+    return result
@@ -0,0 +1,35 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict
+
+Granularity = Literal["hour", "day"]
+Dimension = Literal["total", "product", "brand", "rubric", "move_to", "payment_conditions"]
+Metric = Literal[
+    "orders_placed", "units_placed", "revenue_placed",
+    "orders_delivered", "units_delivered", "revenue_delivered",
+    "orders_cancelled", "units_cancelled", "revenue_cancelled",
+]
+
+
+class SalesMetrics(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    dimension_id: int
+
+    orders_placed: int
+    units_placed: int
+    revenue_placed: Decimal
+
+    orders_delivered: int
+    units_delivered: int
+    revenue_delivered: Decimal
+
+    orders_cancelled: int
+    units_cancelled: int
+    revenue_cancelled: Decimal
+
+
+class SalesRollupRead(SalesMetrics):
+    period_start: datetime
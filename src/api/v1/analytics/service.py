@@ -0,0 +1,90 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.tools.tracing import traced
+from .exceptions import Errors
+from .repository import AnalyticsRepository
+from .rollups import truncate
+from .schemas import SalesRollupRead, SalesMetrics
+
+
+@traced
+class AnalyticsService:
+    def __init__(
+            self,
+            session: AsyncSession,
+    ):
+        self.session = session
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def get_period(
+            granularity: str,
+            date_from: Optional[datetime],
+            date_to: Optional[datetime],
+    ) -> tuple[datetime, datetime] | ORJSONResponse:
+        # last 30 days by default, bounds are aligned to the rollup granularity
+        date_to = date_to or datetime.now()
+        date_from = date_from or date_to - timedelta(days=30)
+        if date_from >= date_to:
+            return ORJSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "message": Errors.HANDLER_MESSAGE(),
+                    "detail": Errors.WRONG_PERIOD(),
+                }
+            )
+        return truncate(date_from, granularity), date_to
+
+    async def get_series(
+            self,
+            dimension: str,
+            granularity: str,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+            dimension_ids: Optional[list[int]] = None,
+    ):
+        period = self.get_period(granularity=granularity, date_from=date_from, date_to=date_to)
+        if isinstance(period, ORJSONResponse):
+            return period
+        repository: AnalyticsRepository = AnalyticsRepository(
+            session=self.session
+        )
+        rows = await repository.get_series(
+            dimension=dimension,
+            granularity=granularity,
+            date_from=period[0],
+            date_to=period[1],
+            dimension_ids=dimension_ids,
+        )
+        return [SalesRollupRead(**row) for row in rows]
+
+    async def get_top(
+            self,
+            dimension: str,
+            metric: str,
+            granularity: str,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+            limit: int = 10,
+    ):
+        period = self.get_period(granularity=granularity, date_from=date_from, date_to=date_to)
+        if isinstance(period, ORJSONResponse):
+            return period
+        repository: AnalyticsRepository = AnalyticsRepository(
+            session=self.session
+        )
+        rows = await repository.get_totals(
+            dimension=dimension,
+            granularity=granularity,
+            date_from=period[0],
+            date_to=period[1],
+            order_by=metric,
+            limit=limit,
+        )
+        return [SalesMetrics(**row) for row in rows]
@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Request, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.v1.users.user.dependencies import current_superuser
+from src.core.config import DBConfigurer, RateLimiter
+from .schemas import Dimension, Granularity, Metric, SalesMetrics, SalesRollupRead
+from .service import AnalyticsService
+
+
+router = APIRouter()
+
+
+# 1
+@router.get(
+    "/routes",
+    status_code=status.HTTP_200_OK,
+    description="Getting all the routes of the current branch",
+)
+@RateLimiter.rate_limit()
+async def get_routes(
+        request: Request,
+) -> list[Dict[str, Any]]:
+    from src.scripts.get_routes import get_routes as scrypt_get_routes
+    return await scrypt_get_routes(
+        application=router,
+        tags=False,
+        desc=True
+    )
+
+
+# 2
+@router.get(
+    "/sales",
+    dependencies=[Depends(current_superuser),],
+    response_model=List[SalesRollupRead],
+    status_code=status.HTTP_200_OK,
+    description="Sales time series by dimension from rollups (for superuser only). "
+                "dimension_id: product / brand / rubric id or move_to / payment_conditions value, 0 for total",
+)
+# @RateLimiter.rate_limit()
+# no rate limit for superuser
+async def get_sales(
+        request: Request,
+        dimension: Dimension = Query("total"),
+        granularity: Granularity = Query("day"),
+        date_from: Optional[datetime] = Query(None),
+        date_to: Optional[datetime] = Query(None),
+        dimension_ids: Optional[List[int]] = Query(None),
+        session: AsyncSession = Depends(DBConfigurer.session_getter)
+):
+    service: AnalyticsService = AnalyticsService(
+        session=session
+    )
+    return await service.get_series(
+        dimension=dimension,
+        granularity=granularity,
+        date_from=date_from,
+        date_to=date_to,
+        dimension_ids=dimension_ids,
+    )
+
+
+# 3
+@router.get(
+    "/sales/top",
+    dependencies=[Depends(current_superuser),],
+    response_model=List[SalesMetrics],
+    status_code=status.HTTP_200_OK,
+    description="Dimension values with the largest metric sum over the period (for superuser only)",
+)
+# @RateLimiter.rate_limit()
+# no rate limit for superuser
+async def get_sales_top(
+        request: Request,
+        dimension: Dimension = Query("product"),
+        metric: Metric = Query("revenue_delivered"),
+        granularity: Granularity = Query("day"),
+        date_from: Optional[datetime] = Query(None),
+        date_to: Optional[datetime] = Query(None),
+        limit: int = Query(10, gt=0, le=1000),
+        session: AsyncSession = Depends(DBConfigurer.session_getter)
+):
+    service: AnalyticsService = AnalyticsService(
+        session=session
+    )
+    return await service.get_top(
+        dimension=dimension,
+        metric=metric,
+        granularity=granularity,
+        date_from=date_from,
+        date_to=date_to,
+        limit=limit,
+    )
@@ -1,7 +1,14 @@
-from fastapi_users import FastAPIUsers
+from functools import cache
+from typing import Optional
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from fastapi_users import BaseUserManager, FastAPIUsers, exceptions, models
 from fastapi_users.authentication import BearerTransport, JWTStrategy, AuthenticationBackend
+from fastapi_users.jwt import decode_jwt
 from sqlalchemy import Integer
 
+from src.api.v1.auth.cache import claims_cache, user_cache
 from src.api.v1.auth.dependencies import get_user_manager
 from src.core.settings import settings
 
@@ -11,12 +18,44 @@ bearer_transport = BearerTransport(
 )
 
 
+class CachedJWTStrategy(JWTStrategy):
+    """
+    JWTStrategy with parsed RSA keys, verified tokens kept in claims_cache
+    and users taken from user_cache.
+    """
+
+    async def read_token(
+            self, token: Optional[str], user_manager: BaseUserManager[models.UP, models.ID]
+    ) -> Optional[models.UP]:
+        if token is None:
+            return None
+
+        user_id = claims_cache.get(token)
+        if user_id is None:
+            try:
+                data = decode_jwt(token, self.decode_key, self.token_audience, algorithms=[self.algorithm])
+            except jwt.PyJWTError:
+                return None
+            user_id = data.get("sub")
+            if user_id is None:
+                return None
+            claims_cache.set_claims(token, data)
+
+        try:
+            parsed_id = user_manager.parse_id(user_id)
+        except exceptions.InvalidID:
+            return None
+        return await user_cache.get(parsed_id, user_manager)
+
+
+@cache
 def get_jwt_strategy() -> JWTStrategy:
-    return JWTStrategy(
-        secret=settings.auth.AUTH_PRIVATE_KEY.read_text(),
+    # PyJWT takes key objects as is, PEM strings would be parsed on every encode / decode
+    return CachedJWTStrategy(
+        secret=serialization.load_pem_private_key(settings.auth.AUTH_PRIVATE_KEY.read_bytes(), password=None),
         lifetime_seconds=settings.auth.AUTH_TOKEN_LIFETIME,
         algorithm="RS256",
-        public_key=settings.auth.AUTH_PUBLIC_KEY.read_text(),
+        public_key=serialization.load_pem_public_key(settings.auth.AUTH_PUBLIC_KEY.read_bytes()),
     )
 
 
@@ -0,0 +1,174 @@
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Optional, TYPE_CHECKING
+
+import orjson
+from fastapi_users import exceptions
+from sqlalchemy import DateTime, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from src.core.models import User
+from src.core.settings import settings
+
+if TYPE_CHECKING:
+    import redis.asyncio
+    from src.api.v1.auth.user_manager import UserManager
+
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU with a deadline per entry. `maxsize=0` disables it.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if not self.maxsize or ttl <= 0:
+            return
+        self.entries[key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+class TokenClaimsCache(TTLCache):
+    """
+    Verified access token -> user id ("sub"). An entry never outlives the token "exp",
+    so an expired token is verified (and rejected) by the strategy again.
+    """
+
+    def set_claims(self, token: str, claims: dict[str, Any]) -> None:
+        expires = claims.get("exp")
+        self.set(token, claims["sub"], ttl=None if expires is None else expires - time.time())
+
+
+class UserCache:
+    """
+    Authenticated user lookup: in-process entries for `local_ttl` seconds,
+    then Redis entries (column values of the user) for `ttl` seconds, then the database.
+
+    Invalidated by UserManager hooks. Redis entries are removed for all processes,
+    in-process entries of other workers live at most `local_ttl` seconds more.
+    """
+
+    def __init__(self, ttl: int, local_ttl: float, local_size: int):
+        self.ttl = ttl
+        self.local = TTLCache(maxsize=local_size, ttl=local_ttl)
+        self.prefix = f"{settings.app.APP_NAME}_auth_user:"
+        self.client: Optional["redis.asyncio.Redis"] = None
+
+        mapper = inspect(User)
+        # current_user never needs the password hash, it is not kept in Redis or in process
+        self.columns = [column.key for column in mapper.column_attrs if column.key != "hashed_password"]
+        self.datetime_columns = {
+            column.key for column in mapper.column_attrs if isinstance(column.columns[0].type, DateTime)
+        }
+
+    def get_client(self) -> "redis.asyncio.Redis":
+        if self.client is None:
+            import redis.asyncio
+            self.client = redis.asyncio.Redis(
+                host=settings.redis.REDIS_HOST,
+                port=settings.redis.REDIS_PORT,
+                db=settings.redis.REDIS_DATABASE,
+            )
+        return self.client
+
+    def dump(self, user: "User") -> dict[str, Any]:
+        return {key: getattr(user, key) for key in self.columns}
+
+    def load(self, data: dict[str, Any]) -> dict[str, Any]:
+        return {
+            key: datetime.fromisoformat(value) if key in self.datetime_columns and value else value
+            for key, value in data.items()
+        }
+
+    @staticmethod
+    def attach(user_manager: "UserManager", data: dict[str, Any]) -> "User":
+        # a persistent instance of the request session without SELECT, so updates of it work as usual
+        session = user_manager.user_db.session
+        existing = session.identity_map.get(identity_key(User, data["id"]))
+        if existing is not None:
+            return existing
+        user = User(**data)
+        make_transient_to_detached(user)
+        session.add(user)
+        return user
+
+    async def get(self, user_id: int, user_manager: "UserManager") -> Optional["User"]:
+        data = self.local.get(user_id)
+        if data is None and self.ttl:
+            try:
+                raw = await self.get_client().get(f"{self.prefix}{user_id}")
+            except Exception as exc:
+                logger.warning("User cache is not available: %s" % exc)
+                raw = None
+            if raw is not None:
+                data = self.load(orjson.loads(raw))
+                self.local.set(user_id, data)
+        if data is not None:
+            return self.attach(user_manager, data)
+
+        try:
+            user = await user_manager.get(user_id)
+        except exceptions.UserNotExists:
+            return None
+        await self.set(user)
+        return user
+
+    async def set(self, user: "User") -> None:
+        data = self.dump(user)
+        self.local.set(user.id, data)
+        if not self.ttl:
+            return
+        try:
+            await self.get_client().set(f"{self.prefix}{user.id}", orjson.dumps(data), ex=self.ttl)
+        except Exception as exc:
+            logger.warning("User cache is not available: %s" % exc)
+
+    async def invalidate(self, user_id: int) -> None:
+        self.local.delete(user_id)
+        if not self.ttl:
+            return
+        try:
+            await self.get_client().delete(f"{self.prefix}{user_id}")
+        except Exception as exc:
+            logger.error("User %s was not removed from the cache" % user_id, exc_info=exc)
+
+
+claims_cache = TokenClaimsCache(
+    maxsize=settings.auth.AUTH_CLAIMS_CACHE_SIZE,
+    ttl=settings.auth.AUTH_CLAIMS_CACHE_TTL_SECONDS,
+)
+
+user_cache = UserCache(
+    ttl=settings.auth.AUTH_USER_CACHE_TTL_SECONDS,
+    local_ttl=settings.auth.AUTH_USER_CACHE_LOCAL_TTL_SECONDS,
+    local_size=settings.auth.AUTH_USER_CACHE_LOCAL_SIZE,
+)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Any, TYPE_CHECKING, Union
 
@@ -11,6 +12,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.settings import settings
+from src.tools.tracing import traced
 from .exceptions import Errors
 
 if TYPE_CHECKING:
@@ -20,6 +22,7 @@ if TYPE_CHECKING:
     from src.core.sessions.fastapi_sessions_config import SessionData
 
 
+@traced
 class AuthService:
     def __init__(
         self,
@@ -83,7 +86,17 @@ class AuthService:
             strategy: Strategy[models.UP, models.ID],
     ):
         user, token = token
-        return await self.backend.logout(strategy, user, token)
+        response = await self.backend.logout(strategy, user, token)
+
+        # persisting usertools lists, kept in redis, to database. Publishing runs in a thread without retries,
+        # if the broker is down the user stays in the dirty set and the periodic persisting task picks it up
+        from src.api.v1.celery_tasks.tasks import task_persist_usertools
+        try:
+            await asyncio.to_thread(task_persist_usertools.apply_async, args=([user.id], ), retry=False)
+        except Exception as exc:
+            self.logger.warning("Usertools of user_id=%s were not enqueued for persisting: %s" % (user.id, exc))
+
+        return response
 
     async def register(
             self,
@@ -2,15 +2,20 @@ import logging
 from datetime import datetime
 from typing import Optional, Dict, Any, Union, TYPE_CHECKING
 
+import jwt
 from fastapi_users import BaseUserManager, IntegerIDMixin, schemas, models, exceptions, InvalidPasswordException
+from fastapi_users.jwt import decode_jwt, generate_jwt
 from sqlalchemy import Integer
 
+from src.api.v1.auth.cache import user_cache
 from src.api.v1.message_senders import CustomMessageSchema
 from src.core.settings import settings
+from src.tools.passwords import password_pool
 
 if TYPE_CHECKING:
     from src.core.models import User
     from fastapi import Request, BackgroundTasks, Response
+    from fastapi.security import OAuth2PasswordRequestForm
 
 
 logger = logging.getLogger(__name__)
@@ -56,7 +61,7 @@ class UserManager(IntegerIDMixin, BaseUserManager["User", Integer]):
             else user_create.create_update_dict_superuser()
         )
         password = user_dict.pop("password")
-        user_dict["hashed_password"] = self.password_helper.hash(password)
+        user_dict["hashed_password"] = await self.hash_password(password)
 
         created_user = await self.user_db.create(user_dict)
 
@@ -64,6 +69,108 @@ class UserManager(IntegerIDMixin, BaseUserManager["User", Integer]):
 
         return created_user
 
+    async def hash_password(self, password: str) -> str:
+        return await password_pool.hash(password)
+
+    async def authenticate(
+            self, credentials: "OAuth2PasswordRequestForm"
+    ) -> Optional[models.UP]:
+        """
+        BaseUserManager.authenticate with hashing in the password pool.
+        A hash of another hasher or of old parameters is replaced by a current one.
+        """
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # same time as for an existing user, against user enumeration
+            await self.hash_password(credentials.password)
+            return None
+
+        verified, updated_password_hash = await password_pool.verify_and_update(
+            credentials.password, user.hashed_password
+        )
+        if not verified:
+            return None
+        if updated_password_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_password_hash})
+            # user_db.update does not call on_after_update
+            await user_cache.invalidate(user.id)
+        return user
+
+    async def forgot_password(
+            self, user: models.UP, request: Optional["Request"] = None
+    ) -> None:
+        """
+        BaseUserManager.forgot_password with the password fingerprint hashed in the password pool.
+        """
+        if not user.is_active:
+            raise exceptions.UserInactive()
+
+        token_data = {
+            "sub": str(user.id),
+            "password_fgpt": await self.hash_password(user.hashed_password),
+            "aud": self.reset_password_token_audience,
+        }
+        token = generate_jwt(
+            token_data,
+            self.reset_password_token_secret,
+            self.reset_password_token_lifetime_seconds,
+        )
+        await self.on_after_forgot_password(user, token, request)
+
+    async def reset_password(
+            self, token: str, password: str, request: Optional["Request"] = None
+    ) -> models.UP:
+        """
+        BaseUserManager.reset_password with the password fingerprint verified in the password pool,
+        the new password is hashed there by _update.
+        """
+        try:
+            data = decode_jwt(
+                token,
+                self.reset_password_token_secret,
+                [self.reset_password_token_audience],
+            )
+        except jwt.PyJWTError:
+            raise exceptions.InvalidResetPasswordToken()
+
+        try:
+            user_id = data["sub"]
+            password_fingerprint = data["password_fgpt"]
+        except KeyError:
+            raise exceptions.InvalidResetPasswordToken()
+
+        try:
+            parsed_id = self.parse_id(user_id)
+        except exceptions.InvalidID:
+            raise exceptions.InvalidResetPasswordToken()
+
+        user = await self.get(parsed_id)
+
+        valid_password_fingerprint, _ = await password_pool.verify_and_update(
+            user.hashed_password, password_fingerprint
+        )
+        if not valid_password_fingerprint:
+            raise exceptions.InvalidResetPasswordToken()
+
+        if not user.is_active:
+            raise exceptions.UserInactive()
+
+        updated_user = await self._update(user, {"password": password})
+
+        await self.on_after_reset_password(user, request)
+
+        return updated_user
+
+    async def _update(self, user: models.UP, update_dict: Dict[str, Any]) -> models.UP:
+        # the password is hashed here, BaseUserManager would hash it in the event loop
+        if update_dict.get("password") is not None:
+            update_dict = dict(update_dict)
+            password = update_dict.pop("password")
+            await self.validate_password(password, user)
+            update_dict["hashed_password"] = await self.hash_password(password)
+        return await super()._update(user, update_dict)
+
     async def on_after_register(
             self,
             user: "User",
@@ -141,16 +248,24 @@ class UserManager(IntegerIDMixin, BaseUserManager["User", Integer]):
     async def on_after_reset_password(
             self, user: "User", request: Optional["Request"] = None):
         logger.warning("%r has reset his password." % (user, ))
+        await user_cache.invalidate(user.id)
+
+    async def on_after_verify(
+            self, user: "User", request: Optional["Request"] = None):
+        await user_cache.invalidate(user.id)
 
     async def on_after_update(
             self, user: "User", update_dict: Dict[str, Any],
             request: Optional["Request"] = None,
     ):
         logger.warning("%r has been updated with %r" % (user, update_dict))
+        # is_active / is_superuser / is_verified changes are seen by the next request
+        await user_cache.invalidate(user.id)
 
     async def on_after_delete(
             self, user: "User", request: Optional["Request"] = None):
         logger.info("%r is successfully deleted" % (user, ))
+        await user_cache.invalidate(user.id)
 
     async def validate_password(
         self, password: str, user: Union[schemas.UC, models.UP]
@@ -9,6 +9,7 @@ from sqlalchemy.orm import joinedload
 
 from src.core.models import Cart, CartItem, Product
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from .exceptions import Errors
 
 if TYPE_CHECKING:
@@ -26,6 +27,7 @@ if TYPE_CHECKING:
 CLASS = "Cart"
 
 
+@traced
 class CartsRepository:
     def __init__(
             self,
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.sessions.fastapi_sessions_config import SessionData
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from . import utils
 from ..store.products import utils as product_utils
 from .repository import CartsRepository
@@ -39,6 +40,7 @@ CLASS = "Cart"
 _CLASS = "cart"
 
 
+@traced
 class CartsService:
     def __init__(
             self,
@@ -11,6 +11,7 @@ from src.core.sessions.fastapi_sessions_config import (
 )
 from src.core.settings import settings
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from . import SessionCart, SessionCartItem
 from ..exceptions import Errors
 
@@ -28,6 +29,7 @@ CLASS = "SessionCart"
 CART = settings.sessions.SESSION_CART
 
 
+@traced
 class SessionCartsRepository:
     def __init__(
             self,
@@ -0,0 +1,148 @@
+import logging
+import time
+
+import redis
+from celery.signals import before_task_publish, task_prerun, task_postrun
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+from prometheus_client.metrics_core import Metric
+
+from celery_home.settings import settings as celery_settings
+from src.core.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# Workers run in other processes (and hosts) than the API, so their metrics are kept
+# in Redis hashes as cumulative histogram buckets and read by the API on scrape.
+KEY_PREFIX = f"{settings.app.APP_NAME}_metrics:celery"
+RUNS_KEY = f"{KEY_PREFIX}:runs"
+
+HISTOGRAMS = {
+    # kind -> (metric name, help, buckets)
+    "duration": (
+        "celery_task_duration_seconds", "Celery task run time in the worker",
+        (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 3600.0),
+    ),
+    "wait": (
+        "celery_task_queue_wait_seconds", "Time between task publishing and the start of its run",
+        (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+    ),
+}
+
+# task id -> (run start, queue wait)
+started_at: dict[str, tuple[float, float | None]] = {}
+
+_client: redis.Redis | None = None
+
+
+def get_client() -> redis.Redis:
+    # redis-py pools reconnect after fork by themselves
+    global _client
+    if _client is None:
+        _client = redis.Redis(
+            host=settings.redis.REDIS_HOST,
+            port=settings.redis.REDIS_PORT,
+            db=settings.redis.REDIS_DATABASE,
+            socket_timeout=1,
+        )
+    return _client
+
+
+def observe(pipe, kind: str, task_name: str, value: float) -> None:
+    _, _, buckets = HISTOGRAMS[kind]
+    for upper in (*buckets, float("inf")):
+        if value <= upper:
+            pipe.hincrby(f"{KEY_PREFIX}:{kind}:bucket", f"{task_name}|{upper}", 1)
+    pipe.hincrbyfloat(f"{KEY_PREFIX}:{kind}:sum", task_name, value)
+
+
+def push(task_name: str, observations: dict[str, float], state: str | None = None) -> None:
+    # metrics must never fail a task
+    try:
+        with get_client().pipeline(transaction=False) as pipe:
+            for kind, value in observations.items():
+                observe(pipe, kind, task_name, value)
+            if state:
+                pipe.hincrby(RUNS_KEY, f"{task_name}|{state}", 1)
+            pipe.execute()
+    except redis.RedisError as exc:
+        logger.debug("Celery metrics were not pushed: %s" % exc)
+
+
+@before_task_publish.connect
+def mark_published(headers: dict | None = None, **kwargs):
+    if headers is not None:
+        headers.setdefault("published_at", time.time())
+
+
+@task_prerun.connect
+def on_task_prerun(task_id: str = None, task=None, **kwargs):
+    now = time.time()
+    published_at = getattr(task.request, "published_at", None)
+    started_at[task_id] = (now, max(now - published_at, 0.0) if published_at else None)
+
+
+@task_postrun.connect
+def on_task_postrun(task_id: str = None, task=None, state: str = None, **kwargs):
+    # one round trip per task
+    observations = {}
+    if task_id in started_at:
+        started, wait = started_at.pop(task_id)
+        observations["duration"] = time.time() - started
+        if wait is not None:
+            observations["wait"] = wait
+    push(task.name, observations, state=state or "UNKNOWN")
+
+
+# API side
+
+async def collect_celery_metrics() -> list[Metric]:
+    from redis.asyncio import Redis
+
+    metrics = []
+    try:
+        async with Redis(
+                host=settings.redis.REDIS_HOST,
+                port=settings.redis.REDIS_PORT,
+                db=settings.redis.REDIS_DATABASE,
+                decode_responses=True,
+        ) as client:
+            for kind in HISTOGRAMS:
+                buckets = await client.hgetall(f"{KEY_PREFIX}:{kind}:bucket")
+                sums = await client.hgetall(f"{KEY_PREFIX}:{kind}:sum")
+                metrics.append(get_histogram(kind, buckets, sums))
+
+            runs = CounterMetricFamily("celery_tasks", "Finished Celery task runs by state", labels=["task", "state"])
+            for field, value in (await client.hgetall(RUNS_KEY)).items():
+                task_name, _, state = field.rpartition("|")
+                runs.add_metric([task_name, state], int(value))
+            metrics.append(runs)
+
+        async with Redis.from_url(celery_settings.celery.CELERY_BROKER_URL) as broker:
+            queues = GaugeMetricFamily("celery_queue_length", "Messages waiting in the broker queue", labels=["queue"])
+            for queue in settings.metrics.METRICS_CELERY_QUEUES:
+                queues.add_metric([queue], await broker.llen(queue))
+            metrics.append(queues)
+    except redis.RedisError as exc:
+        logger.warning("Celery metrics are not available: %s" % exc)
+    return metrics
+
+
+def get_histogram(kind: str, buckets: dict[str, str], sums: dict[str, str]) -> Metric:
+    name, documentation, bounds = HISTOGRAMS[kind]
+    histogram = HistogramMetricFamily(name, documentation, labels=["task"])
+    per_task: dict[str, dict[str, int]] = {}
+    for field, value in buckets.items():
+        task_name, _, upper = field.rpartition("|")
+        per_task.setdefault(task_name, {})[upper] = int(value)
+    for task_name, counts in sorted(per_task.items()):
+        # buckets never hit are missing in the hash
+        histogram.add_metric(
+            [task_name],
+            buckets=[
+                (str(upper), counts.get(str(upper), 0)) for upper in bounds
+            ] + [("+Inf", counts.get(str(float("inf")), 0))],
+            sum_value=float(sums.get(task_name, 0)),
+        )
+    return histogram
@@ -0,0 +1,98 @@
+import logging
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Connection, insert, select, func, Result
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.models import OutboxEvent
+from src.core.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxEventTypes:
+    POST_CREATED = "post_created"
+    VOTE_CREATED = "vote_created"
+    ORDER_PLACED = "order_placed"
+    ORDER_DELIVERED = "order_delivered"
+    USER_REGISTERED = "user_registered"
+
+
+def write_outbox_event(
+        connection: Connection,
+        event_type: str,
+        payload: dict,
+        task_name: str = "task_send_tg_message",
+) -> None:
+    # Called from mapper events with the flushing connection, so the event row is
+    # committed or rolled back together with the entity. No broker call here.
+    connection.execute(
+        insert(OutboxEvent).values(
+            event_type=event_type,
+            task_name=task_name,
+            payload=jsonable_encoder(payload),
+            created=datetime.now(),
+        )
+    )
+
+
+async def dispatch_outbox_events(
+        session: AsyncSession,
+        batch_size: int = settings.outbox.OUTBOX_BATCH_SIZE,
+        max_attempts: int = settings.outbox.OUTBOX_MAX_ATTEMPTS,
+) -> dict:
+    from celery_home.config import app_celery
+
+    published_count, failed_count = 0, 0
+    lags: list[float] = []
+
+    while True:
+        # SKIP LOCKED lets several dispatchers work in parallel without double publishing
+        stmt = select(OutboxEvent).where(
+            OutboxEvent.published.is_(None),
+            OutboxEvent.attempts < max_attempts,
+        ).order_by(OutboxEvent.id).limit(batch_size).with_for_update(skip_locked=True)
+        result: Result = await session.execute(stmt)
+        events = result.scalars().all()
+        if not events:
+            break
+
+        for outbox_event in events:
+            outbox_event.attempts += 1
+            try:
+                app_celery.send_task(outbox_event.task_name, args=(outbox_event.payload, ))
+            except Exception as exc:
+                logger.error("Error while publishing %r" % outbox_event, exc_info=exc)
+                outbox_event.last_error = repr(exc)[:500]
+                failed_count += 1
+                continue
+            outbox_event.published = datetime.now()
+            lags.append((outbox_event.published - outbox_event.created).total_seconds())
+            published_count += 1
+        await session.commit()
+
+        if failed_count or len(events) < batch_size:
+            break
+
+    stmt = select(
+        func.count(OutboxEvent.id),
+        func.min(OutboxEvent.created),
+    ).where(
+        OutboxEvent.published.is_(None),
+        OutboxEvent.attempts < max_attempts,
+    )
+    backlog_count, oldest_created = (await session.execute(stmt)).one()
+
+    stats = {
+        "published": published_count,
+        "failed": failed_count,
+        "backlog": backlog_count,
+        "backlog_oldest_age_seconds": (datetime.now() - oldest_created).total_seconds() if oldest_created else 0.0,
+        "publish_lag_avg_seconds": sum(lags) / len(lags) if lags else 0.0,
+        "publish_lag_max_seconds": max(lags) if lags else 0.0,
+    }
+    if published_count or failed_count or backlog_count:
+        logger.info("Outbox dispatching stats: %s" % stats)
+    return stats
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine, TYPE_CHECKING
+
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+
+from celery_home.settings import settings as celery_settings
+
+if TYPE_CHECKING:
+    import telegram
+    from src.scripts.mail_sender.pool import SmtpConnectionPool
+
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerAsyncRuntime:
+    """
+    One event loop per worker process, running in a background thread.
+    Sync celery tasks submit coroutines with `run`, so loop-bound resources
+    (SMTP connections, telegram HTTP session, DB pool) survive between tasks,
+    and tasks executed by several pool threads run concurrently on the same loop.
+    """
+
+    def __init__(self):
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.thread: threading.Thread | None = None
+        self.lock = threading.Lock()
+        self.timeout = celery_settings.celery.CELERY_ASYNC_TASK_TIMEOUT_SECONDS
+
+        # created lazily inside the loop
+        self.smtp_pool: "SmtpConnectionPool | None" = None
+        self.tg_bot: "telegram.Bot | None" = None
+
+    @property
+    def is_running(self) -> bool:
+        return self.loop is not None and self.loop.is_running()
+
+    def start(self) -> None:
+        with self.lock:
+            if self.is_running:
+                return
+            self.loop = asyncio.new_event_loop()
+            started = threading.Event()
+            self.thread = threading.Thread(
+                target=self.run_forever,
+                args=(started, ),
+                name="celery-async-runtime",
+                daemon=True,
+            )
+            self.thread.start()
+            started.wait()
+        logger.info("Worker async runtime started")
+
+    def run_forever(self, started: threading.Event) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(started.set)
+        self.loop.run_forever()
+
+    def run(
+            self,
+            coro: Coroutine,
+            timeout: float | None = None,
+    ) -> Any:
+        from src.tools.tracing import current_span, with_current_span
+
+        self.start()
+        # contextvars do not cross into the loop thread: the task span stays the parent
+        future = asyncio.run_coroutine_threadsafe(with_current_span(coro, current_span.get()), self.loop)
+        return future.result(timeout or self.timeout)
+
+    def stop(self) -> None:
+        with self.lock:
+            if not self.is_running:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self.close_transports(), self.loop).result(self.timeout)
+            except Exception as exc:
+                logger.error("Error while closing worker async runtime transports", exc_info=exc)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(self.timeout)
+            self.loop.close()
+            self.loop, self.thread = None, None
+        logger.info("Worker async runtime stopped")
+
+    async def get_smtp_pool(self) -> "SmtpConnectionPool":
+        if self.smtp_pool is None:
+            from src.scripts.mail_sender.pool import SmtpConnectionPool
+            self.smtp_pool = SmtpConnectionPool()
+        return self.smtp_pool
+
+    async def get_tg_bot(self) -> "telegram.Bot":
+        if self.tg_bot is None:
+            from src.scripts.telegram_message_sender.utils import get_shared_bot
+            self.tg_bot = await get_shared_bot()
+        return self.tg_bot
+
+    async def close_transports(self) -> None:
+        from src.core.config import DBConfigurer
+
+        if self.smtp_pool is not None:
+            await self.smtp_pool.close()
+            self.smtp_pool = None
+        if self.tg_bot is not None:
+            await self.tg_bot.shutdown()
+            self.tg_bot = None
+        await DBConfigurer.dispose()
+
+
+runtime = WorkerAsyncRuntime()
+
+
+@worker_process_init.connect
+def start_runtime(**kwargs):
+    # prefork children: threads do not survive fork, so the loop is started after it.
+    # Other pools start the runtime lazily with the first task.
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def stop_runtime(**kwargs):
+    runtime.stop()
@@ -1,14 +1,20 @@
 import logging
-import asyncio
 
 from celery.exceptions import MaxRetriesExceededError
 
 from celery_home.config import app_celery
+from .runtime import runtime
+from . import metrics, tracing   # task signal handlers
 
 
 logger = logging.getLogger(__name__)
 
 
+async def send_mail_pooled(schema) -> bool:
+    from src.scripts.mail_sender.utils import send_mail
+    return await send_mail(schema, pool=await runtime.get_smtp_pool())
+
+
 @app_celery.task(bind=True, name="task_send_mail")
 def task_send_mail(
         self,
@@ -23,15 +29,10 @@ def task_send_mail(
     self.update_state(meta={'task_name': self.name})
     from src.api.v1.message_senders import CustomMessageSchema
     schema = CustomMessageSchema(**schema)
-    from src.scripts.mail_sender.utils import send_mail
     result: bool = False
 
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            result = asyncio.run(send_mail(schema))
-        else:
-            result = loop.run_until_complete(send_mail(schema))
+        result = runtime.run(send_mail_pooled(schema))
         if not result:
             raise self.retry(countdown=5, max_retries=3)
     except MaxRetriesExceededError as exc:
@@ -42,6 +43,11 @@ def task_send_mail(
     }
 
 
+async def send_tg_message_shared(schema) -> bool:
+    from src.scripts.telegram_message_sender.utils import send_tg_bot_message
+    return await send_tg_bot_message(schema, bot=await runtime.get_tg_bot())
+
+
 @app_celery.task(bind=True, name="task_send_tg_message")
 def task_send_tg_message(
         self,
@@ -57,15 +63,10 @@ def task_send_tg_message(
     from src.api.v1.message_senders import CustomTgMessageSchema
 
     schema = CustomTgMessageSchema(**schema)
-    from src.scripts.telegram_message_sender.utils import send_tg_bot_message
     result: bool = False
 
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            result = asyncio.run(send_tg_bot_message(schema))
-        else:
-            result = loop.run_until_complete(send_tg_bot_message(schema))
+        result = runtime.run(send_tg_message_shared(schema))
         if not result:
             raise self.retry(countdown=5, max_retries=3)
     except MaxRetriesExceededError as exc:
@@ -74,3 +75,129 @@ def task_send_tg_message(
         "meta": meta,
         "returned_value": result
     }
+
+
+async def persist_usertools(user_ids: list[int] | None = None) -> list[int]:
+    from src.core.config import DBConfigurer
+    from src.api.v1.users.usertools.utils import persist_redis_lists
+    # the runtime loop lives as long as the worker, so DB pool connections are reused
+    async with DBConfigurer.Session() as session:
+        return await persist_redis_lists(
+            session=session,
+            user_ids=user_ids,
+        )
+
+
+@app_celery.task(bind=True, name="task_persist_usertools")
+def task_persist_usertools(
+        self,
+        user_ids: list[int] | None = None,
+) -> dict:
+    meta = {
+        'app_name': '4_sur_src',
+        'task_name': self.name,
+        'args': (user_ids, ),
+        'kwargs': {},
+    }
+    self.update_state(meta={'task_name': self.name})
+    result: list[int] = []
+
+    try:
+        result = runtime.run(persist_usertools(user_ids))
+    except Exception as exc:
+        logger.error(f'Task {self.name!r} error: {exc}')
+    return {
+        "meta": meta,
+        "returned_value": result
+    }
+
+
+async def dispatch_outbox() -> dict:
+    from src.core.config import DBConfigurer
+    from .outbox import dispatch_outbox_events
+    async with DBConfigurer.Session() as session:
+        return await dispatch_outbox_events(session=session)
+
+
+@app_celery.task(bind=True, name="task_dispatch_outbox")
+def task_dispatch_outbox(
+        self,
+) -> dict:
+    meta = {
+        'app_name': '4_sur_src',
+        'task_name': self.name,
+        'args': tuple(),
+        'kwargs': {},
+    }
+    result: dict = {}
+
+    try:
+        result = runtime.run(dispatch_outbox())
+    except Exception as exc:
+        logger.error(f'Task {self.name!r} error: {exc}')
+    return {
+        "meta": meta,
+        "returned_value": result
+    }
+
+
+async def generate_image_variants(files: list[str] | None = None) -> dict:
+    from src.core.config import DBConfigurer
+    from src.api.v1.store.utils.image_variants import process_image_variants
+    async with DBConfigurer.Session() as session:
+        return await process_image_variants(session=session, files=files)
+
+
+@app_celery.task(bind=True, name="task_generate_image_variants")
+def task_generate_image_variants(
+        self,
+        files: list[str] | None = None,
+) -> dict:
+    meta = {
+        'app_name': '4_sur_src',
+        'task_name': self.name,
+        'args': (files, ),
+        'kwargs': {},
+    }
+    self.update_state(meta={'task_name': self.name})
+    result: dict = {}
+
+    try:
+        # image processing itself runs in threads of the runtime loop
+        result = runtime.run(generate_image_variants(files), timeout=None if files else 3600)
+    except Exception as exc:
+        logger.error(f'Task {self.name!r} error: {exc}')
+    return {
+        "meta": meta,
+        "returned_value": result
+    }
+
+
+async def maintain_order_partitions() -> dict:
+    from src.core.config import DBConfigurer
+    from src.api.v1.orders.order.partitions import maintain_order_partitions as maintain
+    async with DBConfigurer.Session() as session:
+        return await maintain(session=session)
+
+
+@app_celery.task(bind=True, name="task_maintain_order_partitions")
+def task_maintain_order_partitions(
+        self,
+) -> dict:
+    meta = {
+        'app_name': '4_sur_src',
+        'task_name': self.name,
+        'args': tuple(),
+        'kwargs': {},
+    }
+    self.update_state(meta={'task_name': self.name})
+    result: dict = {}
+
+    try:
+        result = runtime.run(maintain_order_partitions(), timeout=3600)
+    except Exception as exc:
+        logger.error(f'Task {self.name!r} error: {exc}')
+    return {
+        "meta": meta,
+        "returned_value": result
+    }
@@ -0,0 +1,62 @@
+from celery.signals import (
+    before_task_publish, task_prerun, task_postrun, worker_init, worker_process_shutdown, worker_shutdown,
+)
+
+from src.tools.tracing import STATUS_ERROR, Span, begin_span, current_span, get_traceparent, tracer
+
+
+# task id -> (span, contextvar token)
+running: dict[str, tuple[Span, object]] = {}
+
+
+@worker_init.connect
+def init_tracing(**kwargs):
+    # before fork for prefork pools, the exporter thread is started per process on the first span
+    from src.core.config import TracingConfigurer
+    TracingConfigurer.config_tracer()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def flush_tracing(**kwargs):
+    if tracer.enabled:
+        tracer.flush()
+
+
+@before_task_publish.connect
+def inject_traceparent(sender: str = None, headers: dict | None = None, **kwargs):
+    if headers is None or not tracer.enabled:
+        return
+    span = begin_span(f"publish {sender}", kind="producer", attributes={"messaging.destination": sender})
+    if span is not None:
+        headers.setdefault("traceparent", span.traceparent)
+        span.end()
+    elif traceparent := get_traceparent():
+        # unsampled trace: the decision still travels with the task
+        headers.setdefault("traceparent", traceparent)
+
+
+@task_prerun.connect
+def start_task_span(task_id: str = None, task=None, **kwargs):
+    if not tracer.enabled:
+        return
+    span = begin_span(
+        f"run {task.name}",
+        kind="consumer",
+        attributes={"messaging.message_id": task_id, "celery.task": task.name},
+        traceparent=getattr(task.request, "traceparent", None),
+    )
+    if span is not None:
+        running[task_id] = (span, current_span.set(span))
+
+
+@task_postrun.connect
+def end_task_span(task_id: str = None, state: str = None, **kwargs):
+    if task_id not in running:
+        return
+    span, token = running.pop(task_id)
+    current_span.reset(token)
+    span.set_attribute("celery.state", state or "UNKNOWN")
+    if state == "FAILURE":
+        span.status, span.status_message = STATUS_ERROR, "task failed"
+    span.end()
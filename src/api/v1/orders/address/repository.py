@@ -10,6 +10,7 @@ from sqlalchemy.orm import joinedload
 from src.core.models import Address
 from src.tools.exceptions import CustomException
 from src.tools.phone_number import AppPhoneNumber
+from src.tools.tracing import traced
 from .exceptions import Errors
 
 if TYPE_CHECKING:
@@ -24,6 +25,7 @@ if TYPE_CHECKING:
 CLASS = "Address"
 
 
+@traced
 class AddressesRepository:
     def __init__(
             self,
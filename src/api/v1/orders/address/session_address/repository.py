@@ -12,6 +12,7 @@ from src.core.sessions.fastapi_sessions_config import (
 from src.core.settings import settings
 from src.tools.exceptions import CustomException
 from src.tools.phone_number import AppPhoneNumber
+from src.tools.tracing import traced
 from . import SessionAddress
 from ..exceptions import Errors
 
@@ -26,6 +27,7 @@ CLASS = "SessionAddress"
 ADDRESS = settings.sessions.SESSION_ADDRESS
 
 
+@traced
 class SessionAddressesRepository:
     def __init__(
             self,
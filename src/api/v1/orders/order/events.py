@@ -1,10 +1,12 @@
 import json
 
-from celery.result import AsyncResult
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import event
+from sqlalchemy import event, inspect
 
+from src.api.v1.analytics.rollups import apply_order_to_rollups, PLACED, DELIVERED, CANCELLED
+from src.api.v1.celery_tasks.outbox import write_outbox_event, OutboxEventTypes
 from src.core.models import Order
+from src.tools.status_choices import StatusChoices
 
 
 CLASS = "Order"
@@ -12,11 +14,30 @@ CLASS = "Order"
 
 @event.listens_for(Order, 'after_insert', propagate=True)
 def after_order_insert(mapper, connection, target):
-    from src.api.v1.celery_tasks.tasks import task_send_tg_message
-    result: AsyncResult = task_send_tg_message.apply_async(
-        args=(
-            {
-                'subject': f"{CLASS.upper()} CREATED",
-                'body': json.dumps(jsonable_encoder(target.to_dict()), ensure_ascii=False)
-            },
-        ))
+    apply_order_to_rollups(connection=connection, order=target, kind=PLACED)
+    write_outbox_event(
+        connection=connection,
+        event_type=OutboxEventTypes.ORDER_PLACED,
+        payload={
+            'subject': f"{CLASS.upper()} CREATED",
+            'body': json.dumps(jsonable_encoder(target.to_dict()), ensure_ascii=False)
+        },
+    )
+
+
+@event.listens_for(Order, 'after_update', propagate=True)
+def after_order_update(mapper, connection, target):
+    status_history = inspect(target).attrs.status.history
+    if StatusChoices.S_CANCELLED in status_history.added:
+        apply_order_to_rollups(connection=connection, order=target, kind=CANCELLED)
+    if StatusChoices.S_DELIVERED not in status_history.added:
+        return
+    apply_order_to_rollups(connection=connection, order=target, kind=DELIVERED)
+    write_outbox_event(
+        connection=connection,
+        event_type=OutboxEventTypes.ORDER_DELIVERED,
+        payload={
+            'subject': f"{CLASS.upper()} DELIVERED",
+            'body': json.dumps(jsonable_encoder(target.to_dict()), ensure_ascii=False)
+        },
+    )
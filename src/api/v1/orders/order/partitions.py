@@ -0,0 +1,165 @@
+import logging
+import re
+from datetime import datetime, date, timedelta
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.models import Order, OrderItem
+from src.core.settings import settings
+from src.tools.status_choices import StatusChoices
+
+logger = logging.getLogger(__name__)
+
+
+ORDER_TABLE = Order.__tablename__
+ORDER_ITEM_TABLE = OrderItem.__tablename__
+
+PARTITION_NAME = re.compile(rf"^{ORDER_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def get_partition_name(month: date) -> str:
+    # el_order_y2026m10
+    return f"{ORDER_TABLE}_y{month.year}m{month.month:02d}"
+
+
+async def get_partitions(session: AsyncSession) -> dict[str, tuple[datetime, datetime] | None]:
+    """
+    Attached partitions: name -> (from, to), None for the default one.
+    """
+    result = await session.execute(text(
+        """
+        SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :table
+        """
+    ), {"table": ORDER_TABLE})
+
+    partitions = {}
+    for name, bound in result.all():
+        if bound == "DEFAULT":
+            partitions[name] = None
+            continue
+        # FOR VALUES FROM ('2026-10-01 00:00:00') TO ('2026-11-01 00:00:00')
+        lower, upper = [part.split("'")[1] for part in bound.split("FROM")[1].split("TO")]
+        partitions[name] = (datetime.fromisoformat(lower), datetime.fromisoformat(upper))
+    return partitions
+
+
+async def get_archived_until(
+        session: AsyncSession,
+        schema: str = settings.orders.ORDERS_ARCHIVE_SCHEMA,
+) -> datetime | None:
+    """
+    Start of the first day without events (placing or delivery) of archived orders, None without an archive.
+    Data before it is only in `schema` tables.
+    """
+    names = await session.scalars(text(
+        "SELECT tablename FROM pg_tables WHERE schemaname = :schema"
+    ), {"schema": schema})
+    months = sorted(
+        date(int(match[1]), int(match[2]), 1) for match in map(PARTITION_NAME.match, names) if match
+    )
+    if not months:
+        return None
+
+    until = datetime.combine(add_months(months[-1], 1), datetime.min.time())
+    for month in months:
+        delivered = await session.scalar(text(
+            f"SELECT max(time_delivered) FROM {schema}.{get_partition_name(month)}"
+        ))
+        if delivered is not None:
+            until = max(until, datetime.combine(delivered.date() + timedelta(days=1), datetime.min.time()))
+    return until
+
+
+async def create_partitions(
+        session: AsyncSession,
+        months_ahead: int = settings.orders.ORDERS_PARTITIONS_MONTHS_AHEAD,
+        since: Optional[date] = None,
+) -> list[str]:
+    """
+    Creates missing monthly partitions from `since` (current month by default) up to `months_ahead` months ahead.
+    """
+    current = date.today().replace(day=1)
+    month = (since or current).replace(day=1)
+    existing = await get_partitions(session)
+    created = []
+    while month <= add_months(current, months_ahead):
+        name = get_partition_name(month)
+        if name not in existing:
+            # fails if the default partition already holds rows of this month, they are moved by hand then
+            await session.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {ORDER_TABLE} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            ))
+            created.append(name)
+        month = add_months(month, 1)
+    await session.commit()
+    if created:
+        logger.info("Created %s partition(s) of %r: %s" % (len(created), ORDER_TABLE, created))
+    return created
+
+
+async def archive_partitions(
+        session: AsyncSession,
+        older_than_months: int = settings.orders.ORDERS_ARCHIVE_AFTER_MONTHS,
+        schema: str = settings.orders.ORDERS_ARCHIVE_SCHEMA,
+) -> list[str]:
+    """
+    Detaches monthly partitions ended more than `older_than_months` ago and moves them into `schema`.
+
+    A partition is archived only when all its orders are delivered or cancelled. Its order items
+    are moved into `<schema>.el_order_item` first: the foreign key does not allow detaching referenced rows.
+    Every partition is archived in its own transaction.
+    """
+    cutoff = datetime.combine(add_months(date.today().replace(day=1), -older_than_months), datetime.min.time())
+    archived = []
+    for name, bounds in sorted((await get_partitions(session)).items()):
+        if bounds is None or bounds[1] > cutoff:
+            continue
+
+        open_orders = await session.scalar(text(
+            f"SELECT count(*) FROM {name} WHERE status = :status"
+        ), {"status": StatusChoices.S_ORDERED.value})
+        if open_orders:
+            logger.warning("Partition %r has %s open order(s), not archived" % (name, open_orders))
+            continue
+
+        await session.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+        await session.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {schema}.{ORDER_ITEM_TABLE} (LIKE {ORDER_ITEM_TABLE} INCLUDING DEFAULTS)"
+        ))
+        await session.execute(text(
+            f"""
+            WITH moved AS (
+                DELETE FROM {ORDER_ITEM_TABLE}
+                WHERE (order_id, order_time_placed) IN (SELECT id, time_placed FROM {name})
+                RETURNING *
+            )
+            INSERT INTO {schema}.{ORDER_ITEM_TABLE} SELECT * FROM moved
+            """
+        ))
+        await session.execute(text(f"ALTER TABLE {ORDER_TABLE} DETACH PARTITION {name}"))
+        await session.execute(text(f"ALTER TABLE {name} SET SCHEMA {schema}"))
+        await session.commit()
+        archived.append(name)
+
+    if archived:
+        logger.info("Archived %s partition(s) of %r into schema %r: %s" % (len(archived), ORDER_TABLE, schema, archived))
+    return archived
+
+
+async def maintain_order_partitions(session: AsyncSession) -> dict[str, list[str]]:
+    return {
+        "created": await create_partitions(session=session),
+        "archived": await archive_partitions(session=session),
+    }
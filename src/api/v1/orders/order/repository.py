@@ -1,15 +1,17 @@
 import logging
+from decimal import Decimal
 
 from fastapi import status
 from typing import Sequence, TYPE_CHECKING, Union, Optional
 
-from sqlalchemy import select, Result
+from sqlalchemy import select, Result, Select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
-from src.core.models import Order
+from src.core.models import Order, OrderItem
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from .exceptions import Errors
 from . import events
 
@@ -25,6 +27,7 @@ if TYPE_CHECKING:
 CLASS = "Order"
 
 
+@traced
 class OrdersRepository:
     def __init__(
             self,
@@ -104,11 +107,29 @@ class OrdersRepository:
         result: Result = await self.session.execute(stmt)
         return result.unique().scalars().all()
 
+    def get_export_stmt(
+            self,
+            filter_model: "OrderFilter",
+    ) -> Select:
+        # plain columns, no ORM entities and relations: rows are streamed by server-side cursor
+        query_filter = filter_model.filter(select(*Order.__table__.columns))
+        return filter_model.sort(query_filter).order_by(Order.id)
+
     async def get_orm_model_from_schema(
             self,
             instance: Union["OrderCreate", "OrderUpdate", "OrderPartialUpdate"]
     ):
         orm_model: Order = Order(**instance.model_dump())
+        if instance.order_content:
+            # written in the same transaction as the order
+            orm_model.order_items = [
+                OrderItem(
+                    product_id=item['product']['id'],
+                    quantity=item['quantity'],
+                    price=Decimal(str(item['price'])),
+                    snapshot=item['product'],
+                ) for item in instance.order_content
+            ]
         return orm_model
 
     async def create_one(
@@ -4,12 +4,14 @@ from datetime import datetime
 from typing import TYPE_CHECKING, Optional, Any, Union
 
 from fastapi import status
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.sessions.fastapi_sessions_config import SessionData
 from src.tools.exceptions import CustomException
+from src.tools.exports import ExportFormat, export_response
 from src.tools.status_choices import StatusChoices
+from src.tools.tracing import traced
 from . import utils
 from .repository import OrdersRepository
 from .schemas import (
@@ -38,6 +40,7 @@ CLASS = "Order"
 _CLASS = "order"
 
 
+@traced
 class OrdersService:
     def __init__(
             self,
@@ -82,6 +85,20 @@ class OrdersService:
             result.append(await utils.get_schema_from_orm(orm_model=orm_model))
         return result
 
+    def export_all(
+            self,
+            filter_model: "OrderFilter",
+            file_format: ExportFormat,
+    ) -> StreamingResponse:
+        repository: OrdersRepository = OrdersRepository(
+            session=self.session
+        )
+        return export_response(
+            stmt=repository.get_export_stmt(filter_model=filter_model),
+            file_format=file_format,
+            filename="orders",
+        )
+
     async def get_one(
             self,
             user: "User",
@@ -351,7 +368,7 @@ class OrdersService:
         instance.status = StatusChoices.S_DELIVERED
 
         products_content_list = [
-            {item['product']['id']: item['quantity']} for item in orm_model.order_content
+            {item.product_id: item.quantity} for item in orm_model.order_items if item.product_id is not None
         ]
         result = await self.serve_deliver(
             products_content_list=products_content_list,
@@ -450,7 +467,7 @@ class OrdersService:
         instance.status = StatusChoices.S_CANCELLED
 
         products_content_list = [
-            {item['product']['id']: item['quantity']} for item in orm_model.order_content
+            {item.product_id: item.quantity} for item in orm_model.order_items if item.product_id is not None
         ]
         result = await self.serve_cancel(
             products_content_list=products_content_list,
@@ -32,7 +32,13 @@ async def get_schema_from_orm(
             return user_short
 
     return OrderRead(
-        **orm_model.to_dict(),
+        **{**orm_model.to_dict(), 'order_content': [
+            {
+                'quantity': item.quantity,
+                'price': item.price,
+                'product': item.snapshot,
+            } for item in orm_model.order_items
+        ]},
         user=user_short
     )
 
@@ -43,10 +49,10 @@ async def get_short_schema_from_orm(
 
     dict_to_push = {**orm_model.to_dict(), 'order_content': [
         {
-            'quantity': item['quantity'],
-            'price': item['price'],
-            'product_id': item['product']['id']
-        } for item in orm_model.order_content
+            'quantity': item.quantity,
+            'price': item.price,
+            'product_id': item.product_id if item.product_id is not None else item.snapshot.get('id'),
+        } for item in orm_model.order_items
     ]}
 
     # BRUTE FORCE VARIANT
@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.sessions.fastapi_sessions_config import cookie_or_none, SessionData, verifier_or_none
 from src.scripts.pagination import paginate_result
+from src.tools.exports import ExportFormat
 from src.tools.customer_payment_choices import CustomerPaymentChoices
 from src.tools.moveto_choices import MoveToChoices
 from src.tools.payment_conditions_choices import PaymentChoices
@@ -202,6 +203,30 @@ async def get_all_full(
     )
 
 
+# 4_2
+@router.get(
+    "/export",
+    dependencies=[Depends(current_superuser),],
+    status_code=status.HTTP_200_OK,
+    description="Streaming export of filtered items as NDJSON or CSV (for superuser only)"
+)
+# @RateLimiter.rate_limit()
+# no rate limit for superuser
+async def export_all(
+        request: Request,
+        file_format: ExportFormat = Query("ndjson"),
+        filter_model: OrderFilter = FilterDepends(OrderFilterAdmin),
+        session: AsyncSession = Depends(DBConfigurer.session_getter)
+):
+    service: OrdersService = OrdersService(
+        session=session
+    )
+    return service.export_all(
+        filter_model=filter_model,
+        file_format=file_format,
+    )
+
+
 # 5
 @router.get(
     "/{id}",
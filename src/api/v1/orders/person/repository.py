@@ -9,6 +9,7 @@ from sqlalchemy.orm import joinedload
 
 from src.core.models import Person
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from .exceptions import Errors
 
 if TYPE_CHECKING:
@@ -23,6 +24,7 @@ if TYPE_CHECKING:
 CLASS = "Person"
 
 
+@traced
 class PersonsRepository:
     def __init__(
             self,
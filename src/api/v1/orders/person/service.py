@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.sessions.fastapi_sessions_config import SessionData
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from . import utils
 from .repository import PersonsRepository
 from .schemas import (
@@ -34,6 +35,7 @@ CLASS = "Person"
 _CLASS = "person"
 
 
+@traced
 class PersonsService:
     def __init__(
             self,
@@ -11,6 +11,7 @@ from src.core.sessions.fastapi_sessions_config import (
 )
 from src.core.settings import settings
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from . import SessionPerson
 from ..exceptions import Errors
 
@@ -25,6 +26,7 @@ CLASS = "SessionPerson"
 PERSON = settings.sessions.SESSION_PERSON
 
 
+@traced
 class SessionPersonsRepository:
     def __init__(
             self,
@@ -9,6 +9,7 @@ from sqlalchemy.orm import joinedload
 
 from src.core.models import Post, Product
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from .exceptions import Errors
 from . import events
 
@@ -25,6 +26,7 @@ if TYPE_CHECKING:
 CLASS = "Post"
 
 
+@traced
 class PostsRepository:
     def __init__(
             self,
@@ -6,6 +6,7 @@ from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from . import utils
 from .repository import PostsRepository
 from .schemas import (
@@ -28,6 +29,7 @@ CLASS = "Post"
 _CLASS = "post"
 
 
+@traced
 class PostsService:
     def __init__(
             self,
@@ -16,9 +16,11 @@ from src.core.sessions.fastapi_sessions_config import (
     cookie,
     current_timezone,
 )
+from src.tools.tracing import traced
 from .exceptions import Errors
 
 
+@traced
 class SessionsService:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -6,6 +6,7 @@ from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from .repository import AddInfoRepository
 from .exceptions import Errors
 from .validators import ValidRelationsInspector
@@ -26,6 +27,7 @@ CLASS = "AdditionalInformation"
 _CLASS = "add_info"
 
 
+@traced
 class AddInfoService:
     def __init__(
             self,
@@ -8,6 +8,7 @@ from sqlalchemy.orm import joinedload
 
 from src.core.models import Brand, BrandImage, Product
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from .exceptions import Errors
 
 if TYPE_CHECKING:
@@ -22,6 +23,7 @@ if TYPE_CHECKING:
 CLASS = "Brand"
 
 
+@traced
 class BrandsRepository:
     def __init__(
             self,
@@ -142,6 +144,7 @@ class BrandsRepository:
             self.logger.error(
                 "Error occurred while saving data to database. Parent model will be deleted", exc_info=error
             )
+            await self.session.rollback()
             await self.delete_one(
                 orm_model=orm_model,
             )
@@ -153,17 +156,20 @@ class BrandsRepository:
             self,
             file: str,
             orm_model: Brand
-    ):
+    ) -> str:
         image: BrandImage | None = BrandImage(file=file, brand_id=orm_model.id)
         try:
             stmt = select(BrandImage).where(BrandImage.brand_id == orm_model.id)
             image = await self.session.scalar(stmt)
+            old_file = image.file
             if image.file != file:
                 image.file = file
                 self.logger.warning("Editing %r in database" % image)
                 await self.session.commit()
+            return old_file
         except IntegrityError as exc:
             self.logger.error("Error occurred while editing data in database", exc_info=exc)
+            await self.session.rollback()
             raise CustomException(
                 msg=f"Error while {image!r} editing."
             )
@@ -31,6 +31,7 @@ class BrandCreate(BaseBrand, TitleSlugMixin):
 class BrandShort(BaseBrand):
     id: int
     image_file: str
+    image_file_webp: str = ''
     slug: str
 
     @model_validator(mode="before")
@@ -6,6 +6,7 @@ from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from . import utils
 from .repository import BrandsRepository
 from .schemas import (
@@ -14,16 +15,17 @@ from .schemas import (
     BrandPartialUpdate,
 )
 from .exceptions import Errors
-from ..utils.image_utils import save_image
+from ..utils.image_utils import save_image, delete_unreferenced_images
+from ..utils.image_variants import enqueue_image_variants
 
 if TYPE_CHECKING:
     from src.core.models import Brand
     from .filters import BrandFilter
 
 CLASS = "Brand"
-_CLASS = "brand"
 
 
+@traced
 class BrandsService:
     def __init__(
             self,
@@ -147,9 +149,19 @@ class BrandsService:
 
         try:
             file_path: str = await save_image(
+                session=self.session,
                 image_object=image_schema,
-                path=f"media/{_CLASS}s",
-                folder=f"{orm_model.id}"
+            )
+        except CustomException as exc:
+            await repository.delete_one(
+                orm_model=orm_model
+            )
+            return ORJSONResponse(
+                status_code=exc.status_code,
+                content={
+                    "message": Errors.HANDLER_MESSAGE(),
+                    "detail": exc.msg,
+                }
             )
         except Exception as exc:
             self.logger.error("Error wile writing file", exc_info=exc)
@@ -172,6 +184,7 @@ class BrandsService:
                 orm_model=orm_model
             )
         except CustomException as exc:
+            await delete_unreferenced_images(session=self.session, file_paths=[file_path])
             return ORJSONResponse(
                 status_code=exc.status_code,
                 content={
@@ -180,6 +193,8 @@ class BrandsService:
                 }
             )
 
+        enqueue_image_variants([file_path])
+
         self.logger.info("Brand %r was successfully created" % orm_model)
 
         return await self.get_one_complex(
@@ -245,9 +260,16 @@ class BrandsService:
         if image_schema:
             try:
                 file_path: str = await save_image(
+                    session=self.session,
                     image_object=image_schema,
-                    path=f"media/{_CLASS}s",
-                    folder=f"{orm_model.id}"
+                )
+            except CustomException as exc:
+                return ORJSONResponse(
+                    status_code=exc.status_code,
+                    content={
+                        "message": Errors.HANDLER_MESSAGE(),
+                        "detail": exc.msg,
+                    }
                 )
             except Exception as exc:
                 self.logger.error("Error wile writing file", exc_info=exc)
@@ -262,11 +284,12 @@ class BrandsService:
             self.logger.info("Image %r was successfully written" % image_schema)
 
             try:
-                await repository.edit_brand_image(
+                old_file_path = await repository.edit_brand_image(
                     file=file_path,
                     orm_model=orm_model
                 )
             except CustomException as exc:
+                await delete_unreferenced_images(session=self.session, file_paths=[file_path])
                 return ORJSONResponse(
                     status_code=exc.status_code,
                     content={
@@ -274,6 +297,8 @@ class BrandsService:
                         "detail": exc.msg,
                     }
                 )
+            await delete_unreferenced_images(session=self.session, file_paths=[old_file_path])
+            enqueue_image_variants([file_path])
 
         self.logger.info("Brand %r was successfully edited" % orm_model)
         return await self.get_one_complex(
@@ -2,6 +2,7 @@ from typing import Type, TYPE_CHECKING
 
 from fastapi.responses import ORJSONResponse
 
+from src.core.models import Brand
 from src.tools.exceptions import CustomException
 from src.tools.inspector import (
     ValidRelationsInspectorBase,
@@ -12,7 +13,6 @@ from .exceptions import Errors
 
 if TYPE_CHECKING:
     from src.tools.errors_base import ErrorsBase
-    from src.core.models import Brand
 
 
 async def inspecting_brand_exists(
@@ -22,11 +22,7 @@ async def inspecting_brand_exists(
 ):
     # Expecting if chosen brand exists
     try:
-        from .repository import BrandsRepository
-        repository: BrandsRepository = BrandsRepository(
-            session=inspector.session,
-        )
-        orm_model: "Brand" = await repository.get_one_complex(id=brand_id, maximized=False)
+        orm_model: "Brand" = await inspector.loader.get_one(Brand, brand_id)
         inspector.result['brand_orm'] = orm_model
     except CustomException as exc:
         inspector.error = ORJSONResponse(
@@ -0,0 +1,238 @@
+import asyncio
+import codecs
+import csv
+import logging
+from decimal import Decimal
+from typing import Any, AsyncIterator, Callable, Literal
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.models import Brand, Rubric
+from src.core.settings import settings
+from .repository import ProductsRepository
+from .schemas import ProductImportRow
+
+logger = logging.getLogger(__name__)
+
+
+FileFormat = Literal["csv", "jsonl"]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    async for chunk in chunks:
+        tail += decoder.decode(chunk)
+        *lines, tail = tail.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail.rstrip("\r")
+
+
+async def iter_jsonl_records(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, dict | str]]:
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError as exc:
+            yield line_number, f"Invalid JSON: {exc}"
+            continue
+        yield line_number, record if isinstance(record, dict) else "JSON object expected"
+
+
+async def iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, dict | str]]:
+    header: list[str] | None = None
+    line_number, record_start, buffer = 0, 0, []
+    async for line in lines:
+        line_number += 1
+        if not buffer:
+            record_start = line_number
+        buffer.append(line)
+        # quoted cell with line breaks is not finished yet
+        if sum(item.count('"') for item in buffer) % 2:
+            continue
+        text, buffer = "\n".join(buffer), []
+        if not text.strip():
+            continue
+        cells = next(csv.reader([text]))
+        if header is None:
+            header = [cell.strip() for cell in cells]
+            continue
+        if len(cells) != len(header):
+            yield record_start, f"Expected {len(header)} cells, got {len(cells)}"
+            continue
+        yield record_start, dict(zip(header, cells))
+    if buffer:
+        yield record_start, "Unterminated quoted cell"
+
+
+def iter_records(chunks: AsyncIterator[bytes], file_format: FileFormat) -> AsyncIterator[tuple[int, dict | str]]:
+    lines = iter_lines(chunks)
+    return iter_csv_records(lines) if file_format == "csv" else iter_jsonl_records(lines)
+
+
+async def iter_file_chunks(path: str, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := await asyncio.to_thread(file.read, chunk_size):
+            yield chunk
+
+
+class ProductsImporter:
+    """
+    Bulk import of products from CSV / JSONL stream.
+
+    Rows are validated by `ProductImportRow` in batches, brand and rubric titles (or slugs) are resolved
+    through maps loaded once. Every batch is one transaction: one multi-row
+    INSERT ... ON CONFLICT (slug) for products and COPY for rubric associations.
+    A batch failing on database constraints is retried row by row in savepoints to report bad rows.
+    """
+
+    def __init__(
+            self,
+            session: AsyncSession,
+            update_existing: bool = True,
+            batch_size: int = settings.products_import.PRODUCTS_IMPORT_BATCH_SIZE,
+            progress: Callable[[dict], Any] | None = None,
+    ):
+        self.session = session
+        self.repository = ProductsRepository(session=session)
+        self.update_existing = update_existing
+        self.batch_size = batch_size
+        self.progress = progress
+
+        self.brands: dict[str, int] = {}
+        self.rubrics: dict[str, int] = {}
+        self.stats = {"processed": 0, "inserted": 0, "updated": 0, "skipped": 0, "failed": 0}
+
+    async def load_maps(self) -> None:
+        for model, mapping in ((Brand, self.brands), (Rubric, self.rubrics)):
+            for id, title, slug in (await self.session.execute(select(model.id, model.title, model.slug))).all():
+                mapping[title.lower()] = id
+                mapping[slug] = id
+
+    async def run(
+            self,
+            records: AsyncIterator[tuple[int, dict | str]],
+    ) -> AsyncIterator[dict]:
+        """
+        Yields per-row errors as they appear, then the summary.
+        """
+        await self.load_maps()
+        batch: list[tuple[int, dict | str]] = []
+        async for record in records:
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                for error in await self.process_batch(batch):
+                    yield error
+                batch = []
+        if batch:
+            for error in await self.process_batch(batch):
+                yield error
+        logger.info("Products import finished: %s" % self.stats)
+        yield {"event": "summary", **self.stats}
+
+    async def process_batch(self, batch: list[tuple[int, dict | str]]) -> list[dict]:
+        errors = []
+        # slug -> (line, product values, rubric ids); last row wins within the batch
+        rows: dict[str, tuple[int, dict, list[int]]] = {}
+        for line, record in batch:
+            try:
+                values, rubric_ids = self.get_values(record)
+            except ValueError as exc:
+                errors.append({"event": "error", "line": line, "detail": str(exc)})
+                continue
+            rows[values["slug"]] = (line, values, rubric_ids)
+
+        if rows:
+            try:
+                errors += await self.write_rows(rows, in_savepoints=False)
+            except IntegrityError:
+                await self.session.rollback()
+                errors += await self.write_rows(rows, in_savepoints=True)
+
+        self.stats["processed"] += len(batch)
+        self.stats["failed"] += len(errors)
+        progress = {"event": "progress", **self.stats}
+        logger.info("Products import progress: %s" % progress)
+        if self.progress:
+            self.progress(progress)
+        return errors
+
+    def get_values(self, record: dict | str) -> tuple[dict, list[int]]:
+        if isinstance(record, str):
+            raise ValueError(record)
+        try:
+            row = ProductImportRow(**record)
+        except ValidationError as exc:
+            raise ValueError(
+                "; ".join(f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}" for error in exc.errors())
+            )
+
+        brand_id = self.brands.get(row.brand.lower()) or self.brands.get(row.brand)
+        if brand_id is None:
+            raise ValueError(f"Brand {row.brand!r} not found")
+        rubric_ids = []
+        for rubric in row.rubrics:
+            rubric_id = self.rubrics.get(rubric.lower()) or self.rubrics.get(rubric)
+            if rubric_id is None:
+                raise ValueError(f"Rubric {rubric!r} not found")
+            rubric_ids.append(rubric_id)
+
+        return {
+            "title": row.title,
+            "slug": row.slug,
+            "description": row.description,
+            "brand_id": brand_id,
+            "start_price": row.start_price,
+            "discount": row.discount,
+            "price": row.price.quantize(Decimal("0.01")),
+            "available": row.available,
+            "quantity": row.quantity,
+        }, list(dict.fromkeys(rubric_ids))
+
+    async def write_rows(
+            self,
+            rows: dict[str, tuple[int, dict, list[int]]],
+            in_savepoints: bool,
+    ) -> list[dict]:
+        errors = []
+        written: dict[str, tuple[int, bool]] = {}
+        if in_savepoints:
+            for slug, (line, values, _) in rows.items():
+                try:
+                    async with self.session.begin_nested():
+                        written.update(await self.repository.upsert_many([values], self.update_existing))
+                except IntegrityError as exc:
+                    errors.append({"event": "error", "line": line, "slug": slug, "detail": str(exc.orig)})
+        else:
+            written = await self.repository.upsert_many(
+                [values for _, values, _ in rows.values()], self.update_existing
+            )
+
+        for slug, (line, _, _) in rows.items():
+            if slug not in written and not any(error.get("slug") == slug for error in errors):
+                # ON CONFLICT DO NOTHING
+                self.stats["skipped"] += 1
+
+        await self.repository.replace_rubrics_many(
+            product_ids=[product_id for product_id, _ in written.values()],
+            pairs=[
+                (rubric_id, written[slug][0])
+                for slug, (_, _, rubric_ids) in rows.items() if slug in written
+                for rubric_id in rubric_ids
+            ],
+        )
+        await self.session.commit()
+
+        for _, inserted in written.values():
+            self.stats["inserted" if inserted else "updated"] += 1
+        return errors
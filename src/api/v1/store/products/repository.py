@@ -2,13 +2,15 @@ import logging
 from fastapi import status
 from typing import Sequence, TYPE_CHECKING, Union, Optional
 
-from sqlalchemy import select, Result
+from sqlalchemy import select, insert, delete, Result, literal_column, Select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
-from src.core.models import Product, ProductImage, Brand, Rubric
+from src.core.models import Product, ProductImage, Brand, Rubric, RubricProductAssociation
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from .exceptions import Errors
 
 if TYPE_CHECKING:
@@ -23,6 +25,7 @@ if TYPE_CHECKING:
 CLASS = "Product"
 
 
+@traced
 class ProductsRepository:
     def __init__(
             self,
@@ -128,6 +131,23 @@ class ProductsRepository:
         result: Result = await self.session.execute(stmt)
         return result.unique().scalars().all()
 
+    async def get_all_by_ids(
+            self,
+            ids: Sequence[int],
+    ) -> list[Product]:
+        stmt = select(Product).where(Product.id.in_(ids)).options(
+            joinedload(Product.images)
+        )
+
+        result: Result = await self.session.execute(stmt)
+        orm_models = {orm_model.id: orm_model for orm_model in result.unique().scalars().all()}
+
+        missing_ids = [id for id in ids if id not in orm_models]
+        if missing_ids:
+            self.logger.warning("%ss with ids=%s not found, skipped" % (CLASS, missing_ids))
+        # keeping the order of requested ids
+        return [orm_models[id] for id in ids if id in orm_models]
+
     async def get_all_full(
             self,
             filter_model: "ProductFilter",
@@ -146,6 +166,13 @@ class ProductsRepository:
         result: Result = await self.session.execute(stmt)
         return result.unique().scalars().all()
 
+    def get_export_stmt(
+            self,
+            filter_model: "ProductFilter",
+    ) -> Select:
+        query_filter = filter_model.filter(select(*Product.__table__.columns))
+        return filter_model.sort(query_filter).order_by(Product.id)
+
     async def get_orm_model_from_schema(
             self,
             instance: Union["ProductCreate", "ProductUpdate", "ProductPartialUpdate"]
@@ -187,26 +214,31 @@ class ProductsRepository:
                 msg=Errors.already_exists_titled(orm_model.title)
             )
 
-    async def create_product_image(
+    async def create_product_images(
             self,
-            file: str,
+            files: list[str],
             orm_model: Product
     ):
-        image: ProductImage | None = None
+        if not files:
+            return
         try:
-            image = ProductImage(file=file, product_id=orm_model.id)
-            self.session.add(image)
+            # one INSERT for all images of the product
+            await self.session.execute(
+                insert(ProductImage),
+                [{"file": file, "product_id": orm_model.id} for file in files],
+            )
             await self.session.commit()
-            self.logger.info("%sImage %r was successfully created" % (CLASS, image))
+            self.logger.info("%d %sImage(s) of %r were successfully created" % (len(files), CLASS, orm_model))
         except IntegrityError as error:
             self.logger.error(
                 "Error occurred while saving data to database. Parent model will be deleted", exc_info=error
             )
+            await self.session.rollback()
             await self.delete_one(
                 orm_model=orm_model,
             )
             raise CustomException(
-                msg=f"Error while {image!r} creating."
+                msg=f"Error while {CLASS}Image(s) of {orm_model!r} creating."
             )
 
     async def add_rubrics_to_model(
@@ -246,9 +278,9 @@ class ProductsRepository:
             instance:  Union["ProductUpdate", "ProductPartialUpdate"],
             orm_model: Product,
             rubric_orms: Optional[list[Rubric]] = None,
-            image_schemas: Optional[list[str]] = None,
+            image_files: Optional[list[str]] = None,
             is_partial: bool = False
-    ):
+    ) -> list[str]:
         if is_partial:
             instance.start_price = instance.start_price or orm_model.start_price
             instance.discount = instance.discount if isinstance(instance.discount, int) else orm_model.discount
@@ -266,17 +298,77 @@ class ProductsRepository:
                 for rubric_orm_model in rubric_orms:
                     orm_model.rubrics.append(rubric_orm_model)
 
-            if image_schemas:
-                for old_image in orm_model.images:
-                    await self.session.delete(old_image)
+            old_files = []
+            if image_files:
+                old_files = [old_image.file for old_image in orm_model.images]
+                await self.session.execute(
+                    delete(ProductImage).where(ProductImage.product_id == orm_model.id)
+                )
+                await self.session.execute(
+                    insert(ProductImage),
+                    [{"file": file, "product_id": orm_model.id} for file in image_files],
+                )
+                # collection is reloaded by the next query
+                self.session.expire(orm_model, ["images"])
 
             await self.session.commit()
             await self.session.refresh(orm_model)
             self.logger.info("%s %r was successfully edited" % (CLASS, orm_model))
             if rubric_orms:
                 self.logger.info("Rubrics list was successfully edited")
+            return old_files
         except IntegrityError as exc:
             self.logger.error("Error occurred while editing data in database", exc_info=exc)
+            await self.session.rollback()
             raise CustomException(
                 msg=Errors.already_exists_titled(instance.title)
             )
+
+    async def upsert_many(
+            self,
+            values: list[dict],
+            update_existing: bool = True,
+    ) -> dict[str, tuple[int, bool]]:
+        """
+        One INSERT ... ON CONFLICT (slug) for the whole batch.
+        Returns slug -> (id, inserted), rows skipped by DO NOTHING are absent.
+        """
+        if not values:
+            return {}
+        stmt = pg_insert(Product).values(values)
+        if update_existing:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Product.slug],
+                set_={key: stmt.excluded[key] for key in values[0] if key != "slug"},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[Product.slug])
+        # xmax is zero only for freshly inserted row versions
+        stmt = stmt.returning(Product.id, Product.slug, literal_column("xmax = 0").label("inserted"))
+
+        result: Result = await self.session.execute(stmt)
+        return {slug: (id, inserted) for id, slug, inserted in result.all()}
+
+    async def replace_rubrics_many(
+            self,
+            product_ids: list[int],
+            pairs: list[tuple[int, int]],
+    ) -> None:
+        """
+        Replaces rubrics of given products: one DELETE and COPY of (rubric_id, product_id) pairs.
+        """
+        if not product_ids:
+            return
+        await self.session.execute(
+            delete(RubricProductAssociation).where(RubricProductAssociation.product_id.in_(product_ids))
+        )
+        if not pairs:
+            return
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        # asyncpg connection under the SQLAlchemy adapter
+        await raw_connection.driver_connection.copy_records_to_table(
+            RubricProductAssociation.__tablename__,
+            records=pairs,
+            columns=["rubric_id", "product_id"],
+        )
@@ -1,7 +1,7 @@
 from datetime import datetime
 from decimal import Decimal
 from typing import Annotated, Optional, Any, List, Literal
-from pydantic import BaseModel, Field, ConfigDict, conint, condecimal
+from pydantic import BaseModel, Field, ConfigDict, conint, condecimal, field_validator, model_validator
 
 from src.api.v1.store.mixins import TitleSlugMixin, PriceMixin
 from src.tools.discount_choices import DiscountChoices
@@ -56,6 +56,7 @@ class ProductCreate(BaseProduct, TitleSlugMixin, PriceMixin):
 class ProductShort(BaseProduct):
     id: int
     image_file: str
+    image_file_webp: str = ''
     slug: str
 
     start_price: Decimal
@@ -89,3 +90,38 @@ class ProductPartialUpdate(BaseProduct, TitleSlugMixin, PriceMixin):
     discount: Optional[base_discount_field] = None
     available: Optional[base_available_field] = None
     quantity: Optional[base_quantity_field] = None
+
+
+class ProductImportRow(BaseModel, TitleSlugMixin, PriceMixin):
+    # one CSV / JSONL row of bulk import, brand and rubrics are given by title or slug
+    title: base_title_field
+    description: base_description_field = ''
+    brand: str
+    rubrics: List[str] = []
+
+    start_price: base_start_price_field
+    discount: base_discount_field = 0
+    available: base_available_field = True
+    quantity: base_quantity_field = 0
+
+    @model_validator(mode="before")
+    @classmethod
+    def drop_empty_cells(cls, data: Any) -> Any:
+        # empty CSV cells mean defaults
+        if isinstance(data, dict):
+            return {key: val for key, val in data.items() if val not in ("", None)}
+        return data
+
+    @field_validator("rubrics", mode="before")
+    @classmethod
+    def split_rubrics(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            return [item.strip() for item in value.split("|") if item.strip()]
+        return value
+
+    @field_validator("discount", mode="before")
+    @classmethod
+    def discount_to_int(cls, value: Any) -> Any:
+        if isinstance(value, str) and value.strip().isdigit():
+            return int(value)
+        return value
@@ -1,14 +1,18 @@
 import logging
 from decimal import Decimal
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, AsyncIterator, Callable, Any
 
 from fastapi import UploadFile, status
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.settings import settings
 from src.tools.discount_choices import DiscountChoices
 from src.tools.exceptions import CustomException
+from src.tools.exports import ExportFormat, export_response
+from src.tools.tracing import traced
 from . import utils
+from .importer import ProductsImporter, FileFormat, iter_records
 from .repository import ProductsRepository
 from .schemas import (
     ProductCreate,
@@ -17,7 +21,8 @@ from .schemas import (
 )
 from .exceptions import Errors
 from .validators import ValidRelationsInspector
-from ..utils.image_utils import save_image, del_directory
+from ..utils.image_utils import save_images, delete_unreferenced_images
+from ..utils.image_variants import enqueue_image_variants
 
 if TYPE_CHECKING:
     from src.core.models import (
@@ -26,9 +31,9 @@ if TYPE_CHECKING:
     from .filters import ProductFilter
 
 CLASS = "Product"
-_CLASS = "product"
 
 
+@traced
 class ProductsService:
     def __init__(
             self,
@@ -64,6 +69,36 @@ class ProductsService:
             result.append(await utils.get_schema_from_orm(orm_model=orm_model))
         return result
 
+    def export_all(
+            self,
+            filter_model: "ProductFilter",
+            file_format: ExportFormat,
+    ) -> StreamingResponse:
+        repository: ProductsRepository = ProductsRepository(
+            session=self.session
+        )
+        return export_response(
+            stmt=repository.get_export_stmt(filter_model=filter_model),
+            file_format=file_format,
+            filename="products",
+        )
+
+    async def get_all_by_ids(
+            self,
+            ids: list[int],
+            to_schema: bool = True,
+    ):
+        repository: ProductsRepository = ProductsRepository(
+            session=self.session
+        )
+        listed_orm_models = await repository.get_all_by_ids(ids=ids)
+        if not to_schema:
+            return listed_orm_models
+        result = []
+        for orm_model in listed_orm_models:
+            result.append(await utils.get_short_schema_from_orm(orm_model=orm_model))
+        return result
+
     async def get_one(
             self,
             id: int,
@@ -177,19 +212,25 @@ class ProductsService:
             )
 
         # Working with images. If exception -.> delete created model
-        for image_number, image_schema in enumerate(image_schemas, 1):
-            # Saving image to file
-            file_path = await self.saving_image_from_schema_with_rollback(
-                image_schema=image_schema, image_number=image_number, orm_model=orm_model
-            )
-            if isinstance(file_path, ORJSONResponse):
-                return file_path
-            self.logger.info("Image %r was successfully written as '%s.*'" % (image_schema.filename, image_number))
+        file_paths = await self.saving_images_from_schemas_with_rollback(
+            image_schemas=image_schemas, orm_model=orm_model
+        )
+        if isinstance(file_paths, ORJSONResponse):
+            return file_paths
 
-            # Saving image_path to database as ProductImage
-            result = await self.saving_image_to_db(orm_model=orm_model, file_path=file_path)
-            if isinstance(result, ORJSONResponse):
-                return result
+        # Saving image paths to database as ProductImages in one batch
+        try:
+            await repository.create_product_images(files=file_paths, orm_model=orm_model)
+        except CustomException as exc:
+            await delete_unreferenced_images(session=self.session, file_paths=file_paths)
+            return ORJSONResponse(
+                status_code=exc.status_code,
+                content={
+                    "message": Errors.HANDLER_MESSAGE(),
+                    "detail": exc.msg,
+                }
+            )
+        enqueue_image_variants(file_paths)
 
         self.logger.info("Product %r was successfully created" % orm_model)
 
@@ -266,35 +307,23 @@ class ProductsService:
         rubric_orms = result["rubric_orms"] if "rubric_orms" in result else None
 
         # Working with images. If exception -.> stop editing model
+        file_paths = []
         if image_schemas:
-            await del_directory(
-                path=f"media/{_CLASS}s",
-                folder=f"{orm_model.id}",
-            )
-            for image_number, image_schema in enumerate(image_schemas, 1):
-                # Saving image to file
-                file_path = await self.saving_image_from_schema_with_rollback(
-                    image_schema=image_schema, image_number=image_number, orm_model=orm_model
-                )
-                if isinstance(file_path, ORJSONResponse):
-                    return file_path
-                self.logger.info("Image %r was successfully written as '%s.*'" % (image_schema.filename, image_number))
-
-                # Saving image_path to database as ProductImage
-                result = await self.saving_image_to_db(orm_model=orm_model, file_path=file_path)
-                if isinstance(result, ORJSONResponse):
-                    return result
-
-        # Editing model in database (with relations)
+            file_paths = await self.saving_images_from_schemas(image_schemas=image_schemas)
+            if isinstance(file_paths, ORJSONResponse):
+                return file_paths
+
+        # Editing model in database (with relations and images)
         try:
-            await repository.edit_one_with_relations(
+            old_file_paths = await repository.edit_one_with_relations(
                 instance=instance,
                 orm_model=orm_model,
                 rubric_orms=rubric_orms,
-                image_schemas=image_schemas,
+                image_files=file_paths,
                 is_partial=is_partial,
             )
         except CustomException as exc:
+            await delete_unreferenced_images(session=self.session, file_paths=file_paths)
             return ORJSONResponse(
                 status_code=exc.status_code,
                 content={
@@ -302,6 +331,8 @@ class ProductsService:
                     "detail": exc.msg,
                 }
             )
+        await delete_unreferenced_images(session=self.session, file_paths=old_file_paths)
+        enqueue_image_variants(file_paths)
 
         self.logger.info("Product %r was successfully edited" % orm_model)
         if return_none:
@@ -310,26 +341,22 @@ class ProductsService:
             id=orm_model.id
         )
 
-    async def saving_image_from_schema_with_rollback(
+    async def saving_images_from_schemas(
             self,
-            image_schema: UploadFile,
-            image_number: int,
-            orm_model: "Product"
+            image_schemas: list[UploadFile],
     ):
         try:
-            file_path: str = await save_image(
-                name=str(image_number),
-                image_object=image_schema,
-                path=f"media/{_CLASS}s",
-                folder=f"{orm_model.id}",
-                cleaning=False,
+            return await save_images(session=self.session, image_objects=image_schemas)
+        except CustomException as exc:
+            return ORJSONResponse(
+                status_code=exc.status_code,
+                content={
+                    "message": Errors.HANDLER_MESSAGE(),
+                    "detail": exc.msg,
+                }
             )
-            return file_path
         except Exception as exc:
             self.logger.error("Error wile writing file", exc_info=exc)
-            await self.repository.delete_one(
-                orm_model=orm_model
-            )
             return ORJSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={
@@ -338,21 +365,39 @@ class ProductsService:
                 }
             )
 
-    async def saving_image_to_db(
+    async def saving_images_from_schemas_with_rollback(
             self,
-            orm_model: "Product",
-            file_path: str
+            image_schemas: list[UploadFile],
+            orm_model: "Product"
     ):
-        try:
-            await self.repository.create_product_image(
-                file=file_path,
+        result = await self.saving_images_from_schemas(image_schemas=image_schemas)
+        if isinstance(result, ORJSONResponse):
+            await self.repository.delete_one(
                 orm_model=orm_model
             )
-        except CustomException as exc:
-            return ORJSONResponse(
-                status_code=exc.status_code,
-                content={
-                    "message": Errors.HANDLER_MESSAGE(),
-                    "detail": exc.msg,
-                }
-            )
+        return result
+
+    async def import_many(
+            self,
+            chunks: AsyncIterator[bytes],
+            file_format: FileFormat,
+            update_existing: bool = True,
+            batch_size: int = settings.products_import.PRODUCTS_IMPORT_BATCH_SIZE,
+            progress: Optional[Callable[[dict], Any]] = None,
+    ) -> dict:
+        importer = ProductsImporter(
+            session=self.session,
+            update_existing=update_existing,
+            batch_size=batch_size,
+            progress=progress,
+        )
+        errors, summary = [], {}
+        async for event in importer.run(iter_records(chunks, file_format=file_format)):
+            if event["event"] == "summary":
+                summary = event
+            elif len(errors) < settings.products_import.PRODUCTS_IMPORT_MAX_REPORTED_ERRORS:
+                errors.append(event)
+
+        summary.pop("event", None)
+        self.logger.info("Products import: %s" % summary)
+        return {**summary, "errors": errors, "errors_truncated": summary["failed"] > len(errors)}
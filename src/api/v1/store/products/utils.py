@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.tools.exceptions import CustomException
 from .schemas import ProductRead, ProductShort
+from ..utils.image_variants import THUMBNAIL, THUMBNAIL_WEBP
 
 if TYPE_CHECKING:
     from src.core.models import Product
@@ -79,18 +80,30 @@ async def get_short_schema_from_orm(
     if isinstance(orm_model, dict):     # inspecting if user is session dictionary
         dict_to_push = orm_model
         image_file = orm_model.pop('image_file')
+        image_file_webp = orm_model.pop('image_file_webp', '')
     else:
         dict_to_push = orm_model.to_dict()
-        image_file = await get_main_image_file(orm_model)
+        # list schemas get thumbnails, original is returned if variants are not generated yet
+        image_file = await get_main_image_file(orm_model, variant=THUMBNAIL)
+        image_file_webp = await get_main_image_file(orm_model, variant=THUMBNAIL_WEBP, fallback=False)
 
     return ProductShort(
         **dict_to_push,
-        image_file=image_file
+        image_file=image_file,
+        image_file_webp=image_file_webp,
     )
 
 
-async def get_main_image_file(orm_model: "Product"):
-    return orm_model.images[0].file if orm_model.images and hasattr(orm_model.images[0], "file") else ''
+async def get_main_image_file(
+        orm_model: "Product",
+        variant: str | None = None,
+        fallback: bool = True,
+):
+    if not orm_model.images or not hasattr(orm_model.images[0], "file"):
+        return ''
+    if variant:
+        return orm_model.images[0].get_variant_file(variant, fallback=fallback)
+    return orm_model.images[0].file
 
 
 async def temporary_fragment(ids: str | list):
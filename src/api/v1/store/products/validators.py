@@ -2,22 +2,29 @@ from typing import TYPE_CHECKING, Type
 
 from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
+from src.core.models import Product
 from src.tools.exceptions import CustomException
 from src.tools.inspector import (
     ValidRelationsInspectorBase,
     ValidRelationsException,
 )
+from src.tools.relations_loader import RelationsLoader
 
 from .exceptions import Errors
 
 if TYPE_CHECKING:
-    from src.core.models import (
-        Product,
-    )
     from src.tools.errors_base import ErrorsBase
 
 
+# images are needed for ProductShort (cart items), other relations are not used after inspection
+RelationsLoader.register_options(
+    Product,
+    joinedload(Product.images),
+)
+
+
 class ValidRelationsInspector(ValidRelationsInspectorBase):
     def __init__(self, session: AsyncSession, **kwargs):
         super().__init__(session=session, **kwargs)
@@ -60,11 +67,7 @@ async def inspecting_product_exists(
 ):
     # Inspecting if chosen product exists
     try:
-        from .repository import ProductsRepository
-        repository: ProductsRepository = ProductsRepository(
-            session=inspector.session,
-        )
-        orm_model: "Product" = await repository.get_one_complex(id=product_id, maximized=False)
+        orm_model: "Product" = await inspector.loader.get_one(Product, product_id)
         inspector.result['product_orm'] = orm_model
     except CustomException as exc:
         inspector.error = ORJSONResponse(
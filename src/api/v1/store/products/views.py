@@ -1,5 +1,5 @@
 from decimal import Decimal
-from typing import TYPE_CHECKING, List, Optional, Any, Dict
+from typing import TYPE_CHECKING, List, Optional, Any, Dict, Literal
 
 from fastapi import (
     APIRouter,
@@ -16,6 +16,7 @@ from fastapi_filter import FilterDepends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.scripts.pagination import paginate_result
+from src.tools.exports import ExportFormat
 from src.tools.discount_choices import DiscountChoices
 from .service import ProductsService
 from .schemas import (
@@ -145,6 +146,30 @@ async def get_all_full(
     )
 
 
+# 4_1
+@router.get(
+    "/export",
+    dependencies=[Depends(current_superuser),],
+    status_code=status.HTTP_200_OK,
+    description="Streaming export of filtered items as NDJSON or CSV (for superuser only)"
+)
+# @RateLimiter.rate_limit()
+# no rate limit for superuser
+async def export_all(
+        request: Request,
+        file_format: ExportFormat = Query("ndjson"),
+        filter_model: ProductFilter = FilterDepends(ProductFilter),
+        session: AsyncSession = Depends(DBConfigurer.session_getter)
+):
+    service: ProductsService = ProductsService(
+        session=session
+    )
+    return service.export_all(
+        filter_model=filter_model,
+        file_format=file_format,
+    )
+
+
 # 5_1
 @router.get(
     "/title/{slug}",
@@ -228,6 +253,32 @@ async def create_one(
     )
 
 
+# 6_1
+@router.post(
+    "/import",
+    dependencies=[Depends(current_superuser),],
+    status_code=status.HTTP_200_OK,
+    description="Bulk import (upsert by slug) of products from CSV or JSONL request body. "
+                "Brand and rubrics are given by title or slug, several rubrics are separated by '|' in CSV",
+)
+# no rate limit for superuser
+async def import_many(
+        request: Request,
+        file_format: Literal["csv", "jsonl"] = Query("csv"),
+        update_existing: bool = Query(True),
+        session: AsyncSession = Depends(DBConfigurer.session_getter)
+) -> Dict[str, Any]:
+    service: ProductsService = ProductsService(
+        session=session
+    )
+    # body is consumed by chunks, the whole file is never kept in memory
+    return await service.import_many(
+        chunks=request.stream(),
+        file_format=file_format,
+        update_existing=update_existing,
+    )
+
+
 # 7
 @router.delete(
     "/{id}",
@@ -31,6 +31,7 @@ class RubricCreate(BaseRubric, TitleSlugMixin):
 class RubricShort(BaseRubric):
     id: int
     image_file: str
+    image_file_webp: str = ''
     slug: str
 
     @model_validator(mode="before")
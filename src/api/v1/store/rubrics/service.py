@@ -6,6 +6,7 @@ from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from . import utils
 from .repository import RubricsRepository
 from .schemas import (
@@ -14,7 +15,8 @@ from .schemas import (
     RubricPartialUpdate,
 )
 from .exceptions import Errors
-from ..utils.image_utils import save_image
+from ..utils.image_utils import save_image, delete_unreferenced_images
+from ..utils.image_variants import enqueue_image_variants
 
 if TYPE_CHECKING:
     from src.core.models import Rubric
@@ -22,9 +24,9 @@ if TYPE_CHECKING:
 
 
 CLASS = "Rubric"
-_CLASS = "rubric"
 
 
+@traced
 class RubricsService:
     def __init__(
             self,
@@ -148,9 +150,19 @@ class RubricsService:
 
         try:
             file_path: str = await save_image(
+                session=self.session,
                 image_object=image_schema,
-                path=f"media/{_CLASS}s",
-                folder=f"{orm_model.id}"
+            )
+        except CustomException as exc:
+            await repository.delete_one(
+                orm_model=orm_model
+            )
+            return ORJSONResponse(
+                status_code=exc.status_code,
+                content={
+                    "message": Errors.HANDLER_MESSAGE(),
+                    "detail": exc.msg,
+                }
             )
         except Exception as exc:
             self.logger.error("Error wile writing file", exc_info=exc)
@@ -173,6 +185,7 @@ class RubricsService:
                 orm_model=orm_model
             )
         except CustomException as exc:
+            await delete_unreferenced_images(session=self.session, file_paths=[file_path])
             return ORJSONResponse(
                 status_code=exc.status_code,
                 content={
@@ -181,6 +194,8 @@ class RubricsService:
                 }
             )
 
+        enqueue_image_variants([file_path])
+
         self.logger.info("Brand %r was successfully created" % orm_model)
 
         return await self.get_one_complex(
@@ -246,9 +261,16 @@ class RubricsService:
         if image_schema:
             try:
                 file_path: str = await save_image(
+                    session=self.session,
                     image_object=image_schema,
-                    path=f"media/{_CLASS}s",
-                    folder=f"{orm_model.id}"
+                )
+            except CustomException as exc:
+                return ORJSONResponse(
+                    status_code=exc.status_code,
+                    content={
+                        "message": Errors.HANDLER_MESSAGE(),
+                        "detail": exc.msg,
+                    }
                 )
             except Exception as exc:
                 self.logger.error("Error wile writing file", exc_info=exc)
@@ -263,11 +285,12 @@ class RubricsService:
             self.logger.info("Image %r was successfully written" % image_schema)
 
             try:
-                await repository.edit_rubric_image(
+                old_file_path = await repository.edit_rubric_image(
                     file=file_path,
                     orm_model=orm_model
                 )
             except CustomException as exc:
+                await delete_unreferenced_images(session=self.session, file_paths=[file_path])
                 return ORJSONResponse(
                     status_code=exc.status_code,
                     content={
@@ -275,6 +298,8 @@ class RubricsService:
                         "detail": exc.msg,
                     }
                 )
+            await delete_unreferenced_images(session=self.session, file_paths=[old_file_path])
+            enqueue_image_variants([file_path])
 
         self.logger.info("Rubric %r was successfully edited" % orm_model)
         return await self.get_one_complex(
@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 
 from .schemas import RubricRead, RubricShort
+from ..utils.image_variants import THUMBNAIL, THUMBNAIL_WEBP
 
 if TYPE_CHECKING:
     from src.core.models import Rubric
@@ -25,7 +26,8 @@ async def get_schema_from_orm(
         return sorted(products_shorts, key=lambda x: x.id)
 
     return RubricRead(
-        **short_schema.model_dump(),
+        **short_schema.model_dump(exclude={"image_file", "image_file_webp"}),
+        image_file=orm_model.image.file if hasattr(orm_model.image, "file") else '',
         description=orm_model.description,
         products=products_shorts
     )
@@ -34,10 +36,14 @@ async def get_schema_from_orm(
 async def get_short_schema_from_orm(
     orm_model: "Rubric"
 ) -> RubricShort:
-    image_file = orm_model.image.file if hasattr(orm_model.image, "file") else ''
+    # list schemas get thumbnails, original is returned if variants are not generated yet
+    image = orm_model.image if hasattr(orm_model.image, "file") else None
+    image_file = image.get_variant_file(THUMBNAIL) if image else ''
+    image_file_webp = image.get_variant_file(THUMBNAIL_WEBP, fallback=False) if image else ''
 
     # BRUTE FORCE VARIANT
     return RubricShort(
         **orm_model.to_dict(),
         image_file=image_file,
+        image_file_webp=image_file_webp,
     )
@@ -2,6 +2,7 @@ from typing import Type, TYPE_CHECKING
 
 from fastapi.responses import ORJSONResponse
 
+from src.core.models import Rubric
 from src.tools.exceptions import CustomException
 from src.tools.inspector import (
     ValidRelationsInspectorBase,
@@ -13,7 +14,6 @@ from ..products import utils as product_utils
 
 if TYPE_CHECKING:
     from src.tools.errors_base import ErrorsBase
-    from src.core.models import Rubric
 
 
 async def inspecting_rubric_ids(
@@ -41,14 +41,7 @@ async def inspecting_rubrics_exist(
 ):
     # Expecting if chosen rubric_ids are existing
     try:
-        from .repository import RubricsRepository
-        repository: RubricsRepository = RubricsRepository(
-            session=inspector.session
-        )
-        orm_models = []
-        for rubric_id in rubric_ids:
-            orm_model: "Rubric" = await repository.get_one(id=rubric_id)
-            orm_models.append(orm_model)
+        orm_models: list["Rubric"] = await inspector.loader.get_many(Rubric, rubric_ids)
         inspector.result['rubric_orms'] = orm_models
     except CustomException as exc:
         inspector.error = ORJSONResponse(
@@ -8,6 +8,7 @@ from sqlalchemy.orm import joinedload
 
 from src.core.models import SaleInformation, Product
 from src.tools.exceptions import CustomException, UnreachableValueError
+from src.tools.tracing import traced
 from .exceptions import Errors
 
 if TYPE_CHECKING:
@@ -24,6 +25,7 @@ if TYPE_CHECKING:
 CLASS = "SaleInformation"
 
 
+@traced
 class SaleInfoRepository:
     def __init__(
             self,
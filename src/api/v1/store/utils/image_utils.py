@@ -1,45 +1,171 @@
+import asyncio
+import hashlib
 import logging
 import os
-import shutil
+import tempfile
+from typing import BinaryIO, Iterable
 
-from fastapi import UploadFile
+from fastapi import UploadFile, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.settings import settings
+from src.tools.errors_base import ErrorsBase
+from src.tools.exceptions import CustomException
 
 logger = logging.getLogger(__name__)
 
 
+IMAGES_FOLDER = "images"
+
+# content type -> (magic bytes offsets, extension)
+IMAGE_SIGNATURES = {
+    "image/jpeg": (((0, b"\xff\xd8\xff"), ), ".jpg"),
+    "image/png": (((0, b"\x89PNG\r\n\x1a\n"), ), ".png"),
+    "image/gif": (((0, b"GIF8"), ), ".gif"),
+    "image/webp": (((0, b"RIFF"), (8, b"WEBP")), ".webp"),
+}
+
+
+def detect_image_type(head: bytes) -> str | None:
+    for content_type, (signatures, _) in IMAGE_SIGNATURES.items():
+        if all(head[offset:offset + len(magic)] == magic for offset, magic in signatures):
+            return content_type
+    return None
+
+
+def write_chunk(buffer: BinaryIO, hasher, chunk: bytes) -> None:
+    # sha256 releases GIL on large buffers, so hashing runs in parallel with the loop too
+    hasher.update(chunk)
+    buffer.write(chunk)
+
+
+def store_by_hash(tmp_path: str, file_path: str) -> bool:
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    if os.path.exists(file_path):
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, file_path)
+    return True
+
+
+async def lock_image_file(session: AsyncSession, file_path: str) -> None:
+    # transaction level lock, held by an upload until its image row is committed
+    # and by a delete until the file is removed
+    await session.execute(select(func.pg_advisory_xact_lock(func.hashtext(file_path))))
+
+
 async def save_image(
+    session: AsyncSession,
     image_object: UploadFile,
-    folder: str,
-    path: str,
-    name: str = 'logo',
-    cleaning: bool = True
-):
-    directory = f"{path}/{folder}"
+    root: str = settings.media.MEDIA_ROOT,
+) -> str:
+    """
+    Streams upload to `<root>/images/<hash[:2]>/<sha256><ext>` in chunks, file operations run
+    in worker threads. Size and type limits are checked while streaming, identical images are stored once.
+
+    The file is locked in the current transaction of `session`, the caller commits its image row in it,
+    so a concurrent delete of the same (deduplicated) file waits for the row and keeps the file.
+    """
+    chunk_size = settings.media.MEDIA_CHUNK_SIZE_BYTES
+    max_size = settings.media.MEDIA_MAX_IMAGE_SIZE_BYTES
+    directory = f"{root}/{IMAGES_FOLDER}"
 
-    if cleaning:
-        await del_directory(directory=directory)
+    await asyncio.to_thread(os.makedirs, directory, exist_ok=True)
+    fd, tmp_path = await asyncio.to_thread(tempfile.mkstemp, dir=directory, suffix=".part")
 
-    os.makedirs(directory, exist_ok=True)  # Создаем директорию, если она не существует
+    hasher = hashlib.sha256()
+    size, content_type = 0, None
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while chunk := await image_object.read(chunk_size):
+                if content_type is None:
+                    content_type = detect_image_type(chunk)
+                    if content_type not in settings.media.MEDIA_ALLOWED_IMAGE_TYPES:
+                        raise CustomException(
+                            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                            msg=ErrorsBase.IMAGE_TYPE_NOT_ALLOWED(settings.media.MEDIA_ALLOWED_IMAGE_TYPES),
+                        )
+                size += len(chunk)
+                if size > max_size:
+                    raise CustomException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        msg=ErrorsBase.IMAGE_TOO_LARGE(max_size),
+                    )
+                await asyncio.to_thread(write_chunk, buffer, hasher, chunk)
 
-    extension = os.path.splitext(image_object.filename)[1]
-    new_file_name = f"{name}{extension}"
-    file_path = os.path.join(directory, new_file_name)
+        if content_type is None:
+            raise CustomException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                msg=ErrorsBase.IMAGE_TYPE_NOT_ALLOWED(settings.media.MEDIA_ALLOWED_IMAGE_TYPES),
+            )
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(image_object.file, buffer)
-        logger.info("Writing file: %r" % image_object.file)
+        digest = hasher.hexdigest()
+        file_path = f"{directory}/{digest[:2]}/{digest}{IMAGE_SIGNATURES[content_type][1]}"
+        await lock_image_file(session, file_path)
+        created = await asyncio.to_thread(store_by_hash, tmp_path, file_path)
+    except BaseException:
+        await asyncio.to_thread(remove_files, [tmp_path])
+        raise
 
+    logger.info(
+        "%s file %r (%s bytes) as %r" % ("Writing" if created else "Deduplicated", image_object.filename, size, file_path)
+    )
     return file_path
 
 
-async def del_directory(
-    folder: str = '',
-    path: str = '',
-    directory: str = None
-):
-    if not directory:
-        directory = f"{path}/{folder}"
+async def save_images(
+    session: AsyncSession,
+    image_objects: Iterable[UploadFile],
+    root: str = settings.media.MEDIA_ROOT,
+) -> list[str]:
+    """
+    Saves all uploads, on error already written files which are not referenced by other images are removed.
+    """
+    file_paths = []
+    try:
+        for image_object in image_objects:
+            file_paths.append(await save_image(session=session, image_object=image_object, root=root))
+    except Exception:
+        await delete_unreferenced_images(session=session, file_paths=file_paths)
+        raise
+    return file_paths
+
+
+def remove_files(file_paths: Iterable[str]) -> None:
+    for file_path in file_paths:
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
+
+async def delete_unreferenced_images(
+    session: AsyncSession,
+    file_paths: Iterable[str],
+) -> list[str]:
+    """
+    Removes files (and their variants) of given images, which are not referenced by any image model anymore.
+    Files are locked in the current transaction of `session`, the locks are released when the caller ends it.
+    """
+    from src.core.models import ProductImage, BrandImage, RubricImage
+
+    file_paths = set(file_paths)
+    if not file_paths:
+        return []
+
+    # sorted, so concurrent deletes take the locks in the same order
+    for file_path in sorted(file_paths):
+        await lock_image_file(session, file_path)
+
+    referenced = set()
+    for model in (ProductImage, BrandImage, RubricImage):
+        referenced.update(await session.scalars(select(model.file).where(model.file.in_(file_paths))))
 
-    if os.path.exists(directory):                                          # Очищаем директорию, если она существует
-        logger.info("Cleaning folder: %r" % directory)
-        shutil.rmtree(directory)
+    unreferenced = sorted(file_paths - referenced)
+    if unreferenced:
+        from .image_variants import get_variant_paths
+        variant_paths = [path for file_path in unreferenced for path, _, _ in get_variant_paths(file_path).values()]
+        await asyncio.to_thread(remove_files, unreferenced + variant_paths)
+        logger.info("Removed unreferenced image files: %r" % unreferenced)
+    return unreferenced
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import os
+from typing import Iterable
+
+from sqlalchemy import select, update, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+# variants returned by list (short) schemas
+THUMBNAIL = "thumb"
+THUMBNAIL_WEBP = f"{THUMBNAIL}_webp"
+
+
+def get_variant_paths(
+        file_path: str,
+        sizes: dict[str, int] = settings.media.MEDIA_IMAGE_VARIANT_SIZES,
+) -> dict[str, tuple[str, int, str]]:
+    """
+    Deterministic variant paths next to the original:
+    `<dir>/<name>.<variant>.<ext>` -> (path, max side, PIL format)
+    """
+    base, extension = os.path.splitext(file_path)
+    # jpeg stays jpeg, png and gif (first frame) become png
+    if extension.lower() in (".jpg", ".jpeg"):
+        extension, image_format = ".jpg", "JPEG"
+    else:
+        extension, image_format = ".png", "PNG"
+
+    variants = {}
+    for name, size in sizes.items():
+        variants[name] = (f"{base}.{name}{extension}", size, image_format)
+        variants[f"{name}_webp"] = (f"{base}.{name}.webp", size, "WEBP")
+    return variants
+
+
+def generate_variants(file_path: str) -> dict[str, str]:
+    """
+    CPU-bound, runs in a worker thread. Existing variant files are kept, so repeated
+    and interrupted runs only produce missing ones. Every file is written atomically.
+    """
+    from PIL import Image, ImageOps
+
+    variants = get_variant_paths(file_path)
+    missing = {name: val for name, val in variants.items() if not os.path.exists(val[0])}
+
+    if missing:
+        with Image.open(file_path) as original:
+            original = ImageOps.exif_transpose(original)
+            for name, (path, size, image_format) in missing.items():
+                variant = original.copy()
+                variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+                if image_format == "JPEG" and variant.mode not in ("RGB", "L"):
+                    variant = variant.convert("RGB")
+
+                tmp_path = f"{path}.part"
+                variant.save(
+                    tmp_path,
+                    format=image_format,
+                    optimize=True,
+                    quality=settings.media.MEDIA_WEBP_QUALITY if image_format == "WEBP" else settings.media.MEDIA_JPEG_QUALITY,
+                )
+                os.replace(tmp_path, path)
+        logger.info("Generated %s variant(s) of %r" % (len(missing), file_path))
+
+    return {name: path for name, (path, _, _) in variants.items()}
+
+
+def get_image_models():
+    from src.core.models import ProductImage, BrandImage, RubricImage
+    return ProductImage, BrandImage, RubricImage
+
+
+async def get_pending_files(
+        session: AsyncSession,
+        after: str = "",
+        limit: int = settings.media.MEDIA_VARIANTS_BATCH_SIZE,
+) -> list[str]:
+    # keyset over distinct files, so backfilling can stop and continue at any time
+    stmt = union(*(
+        select(model.file).where(model.variants.is_(None), model.file > after)
+        for model in get_image_models()
+    )).order_by("file").limit(limit)
+    return list((await session.scalars(stmt)).all())
+
+
+async def save_variants(
+        session: AsyncSession,
+        files: Iterable[str],
+) -> dict[str, dict]:
+    result = {}
+    for file_path in files:
+        try:
+            variants = await asyncio.to_thread(generate_variants, file_path)
+        except FileNotFoundError:
+            logger.warning("Image file %r is missing, variants are skipped" % file_path)
+            # empty dict: not pending anymore, schemas fall back to the original file
+            variants = {}
+        except Exception as exc:
+            logger.error("Error while generating variants of %r" % file_path, exc_info=exc)
+            continue
+
+        for model in get_image_models():
+            await session.execute(
+                update(model).where(model.file == file_path).values(variants=variants)
+            )
+        result[file_path] = variants
+    await session.commit()
+    return result
+
+
+async def process_image_variants(
+        session: AsyncSession,
+        files: list[str] | None = None,
+) -> dict[str, int]:
+    """
+    Generates variants of given files, or backfills all images without variants in batches.
+    """
+    if files:
+        processed = await save_variants(session=session, files=set(files))
+        return {"processed": len(processed), "failed": len(set(files)) - len(processed)}
+
+    processed_count, failed_count, after = 0, 0, ""
+    while pending := await get_pending_files(session=session, after=after):
+        processed = await save_variants(session=session, files=pending)
+        processed_count += len(processed)
+        failed_count += len(pending) - len(processed)
+        after = pending[-1]
+
+    if processed_count or failed_count:
+        logger.info("Image variants backfill: %s processed, %s failed" % (processed_count, failed_count))
+    return {"processed": processed_count, "failed": failed_count}
+
+
+def enqueue_image_variants(files: Iterable[str]) -> None:
+    files = list(files)
+    if not files:
+        return
+    from src.api.v1.celery_tasks.tasks import task_generate_image_variants
+    try:
+        task_generate_image_variants.apply_async(args=(files, ))
+    except Exception as exc:
+        # images are picked up by the periodic backfill
+        logger.error("Error while enqueuing variants generation of %r" % files, exc_info=exc)
@@ -1,9 +1,9 @@
 import json
 
-from celery.result import AsyncResult
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy import event
 
+from src.api.v1.celery_tasks.outbox import write_outbox_event, OutboxEventTypes
 from src.core.models import Vote
 
 
@@ -11,12 +11,12 @@ CLASS = "Vote"
 
 
 @event.listens_for(Vote, 'after_insert', propagate=True)
-def after_order_insert(mapper, connection, target):
-    from src.api.v1.celery_tasks.tasks import task_send_tg_message
-    result: AsyncResult = task_send_tg_message.apply_async(
-        args=(
-            {
-                'subject': f"{CLASS.upper()} CREATED",
-                'body': json.dumps(jsonable_encoder(target.to_dict()), ensure_ascii=False)
-            },
-        ))
+def after_vote_insert(mapper, connection, target):
+    write_outbox_event(
+        connection=connection,
+        event_type=OutboxEventTypes.VOTE_CREATED,
+        payload={
+            'subject': f"{CLASS.upper()} CREATED",
+            'body': json.dumps(jsonable_encoder(target.to_dict()), ensure_ascii=False)
+        },
+    )
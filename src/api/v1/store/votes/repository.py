@@ -1,13 +1,14 @@
 import logging
 from typing import Sequence, TYPE_CHECKING, Union
 
-from sqlalchemy import select, Result
+from sqlalchemy import select, Result, Select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from src.core.models import Vote, Product
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from .exceptions import Errors
 from . import events
 
@@ -24,6 +25,7 @@ if TYPE_CHECKING:
 CLASS = "Vote"
 
 
+@traced
 class VotesRepository:
     def __init__(
             self,
@@ -101,6 +103,13 @@ class VotesRepository:
         result: Result = await self.session.execute(stmt)
         return result.unique().scalars().all()
 
+    def get_export_stmt(
+            self,
+            filter_model: "VoteFilter",
+    ) -> Select:
+        query_filter = filter_model.filter(select(*Vote.__table__.columns))
+        return filter_model.sort(query_filter).order_by(Vote.id)
+
     async def get_orm_model_from_schema(
             self,
             instance: Union["VoteCreate", "VoteUpdate", "VotePartialUpdate"]
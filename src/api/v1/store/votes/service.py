@@ -2,10 +2,12 @@ import logging
 from typing import TYPE_CHECKING, Optional
 
 from fastapi import status
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.tools.exceptions import CustomException
+from src.tools.exports import ExportFormat, export_response
+from src.tools.tracing import traced
 from . import utils
 from .repository import VotesRepository
 from .schemas import (
@@ -29,6 +31,7 @@ CLASS = "Vote"
 _CLASS = "vote"
 
 
+@traced
 class VotesService:
     def __init__(
             self,
@@ -63,6 +66,20 @@ class VotesService:
             result.append(await utils.get_schema_from_orm(orm_model=orm_model))
         return result
 
+    def export_all(
+            self,
+            filter_model: "VoteFilter",
+            file_format: ExportFormat,
+    ) -> StreamingResponse:
+        repository: VotesRepository = VotesRepository(
+            session=self.session
+        )
+        return export_response(
+            stmt=repository.get_export_stmt(filter_model=filter_model),
+            file_format=file_format,
+            filename="votes",
+        )
+
     async def get_one(
             self,
             id: int,
@@ -12,6 +12,7 @@ from fastapi_filter import FilterDepends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.scripts.pagination import paginate_result
+from src.tools.exports import ExportFormat
 from src.tools.stars_choices import StarsChoices
 from .service import VotesService
 from .schemas import (
@@ -134,6 +135,30 @@ async def get_all_full(
     )
 
 
+# 4_1
+@router.get(
+    "/export",
+    dependencies=[Depends(current_superuser),],
+    status_code=status.HTTP_200_OK,
+    description="Streaming export of filtered items as NDJSON or CSV (for superuser only)"
+)
+# @RateLimiter.rate_limit()
+# no rate limit for superuser
+async def export_all(
+        request: Request,
+        file_format: ExportFormat = Query("ndjson"),
+        filter_model: VoteFilter = FilterDepends(VoteFilter),
+        session: AsyncSession = Depends(DBConfigurer.session_getter)
+):
+    service: VotesService = VotesService(
+        session=session
+    )
+    return service.export_all(
+        filter_model=filter_model,
+        file_format=file_format,
+    )
+
+
 # 5
 @router.get(
     "/{id}",
@@ -0,0 +1,25 @@
+import json
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+
+from src.api.v1.celery_tasks.outbox import write_outbox_event, OutboxEventTypes
+from src.core.models import User
+
+
+CLASS = "User"
+
+
+@event.listens_for(User, 'after_insert', propagate=True)
+def after_user_insert(mapper, connection, target):
+    write_outbox_event(
+        connection=connection,
+        event_type=OutboxEventTypes.USER_REGISTERED,
+        payload={
+            'subject': f"{CLASS.upper()} REGISTERED",
+            'body': json.dumps(
+                jsonable_encoder(target.to_dict(), exclude={'hashed_password', }),
+                ensure_ascii=False
+            )
+        },
+    )
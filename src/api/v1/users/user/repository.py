@@ -10,8 +10,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from .exceptions import NoSessionException, Errors
+from . import events
 from src.core.models import User
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 
 if TYPE_CHECKING:
     from .schemas import (
@@ -26,6 +28,7 @@ logger = logging.getLogger(__name__)
 CLASS = "User"
 
 
+@traced
 class UsersRepository:
     def __init__(
         self,
@@ -117,7 +120,7 @@ class UsersRepository:
             instance: Union["UserCreate", "UserUpdate", "UserUpdateExtended"]
     ):
         dict_to_push = instance.model_dump()
-        dict_to_push['hashed_password'] = self.user_manager.password_helper.hash(instance.password)
+        dict_to_push['hashed_password'] = await self.user_manager.hash_password(instance.password)
         del dict_to_push['password']
         orm_model: User = User(
             **dict_to_push
@@ -14,6 +14,7 @@ from . import utils
 from .repository import UsersRepository
 from .exceptions import NoSessionException, Errors
 from src.api.v1.auth.exceptions import Errors as Auth_Errors
+from src.tools.tracing import traced
 from .schemas import UserCreate
 
 
@@ -22,6 +23,7 @@ if TYPE_CHECKING:
     from src.core.models import User
 
 
+@traced
 class UsersService:
     def __init__(
         self,
@@ -2,6 +2,7 @@ from typing import Type, TYPE_CHECKING
 
 from fastapi.responses import ORJSONResponse
 
+from src.core.models import User
 from src.tools.exceptions import CustomException
 from src.tools.inspector import (
     ValidRelationsInspectorBase,
@@ -12,7 +13,6 @@ from .exceptions import Errors
 
 if TYPE_CHECKING:
     from src.tools.errors_base import ErrorsBase
-    from src.core.models import User
 
 
 async def inspecting_user_exists(
@@ -22,11 +22,7 @@ async def inspecting_user_exists(
 ):
     # Expecting if chosen user exists
     try:
-        from .repository import UsersRepository
-        users_repository: UsersRepository = UsersRepository(
-            session=inspector.session,
-        )
-        user_orm: "User" = await users_repository.get_one_complex(id=user_id, maximized=False)
+        user_orm: "User" = await inspector.loader.get_one(User, user_id)
         inspector.result['user_orm'] = user_orm
     except CustomException as exc:
         inspector.error = ORJSONResponse(
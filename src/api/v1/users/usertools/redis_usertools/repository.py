@@ -0,0 +1,185 @@
+import logging
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+import redis
+
+from src.core.settings import settings
+from src.tools.tracing import traced
+
+if TYPE_CHECKING:
+    from src.core.models import UserTools
+    from src.tools.usertools_content import ToolsContent
+
+
+CLASS = "RedisUserTools"
+
+# short list name -> (UserTools dict field, UserTools max length field)
+LISTS = {
+    'rv': ('recently_viewed', 'max_length_rv'),
+    'w': ('wishlist', 'max_length_w'),
+    'c': ('comparison', 'max_length_c'),
+}
+
+# KEYS: dirty set, processing sorted set (id -> taken at); ARGV: count, now, lease expired before
+POP_DIRTY_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[3])
+if #expired > 0 then
+    redis.call('ZREM', KEYS[2], unpack(expired))
+    redis.call('SADD', KEYS[1], unpack(expired))
+end
+local ids = redis.call('SPOP', KEYS[1], ARGV[1])
+for _, id in ipairs(ids) do
+    redis.call('ZADD', KEYS[2], ARGV[2], id)
+end
+return ids
+"""
+
+
+@traced
+class RedisUserToolsRepository:
+    """
+    Keeps usertools lists in per-user redis sorted sets scored by timestamp.
+    Postgres UserTools columns are updated later by the persisting celery task.
+    """
+
+    def __init__(self):
+        self.service: redis.asyncio.Redis = redis.asyncio.Redis(
+            host=settings.redis.REDIS_HOST,
+            port=settings.redis.REDIS_PORT,
+            db=settings.redis.REDIS_DATABASE,
+        )
+        self.expired = settings.usertools.USERTOOLS_REDIS_LIFETIME_SECONDS
+        self.prefix = f"{settings.app.APP_NAME}_usertools:"
+        self.dirty_key = f"{settings.app.APP_NAME}_usertools_dirty"
+        self.processing_key = f"{settings.app.APP_NAME}_usertools_processing_leases"
+        self.lease = settings.usertools.USERTOOLS_PERSIST_LEASE_SECONDS
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def is_redis_backed(list_name: str) -> bool:
+        return list_name in settings.usertools.USERTOOLS_REDIS_LISTS
+
+    def get_redis_key(self, user_id: int, list_name: str):
+        return f"{self.prefix}{user_id}:{list_name}"
+
+    async def add(
+            self,
+            usertools: "UserTools",
+            content: "ToolsContent",
+            add_to: str = 'rv',
+    ) -> None:
+        _, max_length_field = LISTS[add_to]
+        max_length = getattr(usertools, max_length_field)
+        redis_key = self.get_redis_key(usertools.user_id, add_to)
+
+        async with self.service as client:
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.zadd(redis_key, {str(content.product_id): content.added.timestamp()})
+                # keeping only max_length newest items
+                pipe.zremrangebyrank(redis_key, 0, -(max_length + 1))
+                pipe.expire(redis_key, self.expired)
+                pipe.sadd(self.dirty_key, usertools.user_id)
+                await pipe.execute()
+        self.logger.info("Added to %s %r of user_id=%s: %r" % (CLASS, add_to, usertools.user_id, content))
+
+    async def remove(
+            self,
+            user_id: int,
+            product_id: int,
+            del_from: str = 'rv',
+    ) -> int:
+        async with self.service as client:
+            return await client.zrem(self.get_redis_key(user_id, del_from), str(product_id))
+
+    async def clear(
+            self,
+            user_id: int,
+            del_from: str = 'rv',
+    ) -> None:
+        async with self.service as client:
+            await client.delete(self.get_redis_key(user_id, del_from))
+
+    async def get(
+            self,
+            user_id: int,
+            list_name: str = 'rv',
+    ) -> dict[str, str]:
+        async with self.service as client:
+            members = await client.zrange(
+                self.get_redis_key(user_id, list_name), 0, -1, withscores=True
+            )
+        return {
+            member.decode() if isinstance(member, bytes) else str(member): datetime.fromtimestamp(score).isoformat()
+            for member, score in members
+        }
+
+    async def merge(
+            self,
+            usertools: "UserTools",
+            list_name: str = 'rv',
+    ) -> dict[str, str]:
+        # union of persisted dict and redis sorted set, the newest timestamp wins
+        field, max_length_field = LISTS[list_name]
+        merged = dict(getattr(usertools, field))
+        for product_id, added in (await self.get(usertools.user_id, list_name)).items():
+            if product_id not in merged or merged[product_id] < added:
+                merged[product_id] = added
+
+        merged = dict(sorted(merged.items(), key=lambda item: item[1]))
+        max_length = getattr(usertools, max_length_field)
+        for key in list(merged)[:max(len(merged) - max_length, 0)]:
+            del merged[key]
+        return merged
+
+    async def merge_all(
+            self,
+            usertools: "UserTools",
+    ) -> dict[str, dict]:
+        result = {}
+        for list_name, (field, _) in LISTS.items():
+            if self.is_redis_backed(list_name):
+                result[field] = await self.merge(usertools=usertools, list_name=list_name)
+        return result
+
+    async def pop_dirty_user_ids(
+            self,
+            count: int,
+    ) -> list[int]:
+        # ids move to the processing set atomically: marks set while they are persisted stay in the dirty set.
+        # Ids of a run which did not finish within the lease (crashed) are returned to the dirty set first,
+        # ids of runs still in flight are left to them
+        now = time.time()
+        async with self.service as client:
+            user_ids = await client.eval(
+                POP_DIRTY_SCRIPT, 2, self.dirty_key, self.processing_key, count, now, now - self.lease,
+            )
+        return [int(user_id) for user_id in user_ids or []]
+
+    async def take_dirty(
+            self,
+            user_ids: list[int],
+    ) -> None:
+        if not user_ids:
+            return
+        async with self.service as client:
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.srem(self.dirty_key, *user_ids)
+                pipe.zadd(self.processing_key, dict.fromkeys(user_ids, time.time()))
+                await pipe.execute()
+
+    async def finish_processing(
+            self,
+            persisted: list[int],
+            failed: list[int],
+    ) -> None:
+        # only persisted ids lose the mark, failed ones are persisted by the next run
+        if not persisted and not failed:
+            return
+        async with self.service as client:
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.zrem(self.processing_key, *persisted, *failed)
+                if failed:
+                    pipe.sadd(self.dirty_key, *failed)
+                await pipe.execute()
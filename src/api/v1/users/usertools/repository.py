@@ -9,6 +9,7 @@ from sqlalchemy.orm import joinedload
 
 from src.core.models import UserTools
 from src.tools.exceptions import CustomException
+from src.tools.tracing import traced
 from .exceptions import Errors
 
 if TYPE_CHECKING:
@@ -24,6 +25,7 @@ if TYPE_CHECKING:
 CLASS = "UserTools"
 
 
+@traced
 class UserToolsRepository:
     def __init__(
             self,
@@ -191,6 +193,26 @@ class UserToolsRepository:
             )
         return usertools
 
+    async def replace_dicts(
+            self,
+            usertools: UserTools,
+            contents: dict[str, dict],
+    ):
+        for key, val in contents.items():
+            setattr(usertools, key, val)
+
+        try:
+            await self.session.commit()
+            await self.session.refresh(usertools)
+            self.logger.info("%s lists %s were successfully persisted" % (usertools, list(contents)))
+        except IntegrityError as exc:
+            self.logger.error("Error occurred while editing data in database", exc_info=exc)
+            raise CustomException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                msg=Errors.DATABASE_ERROR()
+            )
+        return usertools
+
     async def operate_dict(
             self,
             content: "ToolsContent",
@@ -3,11 +3,15 @@ import logging
 from typing import TYPE_CHECKING, Optional
 
 from fastapi.responses import ORJSONResponse
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.tools.exceptions import CustomException
 from src.tools.usertools_content import ToolsContent
+from src.tools.tracing import traced
 from .repository import UserToolsRepository
+from .redis_usertools import RedisUserToolsRepository
+from .redis_usertools.repository import LISTS as redis_repository_lists
 from .exceptions import Errors
 from .validators import ValidRelationsInspector
 from .schemas import (
@@ -27,6 +31,7 @@ CLASS = "UserTools"
 _CLASS = "user_tools"
 
 
+@traced
 class UserToolsService:
     def __init__(
             self,
@@ -257,9 +262,23 @@ class UserToolsService:
                 to_schema=False,
             )
         if to_schema:
-            return await utils.get_short_schema_from_orm(sa_orm_model)
+            return await self.get_merged_short_schema(sa_orm_model)
         return sa_orm_model
 
+    async def get_merged_short_schema(
+            self,
+            usertools: "UserTools",
+    ):
+        if isinstance(usertools, ORJSONResponse):
+            return usertools
+        redis_repository: RedisUserToolsRepository = RedisUserToolsRepository()
+        try:
+            contents = await redis_repository.merge_all(usertools=usertools)
+        except RedisError as exc:
+            self.logger.error("Error occurred while reading %s lists from redis" % CLASS, exc_info=exc)
+            contents = None
+        return await utils.get_short_schema_from_orm(usertools, contents=contents)
+
     async def add_to_list(
             self,
             usertools: "UserTools",
@@ -275,6 +294,21 @@ class UserToolsService:
             added=datetime.datetime.now()
         )
 
+        if RedisUserToolsRepository.is_redis_backed(add_to):
+            redis_repository: RedisUserToolsRepository = RedisUserToolsRepository()
+            try:
+                # no database write here, the list is persisted later by celery task
+                await redis_repository.add(
+                    usertools=usertools,
+                    content=content,
+                    add_to=add_to,
+                )
+                if to_schema:
+                    return await self.get_merged_short_schema(usertools)
+                return usertools
+            except RedisError as exc:
+                self.logger.error("Error occurred while writing to redis, writing to database", exc_info=exc)
+
         repository: UserToolsRepository = UserToolsRepository(
             session=self.session
         )
@@ -295,7 +329,7 @@ class UserToolsService:
                 }
             )
         if to_schema:
-            return await utils.get_short_schema_from_orm(orm_model)
+            return await self.get_merged_short_schema(orm_model)
         return orm_model
 
     async def del_from_list(
@@ -305,6 +339,24 @@ class UserToolsService:
             del_from: str = 'rv',
             to_schema: bool = False
     ):
+        if RedisUserToolsRepository.is_redis_backed(del_from):
+            redis_repository: RedisUserToolsRepository = RedisUserToolsRepository()
+            try:
+                removed = await redis_repository.remove(
+                    user_id=usertools.user_id,
+                    product_id=product_id,
+                    del_from=del_from,
+                )
+            except RedisError as exc:
+                self.logger.error("Error occurred while removing from redis", exc_info=exc)
+                removed = 0
+            field, _ = redis_repository_lists[del_from]
+            if removed and str(product_id) not in getattr(usertools, field):
+                # item was not persisted yet, nothing to remove from database
+                if to_schema:
+                    return await self.get_merged_short_schema(usertools)
+                return usertools
+
         repository: UserToolsRepository = UserToolsRepository(
             session=self.session
         )
@@ -324,7 +376,7 @@ class UserToolsService:
                 }
             )
         if to_schema:
-            return await utils.get_short_schema_from_orm(orm_model)
+            return await self.get_merged_short_schema(orm_model)
         return orm_model
 
     async def clear_list(
@@ -333,6 +385,16 @@ class UserToolsService:
             del_from: str = 'rv',
             to_schema: bool = False
     ):
+        if RedisUserToolsRepository.is_redis_backed(del_from):
+            redis_repository: RedisUserToolsRepository = RedisUserToolsRepository()
+            try:
+                await redis_repository.clear(
+                    user_id=usertools.user_id,
+                    del_from=del_from,
+                )
+            except RedisError as exc:
+                self.logger.error("Error occurred while clearing list in redis", exc_info=exc)
+
         repository: UserToolsRepository = UserToolsRepository(
             session=self.session
         )
@@ -351,7 +413,7 @@ class UserToolsService:
                 }
             )
         if to_schema:
-            return await utils.get_short_schema_from_orm(orm_model)
+            return await self.get_merged_short_schema(orm_model)
         return orm_model
 
     async def get_list(
@@ -360,12 +422,18 @@ class UserToolsService:
             source: str = 'rv',
             to_schema: bool = False
     ):
-        if source == 'w':
-            product_ids = [int(key) for key in usertools.wishlist.keys()]
-        elif source == "c":
-            product_ids = [int(key) for key in usertools.comparison.keys()]
-        else: # source == "rv"
-            product_ids = [int(key) for key in usertools.recently_viewed.keys()]
+        field, _ = redis_repository_lists[source if source in redis_repository_lists else 'rv']
+        content: dict = getattr(usertools, field)
+        if RedisUserToolsRepository.is_redis_backed(source):
+            redis_repository: RedisUserToolsRepository = RedisUserToolsRepository()
+            try:
+                content = await redis_repository.merge(
+                    usertools=usertools,
+                    list_name=source,
+                )
+            except RedisError as exc:
+                self.logger.error("Error occurred while reading list from redis", exc_info=exc)
+        product_ids = [int(key) for key in content.keys()]
         if not product_ids:
             return []
 
@@ -373,11 +441,46 @@ class UserToolsService:
         prod_service: ProductsService = ProductsService(
             session=self.session
         )
-        products = []
-        for product_id in product_ids:
-            product = await prod_service.get_one_complex(id=product_id)
-            if isinstance(product, ORJSONResponse):
-                return product
-            products.append(product)
-
-        return products
+        # one query for the whole list, stored order kept, missing products skipped
+        return await prod_service.get_all_by_ids(
+            ids=product_ids,
+            to_schema=to_schema,
+        )
+
+    async def persist_redis_lists(
+            self,
+            user_id: int,
+    ):
+        repository: UserToolsRepository = UserToolsRepository(
+            session=self.session
+        )
+        try:
+            usertools: "UserTools" = await repository.get_one(user_id=user_id)
+        except CustomException as exc:
+            self.logger.warning("Lists of user_id=%s can't be persisted: %s" % (user_id, exc.msg))
+            return ORJSONResponse(
+                status_code=exc.status_code,
+                content={
+                    "message": Errors.HANDLER_MESSAGE(),
+                    "detail": exc.msg,
+                }
+            )
+
+        redis_repository: RedisUserToolsRepository = RedisUserToolsRepository()
+        contents = await redis_repository.merge_all(usertools=usertools)
+        if not contents:
+            return usertools
+        try:
+            return await repository.replace_dicts(
+                usertools=usertools,
+                contents=contents,
+            )
+        except CustomException as exc:
+            self.logger.error(Errors.DATABASE_ERROR(), exc_info=exc)
+            return ORJSONResponse(
+                status_code=exc.status_code,
+                content={
+                    "message": Errors.HANDLER_MESSAGE(),
+                    "detail": exc.msg,
+                }
+            )
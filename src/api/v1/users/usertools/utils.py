@@ -1,7 +1,9 @@
 from typing import TYPE_CHECKING, Any
 
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.settings import settings
 from src.tools.usertools_content import ToolsContent
 from ..user.utils import get_short_schema_from_orm as get_short_user_schema_from_orm
 
@@ -20,10 +22,13 @@ CLASS = "UserTools"
 
 
 async def get_short_schema_from_orm(
-    orm_model: "UserTools"
+    orm_model: "UserTools",
+    contents: dict | None = None,
 ) -> UserToolsShort:
 
     dictionary: dict = {**orm_model.to_dict()}
+    if contents:        # lists merged with redis sorted sets
+        dictionary.update(contents)
     dictionary['wishlist'] = ToolsContent.from_dict(dictionary['wishlist'])
     dictionary['comparison'] = ToolsContent.from_dict(dictionary['comparison'])
     dictionary['recently_viewed'] = ToolsContent.from_dict(dictionary['recently_viewed'])
@@ -67,3 +72,37 @@ async def get_or_create(
         session=session
     )
     return await service.get_or_create(user_id)
+
+
+async def persist_redis_lists(
+        session: AsyncSession,
+        user_ids: list[int] | None = None,
+) -> list[int]:
+    from .redis_usertools import RedisUserToolsRepository
+    from .service import UserToolsService
+
+    redis_repository: RedisUserToolsRepository = RedisUserToolsRepository()
+    if user_ids is None:
+        user_ids = await redis_repository.pop_dirty_user_ids(
+            count=settings.usertools.USERTOOLS_PERSIST_BATCH_SIZE
+        )
+    else:
+        await redis_repository.take_dirty(user_ids=user_ids)
+
+    service = UserToolsService(
+        session=session
+    )
+    persisted = []
+    try:
+        for user_id in user_ids:
+            result = await service.persist_redis_lists(user_id=user_id)
+            if not isinstance(result, ORJSONResponse):
+                persisted.append(user_id)
+    finally:
+        # failed and not reached ids get the dirty mark back
+        done = set(persisted)
+        await redis_repository.finish_processing(
+            persisted=persisted,
+            failed=[user_id for user_id in user_ids if user_id not in done],
+        )
+    return persisted
@@ -3,3 +3,10 @@ from .swagger_config import SwaggerConfigurer
 from .database_config import DBConfigurer
 from .rate_limiter_config import RateLimiter
 from .exception_handler_config import ExceptionHandlerConfigurer
+from .static_config import StaticConfigurer
+from .compression_config import CompressionConfigurer
+from .instrumentation_config import InstrumentationConfigurer
+from .metrics_config import MetricsConfigurer
+from .tracing_config import TracingConfigurer
+from .profiling_config import ProfilingConfigurer
+from .slow_queries_config import SlowQueriesConfigurer
@@ -1,11 +1,14 @@
 import logging
 
-from typing import Callable, Dict, Any
-from fastapi import FastAPI
+from typing import Callable, Dict, Any, Optional
+
+import orjson
+from fastapi import FastAPI, Request
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, Response
 
 from src.core.settings import settings
+from src.tools.openapi_cache import OpenApiCache, get_code_hash
 
 
 class AppConfigurer:
@@ -24,19 +27,74 @@ class AppConfigurer:
         )
         return app
 
+    @staticmethod
+    def get_route_table(subject: FastAPI) -> str:
+        # routes added or moved by settings (profiling, slow queries, ...) change the key without code changes
+        return "\n".join(
+            f"{getattr(route, 'path', '')} {','.join(sorted(getattr(route, 'methods', None) or ()))} "
+            f"{getattr(route, 'name', '')} {getattr(route, 'include_in_schema', '')}"
+            for route in subject.routes
+        )
+
+    @staticmethod
+    def get_openapi_cache(subject: FastAPI) -> Optional[OpenApiCache]:
+        if not settings.openapi.OPENAPI_CACHE_ENABLED:
+            return None
+        # titles come from the environment, the route table covers prefixes and optional routes
+        extra = (
+            settings.app.model_dump_json(exclude={"APP_BASE_DIR"})
+            + settings.tags.model_dump_json()
+            + AppConfigurer.get_route_table(subject)
+        )
+        return OpenApiCache(
+            directory=settings.openapi.OPENAPI_CACHE_DIR,
+            key=get_code_hash([settings.app.APP_BASE_DIR], extra=extra),
+        )
+
     @staticmethod
     def get_custom_openapi(subject: FastAPI) -> Callable[[], Dict[str, Any]]:
         def custom_openapi() -> Dict[str, Any]:
             if subject.openapi_schema:
                 return subject.openapi_schema
-            openapi_schema = get_openapi(
-                title=settings.app.APP_TITLE,
-                version=settings.app.APP_VERSION,
-                description=settings.app.APP_DESCRIPTION,
-                routes=subject.routes,
-                webhooks=subject.webhooks,
-            )
+            cache = AppConfigurer.get_openapi_cache(subject)
+            openapi_schema = cache.load() if cache else None
+            if openapi_schema is None:
+                openapi_schema = get_openapi(
+                    title=settings.app.APP_TITLE,
+                    version=settings.app.APP_VERSION,
+                    description=settings.app.APP_DESCRIPTION,
+                    routes=subject.routes,
+                    webhooks=subject.webhooks,
+                )
+                if cache:
+                    cache.save(openapi_schema)
             subject.openapi_schema = openapi_schema
             return subject.openapi_schema
 
         return custom_openapi
+
+    @staticmethod
+    def get_openapi_json(subject: FastAPI) -> bytes:
+        if getattr(subject.state, "openapi_json", None) is None:
+            subject.state.openapi_json = orjson.dumps(subject.openapi())
+        return subject.state.openapi_json
+
+    @staticmethod
+    def config_openapi(app: FastAPI):
+        # the default route serializes the whole schema dict on every request
+        if not app.openapi_url:
+            return
+        app.router.routes = [
+            route for route in app.router.routes if getattr(route, "path", None) != app.openapi_url
+        ]
+
+        async def openapi(request: Request) -> Response:
+            return Response(AppConfigurer.get_openapi_json(app), media_type="application/json")
+
+        app.add_route(app.openapi_url, openapi, include_in_schema=False)
+
+    @staticmethod
+    def build_openapi(app: FastAPI):
+        # at startup, so that the first /openapi.json or /docs hit does not wait for it
+        if settings.openapi.OPENAPI_BUILD_ON_STARTUP and app.openapi_url:
+            AppConfigurer.get_openapi_json(app)
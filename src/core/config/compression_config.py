@@ -0,0 +1,20 @@
+from fastapi import FastAPI
+
+from src.core.settings import settings
+from src.tools.compression import CompressionMiddleware
+
+
+class CompressionConfigurer:
+
+    @staticmethod
+    def config_compression(app: FastAPI):
+        if not settings.compression.COMPRESSION_ENABLED:
+            return
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression.COMPRESSION_MINIMUM_SIZE_BYTES,
+            content_types=tuple(settings.compression.COMPRESSION_CONTENT_TYPES),
+            gzip_level=settings.compression.COMPRESSION_GZIP_LEVEL,
+            brotli_quality=settings.compression.COMPRESSION_BROTLI_QUALITY,
+            brotli_enabled=settings.compression.COMPRESSION_BROTLI_ENABLED,
+        )
@@ -7,6 +7,9 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from src.core.settings import settings
+from src.tools.metrics import MeteredQueuePool
+from src.tools.relations_loader import RelationsLoader
+from src.tools.slow_queries import SlowQueryLog
 
 
 class Utils:
@@ -30,12 +33,14 @@ class DBConfigurerInitializer:
             connection_path: str,
             echo: bool,
             pool_size: int,
+            slow_query_log: SlowQueryLog | None = None,
     ):
         self.connection_path = connection_path
         self.engine: AsyncEngine = create_async_engine(
             url=self.connection_path,
             echo=echo,
             pool_size=pool_size,
+            poolclass=MeteredQueuePool,
             json_serializer=lambda obj: json.dumps(obj, ensure_ascii=False)
         )
         self.Session: async_sessionmaker[AsyncSession] = async_sessionmaker(
@@ -44,6 +49,9 @@ class DBConfigurerInitializer:
             autocommit=False,
             expire_on_commit=False,
         )
+        self.slow_query_log = slow_query_log
+        if slow_query_log is not None:
+            slow_query_log.instrument(self.engine)
 
     async def dispose(self) -> None:
         await self.engine.dispose()
@@ -51,10 +59,23 @@ class DBConfigurerInitializer:
     async def session_getter(self) -> AsyncGenerator[AsyncSession, None]:
         async with self.Session() as session:
             yield session
+            RelationsLoader.log_stats(session)
 
 
 DBConfigurer = DBConfigurerInitializer(
     connection_path=settings.db.DB_URL,
     echo=settings.db.DB_ECHO_MODE,
     pool_size=settings.db.DB_POOL_SIZE,
+    slow_query_log=SlowQueryLog(
+        threshold_ms=settings.slow_queries.SLOW_QUERIES_THRESHOLD_MS,
+        key_prefix=f"{settings.app.APP_NAME}_slow_queries",
+        redis_kwargs={
+            "host": settings.redis.REDIS_HOST,
+            "port": settings.redis.REDIS_PORT,
+            "db": settings.redis.REDIS_DATABASE,
+        },
+        explain_ratio=settings.slow_queries.SLOW_QUERIES_EXPLAIN_RATIO,
+        explain_timeout_ms=settings.slow_queries.SLOW_QUERIES_EXPLAIN_TIMEOUT_MS,
+        log_size=settings.slow_queries.SLOW_QUERIES_LOG_SIZE,
+    ) if settings.slow_queries.SLOW_QUERIES_ENABLED else None,
 )
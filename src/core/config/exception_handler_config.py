@@ -8,6 +8,7 @@ from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError, DatabaseError
 
 from src.tools.exceptions import CustomException
+from src.tools.passwords import PasswordPoolBusy
 
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,7 @@ logger = logging.getLogger(__name__)
 class Errors:
     HANDLER_MESSAGE = "Handled by Application Exception Handler"
     DATABASE_ERROR = "Error occurred while changing database data"
+    PASSWORD_POOL_BUSY = "Too many logins at the moment, please, try again later"
 
 
 class ExceptionHandlerConfigurer:
@@ -78,3 +80,15 @@ class ExceptionHandlerConfigurer:
                     "detail": Errors.DATABASE_ERROR,
                 }
             )
+
+        @app.exception_handler(PasswordPoolBusy)
+        async def password_pool_busy_handler(request, exc: PasswordPoolBusy):
+            logger.warning(Errors.PASSWORD_POOL_BUSY)
+            return ORJSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
+                content={
+                    "message": Errors.HANDLER_MESSAGE,
+                    "detail": Errors.PASSWORD_POOL_BUSY,
+                }
+            )
@@ -0,0 +1,21 @@
+from fastapi import FastAPI
+
+from src.core.settings import settings
+from src.tools.instrumentation import InstrumentationMiddleware, instrument_engine, instrument_redis
+from .database_config import DBConfigurer
+
+
+class InstrumentationConfigurer:
+
+    @staticmethod
+    def config_instrumentation(app: FastAPI):
+        if not settings.instrumentation.INSTRUMENTATION_ENABLED:
+            return
+        instrument_engine(DBConfigurer.engine)
+        instrument_redis()
+        app.add_middleware(
+            InstrumentationMiddleware,
+            server_timing=settings.instrumentation.INSTRUMENTATION_SERVER_TIMING,
+            n_plus_one_threshold=settings.instrumentation.INSTRUMENTATION_N_PLUS_ONE_THRESHOLD,
+            max_queries=settings.instrumentation.INSTRUMENTATION_MAX_QUERIES_PER_REQUEST,
+        )
@@ -0,0 +1,46 @@
+from fastapi import FastAPI, Request, Response
+from prometheus_client.core import GaugeMetricFamily
+
+from src.core.settings import settings
+from src.tools.metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, instrument_redis_pool, render_metrics
+from .database_config import DBConfigurer
+
+
+class MetricsConfigurer:
+
+    @staticmethod
+    def get_db_pool_metrics() -> list[GaugeMetricFamily]:
+        # pool of the process serving the scrape
+        pool = DBConfigurer.engine.pool
+        return [
+            GaugeMetricFamily("db_pool_size", "Database pool size", value=pool.size()),
+            GaugeMetricFamily("db_pool_checked_out", "Database connections in use", value=pool.checkedout()),
+            GaugeMetricFamily("db_pool_checked_in", "Idle database connections in the pool", value=pool.checkedin()),
+            GaugeMetricFamily("db_pool_overflow", "Database connections above the pool size", value=pool.overflow()),
+        ]
+
+    @staticmethod
+    async def metrics_endpoint(request: Request) -> Response:
+        from src.api.v1.celery_tasks.metrics import collect_celery_metrics
+
+        content = render_metrics([
+            *MetricsConfigurer.get_db_pool_metrics(),
+            *await collect_celery_metrics(),
+        ])
+        return Response(content=content, media_type=CONTENT_TYPE_LATEST)
+
+    @staticmethod
+    def config_metrics(app: FastAPI):
+        if not settings.metrics.METRICS_ENABLED:
+            return
+        instrument_redis_pool()
+        app.add_middleware(
+            MetricsMiddleware,
+            excluded_paths=(settings.metrics.METRICS_PATH, ),
+        )
+        app.add_api_route(
+            settings.metrics.METRICS_PATH,
+            MetricsConfigurer.metrics_endpoint,
+            methods=["GET"],
+            include_in_schema=False,
+        )
@@ -0,0 +1,88 @@
+from fastapi import Depends, FastAPI, Query, Request
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.types import Scope
+
+from src.core.settings import settings
+from src.tools.profiling import ProfileStore, ProfilingMiddleware, get_top, parse_collapsed
+from .database_config import DBConfigurer
+
+
+store = ProfileStore(
+    directory=settings.profiling.PROFILING_DIR,
+    max_files=settings.profiling.PROFILING_MAX_FILES,
+)
+
+
+class ProfilingConfigurer:
+
+    @staticmethod
+    async def is_superuser(scope: Scope) -> bool:
+        # the checks of current_superuser, run only for requests asking for a profile
+        from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
+        from src.api.v1.auth.backend import auth_backend
+        from src.api.v1.auth.user_manager import UserManager
+        from src.core.models import User
+
+        token = await auth_backend.transport.scheme(Request(scope))
+        if not token:
+            return False
+        async with DBConfigurer.Session() as session:
+            user = await auth_backend.get_strategy().read_token(
+                token, UserManager(SQLAlchemyUserDatabase(session, User)),
+            )
+        return user is not None and user.is_active and user.is_verified and user.is_superuser
+
+    @staticmethod
+    async def list_profiles() -> list[dict]:
+        return await run_in_threadpool(store.list)
+
+    @staticmethod
+    async def get_profile(
+            profile_id: str,
+            limit: int = Query(settings.profiling.PROFILING_TOP_N, gt=0),
+    ) -> ORJSONResponse:
+        try:
+            profile = await run_in_threadpool(store.get, profile_id)
+        except FileNotFoundError:
+            return ORJSONResponse(status_code=404, content={"detail": f"Profile {profile_id!r} not found"})
+        profile["top"] = get_top(parse_collapsed(profile.pop("collapsed")), limit=limit)
+        return ORJSONResponse(content=profile)
+
+    @staticmethod
+    async def get_collapsed(profile_id: str) -> PlainTextResponse:
+        try:
+            profile = await run_in_threadpool(store.get, profile_id)
+        except FileNotFoundError:
+            return PlainTextResponse(status_code=404, content=f"Profile {profile_id!r} not found")
+        return PlainTextResponse(content=profile["collapsed"])
+
+    @staticmethod
+    def config_profiling(app: FastAPI):
+        if not settings.profiling.PROFILING_ENABLED:
+            return
+        from src.api.v1.users.user.dependencies import current_superuser
+
+        app.add_middleware(
+            ProfilingMiddleware,
+            store=store,
+            authorize=ProfilingConfigurer.is_superuser,
+            header=settings.profiling.PROFILING_HEADER,
+            query_param=settings.profiling.PROFILING_QUERY_PARAM,
+            sample_interval=settings.profiling.PROFILING_SAMPLE_INTERVAL_SECONDS,
+            every_n=settings.profiling.PROFILING_EVERY_N_REQUESTS,
+            excluded_paths=(settings.metrics.METRICS_PATH, ),
+        )
+        prefix = settings.profiling.PROFILING_PREFIX
+        for path, endpoint in (
+            (prefix, ProfilingConfigurer.list_profiles),
+            (f"{prefix}/{{profile_id}}", ProfilingConfigurer.get_profile),
+            (f"{prefix}/{{profile_id}}/collapsed", ProfilingConfigurer.get_collapsed),
+        ):
+            app.add_api_route(
+                path,
+                endpoint,
+                methods=["GET"],
+                tags=[settings.tags.TECH_TAG],
+                dependencies=[Depends(current_superuser)],
+            )
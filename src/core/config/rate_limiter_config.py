@@ -10,6 +10,7 @@ from fastapi import Request, status
 from fastapi.responses import ORJSONResponse
 
 from src.core.settings import settings
+from src.tools.metrics import RATE_LIMITER_DECISIONS
 
 
 logger = logging.getLogger(__name__)
@@ -63,8 +64,10 @@ class RateLimiter:
                             json.dumps(timestamps),
                             ex=settings.redis.REDIS_CACHE_LIFETIME_SECONDS
                         )
+                        RATE_LIMITER_DECISIONS.labels(decision="allow").inc()
                         return await func(request, *args, **kwargs)
 
+                RATE_LIMITER_DECISIONS.labels(decision="deny").inc()
                 wait: float = period - (now - timestamps[0])
                 logger.warning("Too many requests from %r" % request.client.host)
                 return ORJSONResponse(
@@ -0,0 +1,39 @@
+from fastapi import Depends, FastAPI, Query, Response
+from fastapi.responses import ORJSONResponse
+
+from src.core.settings import settings
+from src.tools.slow_queries import RequestContextMiddleware
+from .database_config import DBConfigurer
+
+
+class SlowQueriesConfigurer:
+
+    @staticmethod
+    async def get_slow_queries(
+            limit: int = Query(50, gt=0),
+    ) -> ORJSONResponse:
+        return ORJSONResponse(content=await DBConfigurer.slow_query_log.get_report(limit=limit))
+
+    @staticmethod
+    async def clear_slow_queries() -> Response:
+        await DBConfigurer.slow_query_log.clear()
+        return Response(status_code=204)
+
+    @staticmethod
+    def config_slow_queries(app: FastAPI):
+        if DBConfigurer.slow_query_log is None:
+            return
+        from src.api.v1.users.user.dependencies import current_superuser
+
+        app.add_middleware(RequestContextMiddleware)
+        for method, endpoint in (
+            ("GET", SlowQueriesConfigurer.get_slow_queries),
+            ("DELETE", SlowQueriesConfigurer.clear_slow_queries),
+        ):
+            app.add_api_route(
+                settings.slow_queries.SLOW_QUERIES_PATH,
+                endpoint,
+                methods=[method],
+                tags=[settings.tags.TECH_TAG],
+                dependencies=[Depends(current_superuser)],
+            )
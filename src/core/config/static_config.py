@@ -0,0 +1,38 @@
+import os
+
+from fastapi import FastAPI
+
+from src.core.settings import settings
+from src.tools.static_files import HashedStaticFiles
+
+
+class StaticConfigurer:
+    static_files: HashedStaticFiles | None = None
+
+    @classmethod
+    def config_static(cls, app: FastAPI):
+        # swagger bundles etc.: hashed urls + .br/.gz variants prepared on startup (or at image build)
+        cls.static_files = HashedStaticFiles(
+            directory=settings.static.STATIC_ROOT,
+            hashed_urls=settings.static.STATIC_HASHED_URLS,
+            precompress=settings.static.STATIC_PRECOMPRESS_ON_STARTUP,
+        )
+        app.mount(settings.static.STATIC_URL, cls.static_files, name="static")
+
+        # uploaded images are content addressed (media/images/<xx>/<sha256>...), so cached forever
+        os.makedirs(settings.media.MEDIA_ROOT, exist_ok=True)
+        app.mount(
+            settings.media.MEDIA_URL,
+            HashedStaticFiles(
+                directory=settings.media.MEDIA_ROOT,
+                hashed_urls=False,
+                immutable_prefixes=("images/", ),
+            ),
+            name="media",
+        )
+
+    @classmethod
+    def static_url(cls, path: str) -> str:
+        if cls.static_files is None:
+            return f"{settings.static.STATIC_URL}/{path.lstrip('/')}"
+        return f"{settings.static.STATIC_URL}/{cls.static_files.url_path(path)}"
@@ -35,7 +35,7 @@ class SwaggerConfigurer:
     @staticmethod
     def config_swagger(app: FastAPI, app_title='Unknown application'):
 
-        from src.core.config import RateLimiter
+        from src.core.config import RateLimiter, StaticConfigurer
 
         @app.get(
             '/docs',
@@ -51,9 +51,9 @@ class SwaggerConfigurer:
                 title=app_title + ' Swagger UI',
                 oauth2_redirect_url=app.swagger_ui_oauth2_redirect_url,
                 # swagger_js_url="https://unpkg.com/swagger-ui-dist@5/swagger-ui-bundle.js",
-                swagger_js_url=f"/static/swagger/js/swagger-ui-bundle.js",
+                swagger_js_url=StaticConfigurer.static_url("swagger/js/swagger-ui-bundle.js"),
                 # swagger_css_url="https://unpkg.com/swagger-ui-dist@5/swagger-ui.css",
-                swagger_css_url=f"/static/swagger/css/swagger-ui.css"
+                swagger_css_url=StaticConfigurer.static_url("swagger/css/swagger-ui.css")
             )
 
         @app.get(
@@ -79,5 +79,5 @@ class SwaggerConfigurer:
                 openapi_url=app.openapi_url,
                 title=app.title + " - ReDoc",
                 # redoc_js_url="https://unpkg.com/redoc@next/bundles/redoc.standalone.js",
-                redoc_js_url=f"/static/swagger/js/redoc.standalone.js"
+                redoc_js_url=StaticConfigurer.static_url("swagger/js/redoc.standalone.js")
             )
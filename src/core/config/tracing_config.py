@@ -0,0 +1,47 @@
+from fastapi import FastAPI
+
+from src.core.settings import settings
+from src.tools.tracing import (
+    FileExporter, OtlpHttpExporter, TracingMiddleware, instrument_engine, instrument_redis, tracer,
+)
+from .database_config import DBConfigurer
+
+
+class TracingConfigurer:
+
+    @staticmethod
+    def config_tracer() -> bool:
+        # shared by the API and the celery workers
+        if not settings.tracing.TRACING_ENABLED:
+            return False
+        if settings.tracing.TRACING_EXPORTER == "otlp":
+            exporter = OtlpHttpExporter(
+                endpoint=settings.tracing.TRACING_OTLP_ENDPOINT,
+                service_name=settings.tracing.TRACING_SERVICE_NAME,
+            )
+        else:
+            exporter = FileExporter(settings.tracing.TRACING_FILE_PATH)
+        tracer.configure(
+            exporter=exporter,
+            sample_ratio=settings.tracing.TRACING_SAMPLE_RATIO,
+            batch_size=settings.tracing.TRACING_EXPORT_BATCH_SIZE,
+            export_interval=settings.tracing.TRACING_EXPORT_INTERVAL_SECONDS,
+        )
+        instrument_engine(DBConfigurer.engine)
+        instrument_redis()
+        return True
+
+    @staticmethod
+    def flush():
+        # spans still queued at shutdown
+        if tracer.enabled:
+            tracer.flush()
+
+    @staticmethod
+    def config_tracing(app: FastAPI):
+        if not TracingConfigurer.config_tracer():
+            return
+        app.add_middleware(
+            TracingMiddleware,
+            excluded_paths=(settings.metrics.METRICS_PATH, ),
+        )
@@ -27,6 +27,11 @@ __all__ = (
     "Person",
     "Address",
     "Order",
+    "OrderItem",
+
+    "OutboxEvent",
+
+    "SalesRollup",
 
 )
 
@@ -49,4 +54,8 @@ from .carts.cart import Cart, CartItem
 
 from .orders.person import Person
 from .orders.address import Address
-from .orders.order import Order
+from .orders.order import Order, OrderItem
+
+from .outbox.outbox_event import OutboxEvent
+
+from .analytics.sales_rollup import SalesRollup
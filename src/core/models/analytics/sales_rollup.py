@@ -0,0 +1,60 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import String, DateTime, Integer, DECIMAL, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.models import Base
+from src.core.models.mixins import IDIntPkMixin
+
+
+class SalesRollup(IDIntPkMixin, Base):
+    __table_args__ = (
+        # upsert key of incremental updates and the index of range queries per dimension
+        UniqueConstraint(
+            "granularity", "dimension", "period_start", "dimension_id",
+            name="granularity_dimension_period",
+        ),
+    )
+
+    # 'hour' or 'day'
+    granularity: Mapped[str] = mapped_column(
+        String(5),
+        nullable=False,
+    )
+
+    period_start: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+    )
+
+    # 'total', 'product', 'brand', 'rubric', 'move_to', 'payment_conditions'
+    dimension: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+    )
+
+    # id of product / brand / rubric, choice value of move_to / payment_conditions, 0 for total
+    dimension_id: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
+
+    orders_placed: Mapped[int] = mapped_column(Integer, default=0, server_default='0')
+    units_placed: Mapped[int] = mapped_column(Integer, default=0, server_default='0')
+    revenue_placed: Mapped[Decimal] = mapped_column(DECIMAL(14, 2), default=0, server_default='0')
+
+    orders_delivered: Mapped[int] = mapped_column(Integer, default=0, server_default='0')
+    units_delivered: Mapped[int] = mapped_column(Integer, default=0, server_default='0')
+    revenue_delivered: Mapped[Decimal] = mapped_column(DECIMAL(14, 2), default=0, server_default='0')
+
+    orders_cancelled: Mapped[int] = mapped_column(Integer, default=0, server_default='0')
+    units_cancelled: Mapped[int] = mapped_column(Integer, default=0, server_default='0')
+    revenue_cancelled: Mapped[Decimal] = mapped_column(DECIMAL(14, 2), default=0, server_default='0')
+
+    def __str__(self):
+        return (f"{self.__class__.__name__}(granularity={self.granularity!r}, period_start={self.period_start}, "
+                f"dimension={self.dimension!r}, dimension_id={self.dimension_id})")
+
+    def __repr__(self):
+        return str(self)
@@ -57,6 +57,7 @@ class CartItem(IDIntPkMixin, Base):
     cart_id: Mapped[int] = mapped_column(
         ForeignKey(f"{DBConfigurer.utils.camel2snake('Cart')}.user_id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
 
     cart: Mapped['Cart'] = relationship(
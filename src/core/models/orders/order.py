@@ -2,7 +2,9 @@ from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, String, DECIMAL, JSON, DateTime, func, Integer
+from sqlalchemy import (
+    ForeignKey, String, DECIMAL, JSON, DateTime, func, Integer, CheckConstraint, Index, ForeignKeyConstraint,
+)
 from sqlalchemy.ext.mutable import MutableDict, MutableList
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -15,10 +17,20 @@ from src.tools.status_choices import StatusChoices
 
 
 if TYPE_CHECKING:
-    from src.core.models import User
+    from src.core.models import User, Product
 
 
 class Order(IDIntPkMixin, Base):
+    __table_args__ = (
+        Index(f"ix_{DBConfigurer.utils.camel2snake('Order')}_user_id_time_placed", "user_id", "time_placed"),
+        Index(f"ix_{DBConfigurer.utils.camel2snake('Order')}_status_time_placed", "status", "time_placed"),
+        # monthly partitions are created and archived by `partitions.maintain_order_partitions`
+        {"postgresql_partition_by": "RANGE (time_placed)"},
+    )
+    # the partition key has to be a part of the table primary key, ids are still unique by sequence
+    __mapper_args__ = {"primary_key": ["id"]}
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
 
     user_id: Mapped[int] = mapped_column(
         ForeignKey(f"{DBConfigurer.utils.camel2snake('User')}.id", ondelete="SET NULL"),
@@ -38,11 +50,21 @@ class Order(IDIntPkMixin, Base):
         DECIMAL(8, 2)
     )
 
+    # product snapshots, kept for compatibility; order_items are the source for queries
     order_content: Mapped[list] = mapped_column(
         MutableList.as_mutable(JSON),
         nullable=False,
     )
 
+    order_items: Mapped[list['OrderItem']] = relationship(
+        'OrderItem',
+        back_populates='order',
+        cascade="all, delete",
+        # needed by every order schema, one extra SELECT ... IN per loaded batch
+        lazy="selectin",
+        order_by="OrderItem.id",
+    )
+
     person_content: Mapped[dict] = mapped_column(
         MutableDict.as_mutable(JSON),
         nullable=False,
@@ -55,6 +77,8 @@ class Order(IDIntPkMixin, Base):
 
     time_placed: Mapped[datetime] = mapped_column(
         DateTime,
+        primary_key=True,
+        index=True,
         default=func.now(),
         server_default=func.now(),
         nullable=False
@@ -87,3 +111,64 @@ class Order(IDIntPkMixin, Base):
 
     def __repr__(self):
         return str(self)
+
+
+class OrderItem(IDIntPkMixin, Base):
+    __table_args__ = (
+        CheckConstraint("quantity > 0", name="check_quantity_min_value"),
+        # foreign keys to a partitioned table reference its whole primary key
+        ForeignKeyConstraint(
+            ["order_id", "order_time_placed"],
+            [
+                f"{DBConfigurer.utils.camel2snake('Order')}.id",
+                f"{DBConfigurer.utils.camel2snake('Order')}.time_placed",
+            ],
+            ondelete="CASCADE",
+        ),
+    )
+
+    order_id: Mapped[int] = mapped_column(
+        nullable=False,
+        index=True,
+    )
+
+    order_time_placed: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+    )
+
+    order: Mapped['Order'] = relationship(
+        'Order',
+        back_populates='order_items',
+    )
+
+    # product may be deleted later, the snapshot stays
+    product_id: Mapped[int | None] = mapped_column(
+        ForeignKey(f"{DBConfigurer.utils.camel2snake('Product')}.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+
+    product: Mapped['Product'] = relationship(
+        'Product',
+    )
+
+    quantity: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
+
+    price: Mapped[Decimal] = mapped_column(
+        DECIMAL(8, 2)
+    )
+
+    snapshot: Mapped[dict] = mapped_column(
+        JSON,
+        nullable=False,
+    )
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(order_id={self.order_id}, product_id={self.product_id})"
+
+    def __repr__(self):
+        return str(self)
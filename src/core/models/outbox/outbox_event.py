@@ -0,0 +1,68 @@
+from datetime import datetime
+
+from sqlalchemy import String, JSON, DateTime, Integer, Index, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.config import DBConfigurer
+from src.core.models import Base
+from src.core.models.mixins import IDIntPkMixin
+
+
+class OutboxEvent(IDIntPkMixin, Base):
+    __table_args__ = (
+        # dispatcher reads only not published events in id order
+        Index(
+            f"ix_{DBConfigurer.utils.camel2snake('OutboxEvent')}_not_published",
+            "id",
+            postgresql_where=text("published IS NULL"),
+        ),
+    )
+
+    event_type: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+    )
+
+    task_name: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+    )
+
+    payload: Mapped[dict] = mapped_column(
+        JSON,
+        nullable=False,
+    )
+
+    created: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=func.now(),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    published: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=None,
+        server_default=None,
+        nullable=True
+    )
+
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default='0',
+    )
+
+    last_error: Mapped[str] = mapped_column(
+        String(500),
+        nullable=True,
+        default=None,
+        server_default=None,
+    )
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(id={self.id}, event_type={self.event_type!r})"
+
+    def __repr__(self):
+        return str(self)
@@ -26,6 +26,7 @@ class Post(IDIntPkMixin, Base):
     product_id: Mapped[int] = mapped_column(
         ForeignKey(f"{DBConfigurer.utils.camel2snake('Product')}.id", ondelete="SET NULL"),
         nullable=True,
+        index=True,
     )
 
     product: Mapped['Product'] = relationship(
@@ -36,6 +37,7 @@ class Post(IDIntPkMixin, Base):
     user_id: Mapped[int] = mapped_column(
         ForeignKey(f"{DBConfigurer.utils.camel2snake('User')}.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
 
     user: Mapped['User'] = relationship(
@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Mapped
+from sqlalchemy import JSON
+from sqlalchemy.orm import Mapped, mapped_column
 
 from src.core.models import Base
 from src.core.models.mixins import IDIntPkMixin
@@ -8,3 +9,13 @@ class ImageBase(IDIntPkMixin, Base):
     __abstract__ = True
 
     file: Mapped[str]
+
+    # variant name ("thumb", "thumb_webp", ...) -> file, NULL until generated by celery
+    variants: Mapped[dict | None] = mapped_column(
+        JSON,
+        nullable=True,
+        default=None,
+    )
+
+    def get_variant_file(self, name: str, fallback: bool = True) -> str:
+        return (self.variants or {}).get(name) or (self.file if fallback else '')
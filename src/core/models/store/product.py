@@ -2,7 +2,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import List, TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, DECIMAL, Boolean, Integer, DateTime, func, CheckConstraint
+from sqlalchemy import ForeignKey, DECIMAL, Boolean, Integer, DateTime, func, CheckConstraint, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.config.database_config import DBConfigurerInitializer
@@ -31,9 +31,16 @@ class Product(IDIntPkMixin, Title3FieldMixin, DescriptionMixin, Base):
     __table_args__ = Title3FieldMixin.__table_args__ + (
         CheckConstraint("start_price > 0", name="check_start_price_min_value"),
         CheckConstraint("quantity >= 0", name="check_quantity_min_value"),
+        # storefront price filters look at available products only
+        Index(
+            f"ix_{DBConfigurer.utils.camel2snake('Product')}_available_price",
+            "price",
+            postgresql_where=text("available"),
+        ),
     )
 
-    slug: Mapped[str]
+    # upsert key of bulk import
+    slug: Mapped[str] = mapped_column(unique=True)
 
     start_price: Mapped[Decimal] = mapped_column(
         DECIMAL(8, 2)
@@ -77,6 +84,7 @@ class Product(IDIntPkMixin, Title3FieldMixin, DescriptionMixin, Base):
         ForeignKey(f"{DBConfigurer.utils.camel2snake('Brand')}.id", ondelete="CASCADE"),
         nullable=False,
         unique=False,
+        index=True,
     )
 
     brand: Mapped['Brand'] = relationship(
@@ -125,6 +133,7 @@ class ProductImage(ImageBase):
         ForeignKey(Product.id, ondelete="CASCADE"),
         nullable=False,
         unique=False,
+        index=True,
     )
 
     product: Mapped[Product] = relationship(
@@ -15,4 +15,5 @@ class RubricProductAssociation(IDIntPkMixin, Base):
     )
 
     rubric_id: Mapped[int] = mapped_column(ForeignKey(Rubric.id, ondelete="cascade"))
-    product_id: Mapped[int] = mapped_column(ForeignKey(Product.id, ondelete="cascade"))
+    # the rubric side is served by the unique constraint
+    product_id: Mapped[int] = mapped_column(ForeignKey(Product.id, ondelete="cascade"), index=True)
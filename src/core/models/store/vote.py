@@ -34,6 +34,7 @@ class Vote(IDIntPkMixin, Base):
         ForeignKey(f"{DBConfigurer.utils.camel2snake('User')}.id", ondelete="SET NULL"),
         nullable=True,
         unique=False,
+        index=True,
     )
 
     name: Mapped[str] = mapped_column(String(50), unique=False)
@@ -11,6 +11,7 @@ from fastapi_sessions.backends.session_backend import (
 from fastapi_sessions.frontends.session_frontend import ID
 
 from src.core.settings import settings
+from src.tools.metrics import SESSION_SIZE
 from src.scripts.conver_dates_back import convert_dates
 
 
@@ -41,9 +42,11 @@ class InRedisBackend(Generic[ID, SessionModel], SessionBackend[ID, SessionModel]
             if redis_data:
                 raise BackendError()
 
+            payload = json.dumps(data.model_dump(), default=jsonable_encoder)
+            SESSION_SIZE.observe(len(payload))
             await client.set(
                 redis_key,
-                json.dumps(data.model_dump(), default=jsonable_encoder),
+                payload,
                 ex=self.expired
             )
 
@@ -70,9 +73,11 @@ class InRedisBackend(Generic[ID, SessionModel], SessionBackend[ID, SessionModel]
             redis_data_decoded: dict = json.loads(redis_data)
             redis_data_decoded.update(data)
 
+            payload = json.dumps(redis_data_decoded, default=jsonable_encoder)
+            SESSION_SIZE.observe(len(payload))
             await client.set(
                 redis_key,
-                json.dumps(redis_data_decoded, default=jsonable_encoder),
+                payload,
                 ex=self.expired
             )
 
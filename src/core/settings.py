@@ -59,6 +59,24 @@ class Auth(CustomSettings):
     AUTH_VERIFICATION_TOKEN_LIFETIME_SECONDS: int
     AUTH_RESET_PASSWORD_TOKEN_LIFETIME_SECONDS: int
 
+    # verified tokens -> user id, per process; 0 disables
+    AUTH_CLAIMS_CACHE_SIZE: int = 10000
+    AUTH_CLAIMS_CACHE_TTL_SECONDS: int = 300
+    # authenticated users: in Redis and shortly per process; 0 disables
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60
+    AUTH_USER_CACHE_LOCAL_TTL_SECONDS: float = 5.0
+    AUTH_USER_CACHE_LOCAL_SIZE: int = 10000
+
+    # password hashing processes, 0 hashes in the event loop
+    AUTH_PASSWORD_WORKERS: int = 2
+    AUTH_PASSWORD_MAX_PENDING: int = 8
+    AUTH_PASSWORD_WAIT_TIMEOUT_SECONDS: float = 5.0
+    # changed parameters are applied to stored hashes on the next login
+    AUTH_PASSWORD_ARGON2_TIME_COST: int = 3
+    AUTH_PASSWORD_ARGON2_MEMORY_COST: int = 65536
+    AUTH_PASSWORD_ARGON2_PARALLELISM: int = 4
+    AUTH_PASSWORD_BCRYPT_ROUNDS: int = 12
+
     def get_url(self, purpose: str, version: str = "v1"):
         PURPOSE = ''
         SECOND_PARAM = "unversioned"
@@ -87,6 +105,18 @@ class Carts(CustomSettings):
     SUMMARY_POLICY_AFTER_LOGIN: bool = False
 
 
+class Compression(CustomSettings):
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE_BYTES: int = 1024
+    COMPRESSION_CONTENT_TYPES: list[str] = [
+        "application/json", "application/x-ndjson", "application/javascript", "image/svg+xml", "text/",
+    ]
+    # lower levels keep CPU use per response small, most of the ratio is reached early for JSON
+    COMPRESSION_GZIP_LEVEL: int = 5
+    COMPRESSION_BROTLI_ENABLED: bool = True
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+
 class DB(CustomSettings):
 
     # DB_NAME: str = os.getenv('DB_NAME_TEST') if 'pytest' in sys.modules else os.getenv('DB_NAME')
@@ -121,6 +151,22 @@ class Email(CustomSettings):
     MAIL_PASSWORD: str
     MAIL_PORT: int
     MAIL_FROM: str
+    MAIL_STARTTLS: bool = True
+    MAIL_TIMEOUT: int = 30
+    MAIL_POOL_SIZE: int = 2
+
+
+class Exports(CustomSettings):
+    # rows fetched from the server-side cursor and encoded per response chunk
+    EXPORTS_YIELD_PER: int = 1000
+
+
+class Instrumentation(CustomSettings):
+    INSTRUMENTATION_ENABLED: bool = True
+    INSTRUMENTATION_SERVER_TIMING: bool = True
+    # the same statement shape repeated that many times in one request is reported as N+1
+    INSTRUMENTATION_N_PLUS_ONE_THRESHOLD: int = 10
+    INSTRUMENTATION_MAX_QUERIES_PER_REQUEST: int = 30
 
 
 class LoggingConfig(CustomSettings):
@@ -133,6 +179,65 @@ class LoggingConfig(CustomSettings):
         return logging.getLevelNamesMapping()[self.LOGGING_LEVEL]
 
 
+class Media(CustomSettings):
+    MEDIA_ROOT: str = "media"
+    MEDIA_URL: str = "/media"
+    MEDIA_CHUNK_SIZE_BYTES: int = 1024 * 1024
+    MEDIA_MAX_IMAGE_SIZE_BYTES: int = 10 * 1024 * 1024
+    MEDIA_ALLOWED_IMAGE_TYPES: list[str] = ["image/jpeg", "image/png", "image/webp", "image/gif"]
+    # variant name -> max side in pixels, every size is also saved as webp
+    MEDIA_IMAGE_VARIANT_SIZES: dict[str, int] = {"thumb": 320, "medium": 800}
+    MEDIA_JPEG_QUALITY: int = 85
+    MEDIA_WEBP_QUALITY: int = 80
+    MEDIA_VARIANTS_BATCH_SIZE: int = 50
+
+
+class Metrics(CustomSettings):
+    METRICS_ENABLED: bool = True
+    METRICS_PATH: str = "/metrics"
+    # broker lists whose length is exported as celery_queue_length
+    METRICS_CELERY_QUEUES: list[str] = ["celery"]
+
+
+class OpenApi(CustomSettings):
+    # the schema is kept in a file keyed by the code hash, see src.scripts.build_openapi
+    OPENAPI_CACHE_ENABLED: bool = True
+    OPENAPI_CACHE_DIR: str = "openapi_cache"
+    OPENAPI_BUILD_ON_STARTUP: bool = True
+
+
+class Orders(CustomSettings):
+    # monthly partitions of the order table created in advance
+    ORDERS_PARTITIONS_MONTHS_AHEAD: int = 3
+    # closed partitions older than that are detached into the archive schema
+    ORDERS_ARCHIVE_AFTER_MONTHS: int = 24
+    ORDERS_ARCHIVE_SCHEMA: str = "archive"
+
+
+class Outbox(CustomSettings):
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_MAX_ATTEMPTS: int = 5
+
+
+class ProductsImport(CustomSettings):
+    PRODUCTS_IMPORT_BATCH_SIZE: int = 1000
+    PRODUCTS_IMPORT_MAX_REPORTED_ERRORS: int = 1000
+
+
+class Profiling(CustomSettings):
+    PROFILING_ENABLED: bool = True
+    PROFILING_PREFIX: str = "/profiles"
+    # superusers ask for a profile with the header or the query parameter: sample (or 1) / trace
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_QUERY_PARAM: str = "profile"
+    PROFILING_SAMPLE_INTERVAL_SECONDS: float = 0.001
+    # every n-th request of each route is profiled by sampling, 0 disables
+    PROFILING_EVERY_N_REQUESTS: int = 0
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_FILES: int = 200
+    PROFILING_TOP_N: int = 30
+
+
 class RateLimiter(CustomSettings):
     RATE_LIMITER_CALLS: int
     RATE_LIMITER_PERIOD: int
@@ -160,6 +265,25 @@ class Sessions(CustomSettings):
     SESSION_ADDRESS: str
 
 
+class SlowQueries(CustomSettings):
+    SLOW_QUERIES_ENABLED: bool = True
+    SLOW_QUERIES_PATH: str = "/slow-queries"
+    SLOW_QUERIES_THRESHOLD_MS: float = 200
+    # share of slow statements explained: read only ones under EXPLAIN (ANALYZE, BUFFERS) in a rolled back
+    # transaction, writes and row locking SELECTs with a plain EXPLAIN
+    SLOW_QUERIES_EXPLAIN_RATIO: float = 0.05
+    SLOW_QUERIES_EXPLAIN_TIMEOUT_MS: int = 5000
+    # entries kept in the redis list, the oldest are dropped
+    SLOW_QUERIES_LOG_SIZE: int = 5000
+
+
+class StaticConf(CustomSettings):
+    STATIC_ROOT: str = "static"
+    STATIC_URL: str = "/static"
+    STATIC_HASHED_URLS: bool = True
+    STATIC_PRECOMPRESS_ON_STARTUP: bool = True
+
+
 class Tags(CustomSettings):
     TECH_TAG: str
     ROOT_TAG: str
@@ -210,10 +334,36 @@ class Tags(CustomSettings):
     ADDRESSES_PREFIX: str
     ADDRESSES_TAG: str
 
+    ANALYTICS_PREFIX: str = "/analytics"
+    ANALYTICS_TAG: str = "Analytics"
+
 
 class Telegram(CustomSettings):
     TELEGRAM_TOKEN: str
     TELEGRAM_CHAT_ID: str
+    TELEGRAM_BASE_URL: str = "https://api.telegram.org/bot"
+    TELEGRAM_POOL_SIZE: int = 8
+
+
+class Tracing(CustomSettings):
+    TRACING_ENABLED: bool = False
+    TRACING_SERVICE_NAME: str = "4_el"
+    # share of new traces recorded, continued traces follow the caller's decision
+    TRACING_SAMPLE_RATIO: float = 0.1
+    TRACING_EXPORTER: Literal["file", "otlp"] = "file"
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_EXPORT_BATCH_SIZE: int = 512
+    TRACING_EXPORT_INTERVAL_SECONDS: float = 5.0
+
+
+class UserToolsConf(CustomSettings):
+    # lists kept in redis sorted sets: 'rv' - recently viewed, 'w' - wishlist, 'c' - comparison
+    USERTOOLS_REDIS_LISTS: list[str] = ['rv']
+    USERTOOLS_REDIS_LIFETIME_SECONDS: int = 3600 * 24 * 7
+    USERTOOLS_PERSIST_BATCH_SIZE: int = 100
+    # ids taken by a persisting run longer ago are considered abandoned and persisted again
+    USERTOOLS_PERSIST_LEASE_SECONDS: int = 600
 
 
 class Users(CustomSettings):
@@ -225,17 +375,31 @@ class Users(CustomSettings):
 class Settings(CustomSettings):
     app: AppSettings = AppSettings()
     carts: Carts = Carts()
+    compression: Compression = Compression()
     logging: LoggingConfig = LoggingConfig()
     run: RunConfig = RunConfig()
     tags: Tags = Tags()
     db: DB = DB()
     auth: Auth = Auth()
     users: Users = Users()
+    usertools: UserToolsConf = UserToolsConf()
     email: Email = Email()
+    exports: Exports = Exports()
+    instrumentation: Instrumentation = Instrumentation()
+    media: Media = Media()
+    metrics: Metrics = Metrics()
+    openapi: OpenApi = OpenApi()
+    orders: Orders = Orders()
+    outbox: Outbox = Outbox()
+    products_import: ProductsImport = ProductsImport()
+    profiling: Profiling = Profiling()
     rate_limiter: RateLimiter = RateLimiter()
     redis: RedisConf = RedisConf()
     sessions: Sessions = Sessions()
+    slow_queries: SlowQueries = SlowQueries()
+    static: StaticConf = StaticConf()
     telegram: Telegram = Telegram()
+    tracing: Tracing = Tracing()
 
 
 settings = Settings()
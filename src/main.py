@@ -1,10 +1,7 @@
 from contextlib import asynccontextmanager
-from typing import Dict, Any
+from typing import Dict, Any, TYPE_CHECKING
 
-import uvicorn
-from celery.result import AsyncResult
 from fastapi import FastAPI, Request, Depends, Query
-from starlette.staticfiles import StaticFiles
 
 from src.api.v1.users.user.dependencies import current_superuser
 from src.core.settings import settings
@@ -14,17 +11,32 @@ from src.core.config import (
     DBConfigurer,
     RateLimiter,
     ExceptionHandlerConfigurer,
+    StaticConfigurer,
+    CompressionConfigurer,
+    InstrumentationConfigurer,
+    MetricsConfigurer,
+    TracingConfigurer,
+    ProfilingConfigurer,
+    SlowQueriesConfigurer,
 )
 from src.api import router as router_api
 from src.scripts.pagination import paginate_result
+from src.tools.passwords import password_pool
+
+if TYPE_CHECKING:
+    # celery is imported by the first task sent, not at the app start
+    from celery.result import AsyncResult
 
 
 @asynccontextmanager
 async def lifespan(application: FastAPI):
     # startup
+    AppConfigurer.build_openapi(application)
     yield
     # shutdown
     await DBConfigurer.dispose()
+    password_pool.shutdown()
+    TracingConfigurer.flush()
 
 
 app = AppConfigurer.create_app(
@@ -34,9 +46,16 @@ app = AppConfigurer.create_app(
 )
 app.webhooks = []
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+StaticConfigurer.config_static(app)
+CompressionConfigurer.config_compression(app)
+InstrumentationConfigurer.config_instrumentation(app)
+MetricsConfigurer.config_metrics(app)
+TracingConfigurer.config_tracing(app)
+ProfilingConfigurer.config_profiling(app)
+SlowQueriesConfigurer.config_slow_queries(app)
 
 app.openapi = AppConfigurer.get_custom_openapi(app)
+AppConfigurer.config_openapi(app)
 
 # ROUTERS
 
@@ -90,7 +109,7 @@ async def tg_sender(
         message: str,
 ) -> Any:
     from src.api.v1.celery_tasks.tasks import task_send_tg_message
-    result: AsyncResult = task_send_tg_message.apply_async(args=({'body': message}, ))
+    result: "AsyncResult" = task_send_tg_message.apply_async(args=({'body': message}, ))
     return result.result
 
 
@@ -117,6 +136,8 @@ async def get_routes_endpoint(
 
 
 if __name__ == "__main__":
+    import uvicorn
+
     # gunicorn src.main:app --workers 4 --worker-class uvicorn.workers.UvicornWorker --bind 0.0.0.0:8000
     # uvicorn src.main:app --host 0.0.0.0 --reload
     uvicorn.run(
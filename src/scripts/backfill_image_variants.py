@@ -0,0 +1,15 @@
+import asyncio
+
+from src.core.config import DBConfigurer
+
+
+async def main():
+    # generates missing thumbnails / webp variants of all stored images, safe to interrupt and rerun
+    from src.api.v1.store.utils.image_variants import process_image_variants
+    async with DBConfigurer.Session() as session:
+        print(await process_image_variants(session=session))
+    await DBConfigurer.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
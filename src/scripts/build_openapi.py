@@ -0,0 +1,31 @@
+import argparse
+import time
+
+import orjson
+
+from src.core.config import AppConfigurer
+
+
+def main(output: str | None):
+    # build step: the schema is cached under the code hash, so app startup only reads the file
+    started = time.perf_counter()
+    from src.main import app
+    imported = time.perf_counter()
+    schema = app.openapi()
+    print(f"app imported in {imported - started:.2f}s, schema of {len(schema['paths'])} paths "
+          f"in {time.perf_counter() - imported:.2f}s")
+    cache = AppConfigurer.get_openapi_cache(app)
+    if cache:
+        print(cache.file_path)
+    if output:
+        with open(output, "wb") as file:
+            file.write(orjson.dumps(schema, option=orjson.OPT_INDENT_2))
+        print(output)
+
+
+if __name__ == "__main__":
+    # python -m src.scripts.build_openapi
+    # python -m src.scripts.build_openapi --output openapi.json
+    parser = argparse.ArgumentParser(description="Generates the OpenAPI schema into the cache keyed by the code hash")
+    parser.add_argument("--output", default=None, help="also write the schema to this file")
+    main(parser.parse_args().output)
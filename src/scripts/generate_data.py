@@ -0,0 +1,568 @@
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+import uuid
+from array import array
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Iterable, Iterator
+
+import orjson
+from sqlalchemy import text
+
+from src.core.config import DBConfigurer
+from src.core.models import (
+    AdditionalInformation, Brand, Cart, CartItem, Order, OrderItem, Post, Product, ProductImage, Rubric,
+    RubricProductAssociation, SaleInformation, User, UserTools, Vote,
+)
+from src.core.settings import settings
+from src.tools.discount_choices import DiscountChoices
+from src.tools.passwords import get_password_helper
+from src.tools.moveto_choices import MoveToChoices
+from src.tools.payment_conditions_choices import PaymentChoices
+from src.tools.status_choices import StatusChoices
+
+# Synthetic data marks: slugs and emails start with PREFIX, order phone numbers with PHONE_PREFIX,
+# so generated rows can be told from real ones and removed with --cleanup
+PREFIX = "bench"
+PHONE_PREFIX = "+0bench"
+PASSWORD = "bench-password"
+SESSIONS_SET = f"{settings.app.APP_NAME}_{PREFIX}_sessions"
+
+COPY_BATCH = 50_000
+
+ADJECTIVES = (
+    "Classic", "Compact", "Smart", "Wireless", "Portable", "Premium", "Eco", "Ultra", "Mini", "Pro",
+    "Silent", "Digital", "Vintage", "Modern", "Heavy", "Light", "Rapid", "Solid", "Soft", "Bright",
+)
+NOUNS = (
+    "Kettle", "Lamp", "Speaker", "Chair", "Backpack", "Blender", "Heater", "Router", "Drill", "Mixer",
+    "Camera", "Toaster", "Monitor", "Jacket", "Watch", "Vacuum", "Fan", "Keyboard", "Headphones", "Sofa",
+)
+FIRSTNAMES = ("Ivan", "Anna", "Olga", "Pavel", "Elena", "Dmitry", "Maria", "Sergey", "Irina", "Alexey")
+LASTNAMES = ("Ivanov", "Petrova", "Smirnov", "Kuznetsova", "Popov", "Sokolova", "Lebedev", "Novikova")
+CITIES = ("Moscow", "Minsk", "Tashkent", "Kazan", "Samara", "Gomel", "Samarkand", "Tula")
+WORDS = (
+    "good", "quality", "fast", "delivery", "price", "works", "recommend", "nice", "bad", "broke",
+    "size", "color", "battery", "sound", "box", "again", "gift", "perfect", "cheap", "strong",
+)
+DISCOUNTS = (DiscountChoices.D0, DiscountChoices.D5, DiscountChoices.D10, DiscountChoices.D20, DiscountChoices.D50)
+DISCOUNT_WEIGHTS = (70, 10, 10, 7, 3)
+
+
+@dataclass(frozen=True)
+class Scale:
+    """
+    Volumes of generated data. Relations are generated per product / per user with averages below,
+    the actual counts vary with the random seed but are the same for the same seed.
+    """
+    products: int
+    brands: int
+    rubrics: int
+    users: int
+    orders: int
+    sessions: int
+    # orders are spread over that many months back from today
+    months: int = 24
+    images_per_product: int = 3
+    rubrics_per_product: int = 2
+    votes_per_product: float = 4.0
+    posts_per_product: float = 1.0
+    # shares of users with a cart / usertools and of orders placed by registered users
+    users_with_cart: float = 0.3
+    users_with_usertools: float = 0.5
+    registered_orders: float = 0.7
+    cart_items: int = 3
+    order_items: int = 3
+
+    @classmethod
+    def from_products(cls, products: int, **kwargs) -> "Scale":
+        defaults = {
+            "brands": max(products // 400, 10),
+            "rubrics": max(products // 1000, 10),
+            "users": max(products // 4, 100),
+            "orders": products * 2,
+            "sessions": max(products // 10, 100),
+        }
+        return cls(products=products, **{**defaults, **kwargs})
+
+
+# presets the benchmark suites refer to
+SCALES = {
+    "xs": Scale.from_products(1_000),
+    "s": Scale.from_products(20_000),
+    "m": Scale.from_products(200_000),
+    "l": Scale.from_products(2_000_000, orders=5_000_000, users=500_000, sessions=200_000),
+}
+
+
+def get_rng(seed: int, step: str) -> random.Random:
+    # every step has its own stream: changing one volume keeps the data of the others
+    return random.Random(f"{seed}:{step}")
+
+
+def to_json(value: Any) -> str:
+    # JSON columns are filled by COPY as text
+    return orjson.dumps(value, default=str).decode()
+
+
+def get_title(n: int) -> str:
+    return f"{ADJECTIVES[n % len(ADJECTIVES)]} {NOUNS[n // len(ADJECTIVES) % len(NOUNS)]} {n}"
+
+
+def get_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words)).capitalize()
+
+
+def get_price(value: float) -> Decimal:
+    return Decimal(f"{value:.2f}")
+
+
+def batched(records: Iterable[tuple], size: int = COPY_BATCH) -> Iterator[list[tuple]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class DataGenerator:
+    """
+    Fills the database (COPY through the asyncpg connection) and Redis with synthetic data.
+
+    Ids are assigned here, after the current maximum of every table, so rows of different tables
+    refer to each other without reading them back; sequences are moved past them at the end.
+    """
+
+    def __init__(self, session, scale: Scale, seed: int = 1):
+        self.session = session
+        self.scale = scale
+        self.seed = seed
+        self.now = datetime.now().replace(microsecond=0)
+        self.ids: dict[str, int] = {}
+
+        # product attributes needed later for carts and orders
+        self.prices = array("d")
+        self.start_prices = array("d")
+        self.discounts = array("b")
+        self.brand_ids = array("l")
+
+    async def copy(self, model, columns: tuple[str, ...], records: Iterable[tuple]) -> int:
+        connection = await (await self.session.connection()).get_raw_connection()
+        count = 0
+        for batch in batched(records):
+            await connection.driver_connection.copy_records_to_table(
+                model.__tablename__, records=batch, columns=columns,
+            )
+            count += len(batch)
+        return count
+
+    async def get_start_ids(self) -> None:
+        for model in (User, Brand, Rubric, Product, ProductImage, RubricProductAssociation, Vote, Post, CartItem,
+                      Order, OrderItem):
+            self.ids[model.__tablename__] = await self.session.scalar(
+                text(f"SELECT coalesce(max(id), 0) + 1 FROM {model.__tablename__}")
+            )
+
+    async def reset_sequences(self) -> None:
+        for table in self.ids:
+            await self.session.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+            ))
+
+    def report(self, name: str, count: int, started: float) -> None:
+        print(f"{name:<24}{count:>12} rows  {time.perf_counter() - started:>8.1f}s", flush=True)
+
+    # catalog
+
+    async def generate_catalog(self) -> None:
+        started = time.perf_counter()
+        brand_id, rubric_id = self.ids[Brand.__tablename__], self.ids[Rubric.__tablename__]
+        count = await self.copy(Brand, ("id", "title", "slug", "description"), (
+            (brand_id + n, f"Bench brand {n}", f"{PREFIX}-brand-{n}", f"Brand {n} of synthetic catalog")
+            for n in range(self.scale.brands)
+        ))
+        count += await self.copy(Rubric, ("id", "title", "slug", "description"), (
+            (rubric_id + n, f"Bench rubric {n}", f"{PREFIX}-rubric-{n}", f"Rubric {n} of synthetic catalog")
+            for n in range(self.scale.rubrics)
+        ))
+        self.report("brands, rubrics", count, started)
+
+        started = time.perf_counter()
+        rng = get_rng(self.seed, "products")
+        first_id = self.ids[Product.__tablename__]
+        image_id = self.ids[ProductImage.__tablename__]
+        association_id = self.ids[RubricProductAssociation.__tablename__]
+        vote_id, post_id = self.ids[Vote.__tablename__], self.ids[Post.__tablename__]
+        count = 0
+        for start in range(0, self.scale.products, COPY_BATCH):
+            products, images, associations, add_info, sale_info, votes, posts = [], [], [], [], [], [], []
+            for n in range(start, min(start + COPY_BATCH, self.scale.products)):
+                product_id = first_id + n
+                # a few brands and rubrics hold most of the products
+                brand = self.ids[Brand.__tablename__] + int(self.scale.brands * rng.random() ** 2)
+                # capped so that order totals fit DECIMAL(8, 2)
+                start_price = min(max(rng.lognormvariate(7.5, 1.2), 10.0), 20_000.0)
+                discount = rng.choices(DISCOUNTS, DISCOUNT_WEIGHTS)[0]
+                price = start_price * (100 - discount) / 100
+                published = self.now - timedelta(seconds=rng.randrange(self.scale.months * 30 * 86400))
+                self.prices.append(round(price, 2))
+                self.start_prices.append(round(start_price, 2))
+                self.discounts.append(discount)
+                self.brand_ids.append(brand)
+                products.append((
+                    product_id, get_title(n), f"{PREFIX}-product-{n}", get_text(rng, rng.randint(5, 40)),
+                    get_price(start_price), int(discount), get_price(price),
+                    rng.random() < 0.9, rng.choice((0, rng.randint(1, 200), rng.randint(1, 20))),
+                    published, brand,
+                ))
+                for k in range(rng.randint(1, self.scale.images_per_product)):
+                    digest = hashlib.sha256(f"{PREFIX}-{n}-{k}".encode()).hexdigest()
+                    images.append((image_id, f"{settings.media.MEDIA_ROOT}/images/{digest[:2]}/{digest}.jpg", product_id))
+                    image_id += 1
+                for rubric in {
+                    rubric_id + int(self.scale.rubrics * rng.random() ** 2)
+                    for _ in range(rng.randint(1, self.scale.rubrics_per_product * 2 - 1))
+                }:
+                    associations.append((association_id, rubric, product_id))
+                    association_id += 1
+                add_info.append((
+                    product_id, get_price(rng.uniform(0.1, 30)),
+                    f"{rng.randint(5, 100)}x{rng.randint(5, 100)}x{rng.randint(5, 100)}",
+                    f"{rng.choice((6, 12, 24, 36))} months",
+                ))
+
+                # popular products get more votes and posts
+                voters = rng.sample(range(self.scale.users), min(
+                    int(rng.expovariate(1 / self.scale.votes_per_product)), self.scale.users,
+                ))
+                stars = [rng.choices((1, 2, 3, 4, 5), (5, 5, 10, 30, 50))[0] for _ in voters]
+                for voter, star in zip(voters, stars):
+                    votes.append((
+                        vote_id, product_id, self.ids[User.__tablename__] + voter, rng.choice(FIRSTNAMES),
+                        get_text(rng, rng.randint(3, 30)) if rng.random() < 0.6 else None,
+                        published + timedelta(seconds=rng.randrange(86400 * 30)), star,
+                    ))
+                    vote_id += 1
+                for _ in range(int(rng.expovariate(1 / self.scale.posts_per_product))):
+                    posts.append((
+                        post_id, product_id, self.ids[User.__tablename__] + rng.randrange(self.scale.users),
+                        rng.choice(FIRSTNAMES), get_text(rng, rng.randint(5, 60)),
+                        published + timedelta(seconds=rng.randrange(86400 * 30)),
+                    ))
+                    post_id += 1
+                sold = int(rng.expovariate(1 / 20))
+                sale_info.append((
+                    product_id, sold, len(voters), sold * rng.randint(5, 50) + len(voters), sum(stars),
+                    Decimal(f"{sum(stars) / len(stars):.1f}") if stars else None,
+                ))
+
+            count += await self.copy(Product, (
+                "id", "title", "slug", "description", "start_price", "discount", "price", "available", "quantity",
+                "published", "brand_id",
+            ), products)
+            await self.copy(ProductImage, ("id", "file", "product_id"), images)
+            await self.copy(RubricProductAssociation, ("id", "rubric_id", "product_id"), associations)
+            await self.copy(AdditionalInformation, ("product_id", "weight", "size", "guarantee"), add_info)
+            await self.copy(SaleInformation, (
+                "product_id", "sold_count", "voted_count", "viewed_count", "rating_summary", "rating",
+            ), sale_info)
+            await self.copy(Vote, ("id", "product_id", "user_id", "name", "review", "published", "stars"), votes)
+            await self.copy(Post, ("id", "product_id", "user_id", "name", "review", "published"), posts)
+            print(f"  products {count} / {self.scale.products}", end="\r", flush=True)
+        self.report("products with relations", count, started)
+
+    # users
+
+    async def generate_users(self) -> None:
+        started = time.perf_counter()
+        rng = get_rng(self.seed, "users")
+        first_id = self.ids[User.__tablename__]
+        # one hash for all: logins of benchmarks verify a real hash (of current parameters, no rehash on login),
+        # generation stays fast
+        hashed_password = get_password_helper().hash(PASSWORD)
+
+        def users():
+            for n in range(self.scale.users):
+                joined = self.now - timedelta(seconds=rng.randrange(self.scale.months * 30 * 86400))
+                yield (
+                    first_id + n, f"{PREFIX}-{n}@example.com", hashed_password, True, False, True,
+                    rng.choice(FIRSTNAMES), rng.choice(LASTNAMES), joined,
+                    joined + timedelta(seconds=rng.randrange(86400 * 90)) if rng.random() < 0.8 else None,
+                )
+
+        count = await self.copy(User, (
+            "id", "email", "hashed_password", "is_active", "is_superuser", "is_verified",
+            "firstname", "lastname", "data_joined", "last_login",
+        ), users())
+        self.report("users", count, started)
+
+    def get_tools_content(self, rng: random.Random, length: int) -> str:
+        return to_json({
+            str(self.ids[Product.__tablename__] + self.get_popular_product(rng)):
+                (self.now - timedelta(seconds=rng.randrange(86400 * 30))).isoformat()
+            for _ in range(rng.randint(0, length))
+        })
+
+    def get_popular_product(self, rng: random.Random) -> int:
+        # product offset, the first tenth of the catalog gets about half of the views and sales
+        return int(self.scale.products * rng.random() ** 3)
+
+    async def generate_user_data(self) -> None:
+        started = time.perf_counter()
+        rng = get_rng(self.seed, "usertools")
+        first_user = self.ids[User.__tablename__]
+        count = await self.copy(UserTools, (
+            "user_id", "max_length_rv", "max_length_w", "max_length_c", "recently_viewed", "wishlist", "comparison",
+        ), (
+            (
+                first_user + n, 8, 8, 4,
+                self.get_tools_content(rng, 8), self.get_tools_content(rng, 8), self.get_tools_content(rng, 4),
+            )
+            for n in range(self.scale.users) if rng.random() < self.scale.users_with_usertools
+        ))
+        self.report("usertools", count, started)
+
+        started = time.perf_counter()
+        rng = get_rng(self.seed, "carts")
+        owners = [first_user + n for n in range(self.scale.users) if rng.random() < self.scale.users_with_cart]
+        count = await self.copy(Cart, ("user_id", "created"), (
+            (owner, self.now - timedelta(seconds=rng.randrange(86400 * 60))) for owner in owners
+        ))
+
+        def cart_items():
+            item_id = self.ids[CartItem.__tablename__]
+            for owner in owners:
+                for product in {self.get_popular_product(rng) for _ in range(rng.randint(1, self.scale.cart_items * 2))}:
+                    yield item_id, owner, self.ids[Product.__tablename__] + product, get_price(self.prices[product]), \
+                        rng.choice((1, 1, 1, 2, 3))
+                    item_id += 1
+
+        count += await self.copy(CartItem, ("id", "cart_id", "product_id", "price", "quantity"), cart_items())
+        self.report("carts with items", count, started)
+
+    # orders
+
+    def get_product_snapshot(self, product: int) -> dict[str, Any]:
+        # ProductShort, as order_content is written by the checkout
+        product_id = self.ids[Product.__tablename__] + product
+        digest = hashlib.sha256(f"{PREFIX}-{product}-0".encode()).hexdigest()
+        return {
+            "title": get_title(product),
+            "brand_id": self.brand_ids[product],
+            "start_price": f"{self.start_prices[product]:.2f}",
+            "discount": self.discounts[product],
+            "available": True,
+            "id": product_id,
+            "image_file": f"{settings.media.MEDIA_ROOT}/images/{digest[:2]}/{digest}.jpg",
+            "image_file_webp": "",
+            "slug": f"{PREFIX}-product-{product}",
+            "price": f"{self.prices[product]:.2f}",
+        }
+
+    async def generate_orders(self) -> None:
+        from src.api.v1.orders.order.partitions import add_months, create_partitions
+
+        await create_partitions(
+            session=self.session, since=add_months(date.today().replace(day=1), -self.scale.months),
+        )
+        started = time.perf_counter()
+        rng = get_rng(self.seed, "orders")
+        first_id, item_id = self.ids[Order.__tablename__], self.ids[OrderItem.__tablename__]
+        span = self.scale.months * 30 * 86400
+        count = 0
+        for start in range(0, self.scale.orders, COPY_BATCH):
+            orders, items = [], []
+            for n in range(start, min(start + COPY_BATCH, self.scale.orders)):
+                order_id = first_id + n
+                # more orders in recent months
+                placed = self.now - timedelta(seconds=int(span * rng.random() ** 1.5))
+                user_id = self.ids[User.__tablename__] + rng.randrange(self.scale.users) \
+                    if rng.random() < self.scale.registered_orders else None
+                content, total = [], Decimal(0)
+                for product in {self.get_popular_product(rng) for _ in range(rng.randint(1, self.scale.order_items * 2))}:
+                    quantity, price = rng.choice((1, 1, 1, 2, 3)), get_price(self.prices[product])
+                    snapshot = self.get_product_snapshot(product)
+                    content.append({"quantity": quantity, "product": snapshot, "price": str(price)})
+                    items.append((item_id, order_id, placed, snapshot["id"], quantity, price, to_json(snapshot)))
+                    item_id += 1
+                    total += price * quantity
+                status = rng.choices(
+                    (StatusChoices.S_DELIVERED, StatusChoices.S_ORDERED, StatusChoices.S_CANCELLED), (80, 12, 8),
+                )[0]
+                if placed > self.now - timedelta(days=3) and status == StatusChoices.S_DELIVERED:
+                    status = StatusChoices.S_ORDERED
+                phonenumber = f"{PHONE_PREFIX}{n}"
+                firstname, lastname = rng.choice(FIRSTNAMES), rng.choice(LASTNAMES)
+                orders.append((
+                    order_id, user_id, phonenumber, total, to_json(content),
+                    to_json({"user_id": user_id, "firstname": firstname, "lastname": lastname, "company_name": None}),
+                    to_json({
+                        "user_id": user_id, "address": f"{rng.choice(NOUNS)} street, {rng.randint(1, 200)}",
+                        "city": rng.choice(CITIES), "postcode": f"{rng.randint(100000, 999999)}",
+                        "email": f"{firstname.lower()}.{lastname.lower()}{n}@example.com", "phonenumber": phonenumber,
+                    }),
+                    placed,
+                    placed + timedelta(hours=rng.randint(12, 120)) if status == StatusChoices.S_DELIVERED else None,
+                    int(rng.choice(tuple(MoveToChoices))), int(rng.choice(tuple(PaymentChoices))), int(status),
+                ))
+            count += await self.copy(Order, (
+                "id", "user_id", "phonenumber", "total_cost", "order_content", "person_content", "address_content",
+                "time_placed", "time_delivered", "move_to", "payment_conditions", "status",
+            ), orders)
+            await self.copy(OrderItem, (
+                "id", "order_id", "order_time_placed", "product_id", "quantity", "price", "snapshot",
+            ), items)
+            print(f"  orders {count} / {self.scale.orders}", end="\r", flush=True)
+        self.report("orders with items", count, started)
+
+    # redis
+
+    async def generate_sessions(self) -> None:
+        from redis.asyncio import Redis
+
+        started = time.perf_counter()
+        rng = get_rng(self.seed, "sessions")
+        prefix = f"{settings.app.APP_NAME}_session:"
+        cart_key = settings.sessions.SESSION_CART
+        async with Redis(
+                host=settings.redis.REDIS_HOST,
+                port=settings.redis.REDIS_PORT,
+                db=settings.redis.REDIS_DATABASE,
+        ) as client:
+            for start in range(0, self.scale.sessions, 1000):
+                async with client.pipeline(transaction=False) as pipe:
+                    for _ in range(start, min(start + 1000, self.scale.sessions)):
+                        session_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+                        data = {}
+                        # a part of anonymous visitors has something in the cart
+                        if rng.random() < 0.4:
+                            data[cart_key] = {
+                                "user_id": None,
+                                "user": None,
+                                "created": (self.now - timedelta(seconds=rng.randrange(86400))).isoformat(),
+                                "cart_items": [
+                                    {
+                                        "product_id": self.ids[Product.__tablename__] + product,
+                                        "cart_id": None,
+                                        "price": f"{self.prices[product]:.2f}",
+                                        "product": self.get_product_snapshot(product),
+                                        "quantity": rng.choice((1, 1, 2)),
+                                    }
+                                    for product in {self.get_popular_product(rng) for _ in range(rng.randint(1, 4))}
+                                ],
+                            }
+                        pipe.set(f"{prefix}{session_id}", to_json({
+                            "user_id": None, "user_email": None, "session_id": str(session_id), "data": data,
+                        }), ex=settings.redis.REDIS_CACHE_LIFETIME_SECONDS)
+                        pipe.sadd(SESSIONS_SET, f"{prefix}{session_id}")
+                    await pipe.execute()
+        self.report("redis sessions", self.scale.sessions, started)
+
+    async def run(self) -> None:
+        from src.api.v1.analytics.rollups import rebuild_sales_rollups
+
+        started = time.perf_counter()
+        await self.get_start_ids()
+        await self.generate_users()
+        await self.generate_catalog()
+        await self.generate_user_data()
+        await self.session.commit()
+        if self.scale.orders:
+            await self.generate_orders()
+        await self.reset_sequences()
+        await self.session.commit()
+
+        step = time.perf_counter()
+        print(f"sales rollups: {await rebuild_sales_rollups(session=self.session)}")
+        await self.session.commit()
+        await self.session.execute(text("ANALYZE"))
+        await self.session.commit()
+        self.report("rollups, analyze", 0, step)
+
+        if self.scale.sessions:
+            await self.generate_sessions()
+        print(f"done in {time.perf_counter() - started:.1f}s")
+
+
+async def generate(scale: Scale, seed: int = 1) -> None:
+    async with DBConfigurer.Session() as session:
+        await DataGenerator(session=session, scale=scale, seed=seed).run()
+
+
+async def cleanup() -> None:
+    from redis.asyncio import Redis
+    from src.api.v1.analytics.rollups import rebuild_sales_rollups
+
+    async with DBConfigurer.Session() as session:
+        # order items, products with their relations, carts and usertools go by cascade
+        for sql in (
+            f"DELETE FROM {Order.__tablename__} WHERE phonenumber LIKE '{PHONE_PREFIX}%'",
+            f"DELETE FROM {Post.__tablename__} WHERE user_id IN "
+            f"(SELECT id FROM {User.__tablename__} WHERE email LIKE '{PREFIX}-%')",
+            f"DELETE FROM {User.__tablename__} WHERE email LIKE '{PREFIX}-%'",
+            f"DELETE FROM {Brand.__tablename__} WHERE slug LIKE '{PREFIX}-%'",
+            f"DELETE FROM {Rubric.__tablename__} WHERE slug LIKE '{PREFIX}-%'",
+        ):
+            result = await session.execute(text(sql))
+            print(f"{sql.split(' WHERE')[0]}: {result.rowcount}")
+        await session.commit()
+        print(f"sales rollups: {await rebuild_sales_rollups(session=session)}")
+        await session.commit()
+
+    async with Redis(
+            host=settings.redis.REDIS_HOST,
+            port=settings.redis.REDIS_PORT,
+            db=settings.redis.REDIS_DATABASE,
+    ) as client:
+        keys = await client.smembers(SESSIONS_SET)
+        for start in range(0, len(keys), 1000):
+            await client.delete(*list(keys)[start:start + 1000])
+        await client.delete(SESSIONS_SET)
+        print(f"redis sessions: {len(keys)}")
+
+
+async def main(args):
+    if args.cleanup:
+        await cleanup()
+    else:
+        scale = SCALES[args.scale]
+        overrides = {
+            name: getattr(args, name)
+            for name in ("products", "brands", "rubrics", "users", "orders", "sessions", "months")
+            if getattr(args, name) is not None
+        }
+        if "products" in overrides:
+            scale = Scale.from_products(**overrides)
+        elif overrides:
+            scale = replace(scale, **overrides)
+        print(scale)
+        await generate(scale, seed=args.seed)
+    await DBConfigurer.dispose()
+
+
+if __name__ == "__main__":
+    # python -m src.scripts.generate_data --scale m
+    # python -m src.scripts.generate_data --products 1000000 --orders 3000000 --seed 7
+    # python -m src.scripts.generate_data --cleanup
+    parser = argparse.ArgumentParser(
+        description="Synthetic catalog, users, orders and anonymous sessions for performance work, "
+                    "loaded with COPY; the same --seed and volumes give the same data on an empty database",
+    )
+    parser.add_argument("--scale", choices=SCALES, default="s", help="preset volumes")
+    parser.add_argument("--products", type=int, help="other volumes follow it unless given explicitly")
+    parser.add_argument("--brands", type=int)
+    parser.add_argument("--rubrics", type=int)
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--orders", type=int)
+    parser.add_argument("--sessions", type=int, help="anonymous sessions in redis")
+    parser.add_argument("--months", type=int, help="orders are spread over that many months back")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cleanup", action="store_true", help="remove generated data and exit")
+    asyncio.run(main(parser.parse_args()))
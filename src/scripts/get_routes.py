@@ -1,7 +1,13 @@
 from fastapi import FastAPI, APIRouter
 
+# (application id, number of routes, flags) -> routes info; routes are not changed after startup
+_cache: dict[tuple, list[dict]] = {}
+
 
 async def get_routes(application: FastAPI | APIRouter, path=True, tags=True, methods=True, deps=False, desc=False):
+    key = (id(application), len(application.routes), path, tags, methods, deps, desc)
+    if key in _cache:
+        return _cache[key]
     routes_info = []
     for route in application.routes:
         route_dict = {}
@@ -17,4 +23,5 @@ async def get_routes(application: FastAPI | APIRouter, path=True, tags=True, met
         if desc:
             route_dict['description'] = route.description if hasattr(route, 'description') else None
         routes_info.append(route_dict)
+    _cache[key] = routes_info
     return routes_info
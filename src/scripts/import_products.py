@@ -0,0 +1,39 @@
+import argparse
+import asyncio
+import os
+
+from src.core.config import DBConfigurer
+from src.core.settings import settings
+
+
+async def main(args):
+    from src.api.v1.store.products.importer import ProductsImporter, iter_file_chunks, iter_records
+
+    file_format = args.format or ("jsonl" if os.path.splitext(args.path)[1].lower() in (".jsonl", ".ndjson") else "csv")
+    async with DBConfigurer.Session() as session:
+        importer = ProductsImporter(
+            session=session,
+            update_existing=not args.no_update,
+            batch_size=args.batch_size,
+            progress=lambda event: print(
+                "processed: {processed}, inserted: {inserted}, updated: {updated}, "
+                "skipped: {skipped}, failed: {failed}".format(**event),
+                flush=True,
+            ),
+        )
+        async for event in importer.run(iter_records(iter_file_chunks(args.path), file_format=file_format)):
+            if event["event"] == "error":
+                print(f"line {event['line']}: {event['detail']}", flush=True)
+            else:
+                print("done:", {key: val for key, val in event.items() if key != "event"})
+    await DBConfigurer.dispose()
+
+
+if __name__ == "__main__":
+    # python -m src.scripts.import_products products.csv --batch-size 2000
+    parser = argparse.ArgumentParser(description="Bulk import (upsert by slug) of products from CSV / JSONL file")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="by file extension if omitted")
+    parser.add_argument("--no-update", action="store_true", help="skip products with existing slug")
+    parser.add_argument("--batch-size", type=int, default=settings.products_import.PRODUCTS_IMPORT_BATCH_SIZE)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,104 @@
+import asyncio
+from email.message import EmailMessage
+from logging import getLogger
+
+import aiosmtplib
+
+from src.api.v1.message_senders import CustomMessageSchema
+from src.core.settings import settings
+
+
+logger = getLogger(__name__)
+
+
+def compose_email_message(
+        schema: CustomMessageSchema,
+        sender: str = settings.email.MAIL_FROM,
+) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = ", ".join(schema.recipients)
+    message["Subject"] = schema.subject
+    message.set_content(schema.body, subtype="html")
+    return message
+
+
+class SmtpConnectionPool:
+    """
+    Keeps up to `size` logged in SMTP connections and reuses them between messages,
+    so the TCP connect, STARTTLS handshake and AUTH happen once per connection.
+    Must be used from a single event loop.
+    """
+
+    def __init__(
+            self,
+            size: int = settings.email.MAIL_POOL_SIZE,
+            hostname: str = settings.email.MAIL_HOST,
+            port: int = settings.email.MAIL_PORT,
+            username: str | None = settings.email.MAIL_USERNAME,
+            password: str | None = settings.email.MAIL_PASSWORD,
+            start_tls: bool = settings.email.MAIL_STARTTLS,
+            timeout: int = settings.email.MAIL_TIMEOUT,
+    ):
+        self.size = size
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.timeout = timeout
+
+        self.semaphore = asyncio.Semaphore(size)
+        self.idle: list[aiosmtplib.SMTP] = []
+        self.connects_count: int = 0
+        self.sent_count: int = 0
+
+    async def connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await client.connect()
+        if self.username and self.password:
+            await client.login(self.username, self.password)
+        self.connects_count += 1
+        return client
+
+    async def acquire(self) -> aiosmtplib.SMTP:
+        while self.idle:
+            client = self.idle.pop()
+            if client.is_connected:
+                return client
+        return await self.connect()
+
+    async def send_message(
+            self,
+            message: EmailMessage,
+    ) -> None:
+        async with self.semaphore:
+            client = await self.acquire()
+            try:
+                try:
+                    await client.send_message(message)
+                except aiosmtplib.SMTPServerDisconnected:
+                    # idle connection was dropped by server, retrying once on a fresh one
+                    client = await self.connect()
+                    await client.send_message(message)
+            except Exception:
+                client.close()
+                raise
+            self.sent_count += 1
+            self.idle.append(client)
+
+    async def close(self) -> None:
+        idle, self.idle = self.idle, []
+        for client in idle:
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
+        logger.info(
+            "SMTP pool closed: %s message(s) sent over %s connection(s)" % (self.sent_count, self.connects_count)
+        )
@@ -1,9 +1,14 @@
 from logging import Logger, getLogger
+from typing import TYPE_CHECKING
+
 from fastapi import BackgroundTasks
 from fastapi_mail import FastMail, MessageSchema
 
 from src.api.v1.message_senders import CustomMessageSchema
 
+if TYPE_CHECKING:
+    from .pool import SmtpConnectionPool
+
 
 logger = getLogger(__name__)
 
@@ -15,9 +20,21 @@ def get_message_params(schema: CustomMessageSchema):
 async def send_mail(
         schema: CustomMessageSchema,
         background_tasks: BackgroundTasks = None,
-        logger: Logger = logger
+        logger: Logger = logger,
+        pool: "SmtpConnectionPool" = None,
 ) -> bool:
 
+    if pool:
+        # celery worker runtime: connections are reused between messages
+        from .pool import compose_email_message
+        try:
+            await pool.send_message(compose_email_message(schema))
+            logger.info("Starting mailsender as pooled async task")
+            return True
+        except Exception as exc:
+            logger.error(f"Mailsender as pooled async task error: {exc}")
+            return False
+
     from .connection_config import get_smtp_connection_config
 
     message = get_message_params(schema)
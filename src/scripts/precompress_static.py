@@ -0,0 +1,14 @@
+import sys
+
+from src.tools.static_files import precompress_directory
+
+
+def main(directories: list[str]):
+    # build step: writes .gz/.br next to compressible static files, so app startup has nothing to do
+    for directory in directories:
+        for file_path in precompress_directory(directory):
+            print(file_path)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or ["static"])
@@ -0,0 +1,20 @@
+import argparse
+import asyncio
+from datetime import datetime
+
+from src.core.config import DBConfigurer
+
+
+async def main(since: datetime | None):
+    # recomputes sales rollups from orders, e.g. after a deploy that changed rollup logic or a data fix
+    from src.api.v1.analytics.rollups import rebuild_sales_rollups
+    async with DBConfigurer.Session() as session:
+        print(await rebuild_sales_rollups(session=session, since=since))
+    await DBConfigurer.dispose()
+
+
+if __name__ == "__main__":
+    # python -m src.scripts.rebuild_sales_rollups --since 2026-10-01
+    parser = argparse.ArgumentParser(description="Full (or partial, from the day of --since) rebuild of sales rollups")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None)
+    asyncio.run(main(parser.parse_args().since))
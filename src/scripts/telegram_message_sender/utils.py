@@ -3,8 +3,10 @@ from typing import TYPE_CHECKING
 
 import telegram
 from fastapi import BackgroundTasks
+from telegram.request import HTTPXRequest
 
 from src.api.v1.message_senders import CustomTgMessageSchema
+from src.core.settings import settings
 
 if TYPE_CHECKING:
     from src.scripts.telegram_message_sender.connection_config import TgConnectionConfig
@@ -18,15 +20,33 @@ async def compose_message(
     return f"{schema.subject.upper()}: {schema.body}"
 
 
+async def get_shared_bot(
+        token: str = settings.telegram.TELEGRAM_TOKEN,
+        base_url: str = settings.telegram.TELEGRAM_BASE_URL,
+        pool_size: int = settings.telegram.TELEGRAM_POOL_SIZE,
+) -> telegram.Bot:
+    """
+    Бот с общим пулом HTTP-соединений для многократного использования в рамках одного event loop.
+    Закрывается вызовом `bot.shutdown()`.
+    """
+    return telegram.Bot(
+        token=token,
+        base_url=base_url,
+        request=HTTPXRequest(connection_pool_size=pool_size),
+    )
+
+
 async def send_message(
         message: str,
         config: "TgConnectionConfig",
+        bot: telegram.Bot = None,
 ):
     """
     Асинхронная функция для отправки сообщения в ТГ.
+    Если бот не передан, создается новый (новое HTTP-соединение).
     """
     try:
-        bot = telegram.Bot(
+        bot = bot or telegram.Bot(
             token=config.token
         )
         chat_id = config.chat_id
@@ -39,7 +59,8 @@ async def send_message(
 async def send_tg_bot_message(
         schema: CustomTgMessageSchema,
         background_tasks: BackgroundTasks = None,
-        logger: Logger = logger
+        logger: Logger = logger,
+        bot: telegram.Bot = None,
 ) -> bool:
 
     from .connection_config import get_tg_connection_config
@@ -62,6 +83,7 @@ async def send_tg_bot_message(
             await send_message(
                 message=message,
                 config=tg_config,
+                bot=bot,
             )
             logger.info("Starting telegram sender as async task")
             return True
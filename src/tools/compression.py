@@ -0,0 +1,163 @@
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:     # gzip only
+    brotli = None
+
+
+def get_preferred_encoding(headers: Headers, brotli_enabled: bool = True) -> str | None:
+    accepted = {}
+    for item in headers.get("accept-encoding", "").split(","):
+        encoding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[encoding.strip().lower()] = quality
+
+    candidates = ("br", "gzip") if brotli_enabled and brotli is not None else ("gzip", )
+    for encoding in candidates:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        # wbits=31: gzip container
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self.compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int):
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self.compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware сжатия ответов (brotli или gzip по Accept-Encoding).
+
+    - сжимаются только типы из `content_types` (по префиксу) и тела не меньше `minimum_size`;
+      для потоковых ответов до принятия решения буферизуется не больше `minimum_size` байт;
+    - тело сжимается по мере поступления чанков, без повторной буферизации всего ответа;
+    - ответы, уже имеющие Content-Encoding (предсжатая статика), и 206/304 пропускаются;
+    - нагрузка на CPU ограничивается уровнями `gzip_level` / `brotli_quality`.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            minimum_size: int = 1024,
+            content_types: tuple[str, ...] = ("application/json", "text/"),
+            gzip_level: int = 5,
+            brotli_quality: int = 4,
+            brotli_enabled: bool = True,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = tuple(content_types)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.brotli_enabled = brotli_enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = get_preferred_encoding(Headers(scope=scope), brotli_enabled=self.brotli_enabled)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder)
+
+    def get_compressor(self, encoding: str) -> GzipCompressor | BrotliCompressor:
+        if encoding == "br":
+            return BrotliCompressor(quality=self.brotli_quality)
+        return GzipCompressor(level=self.gzip_level)
+
+    def is_compressible(self, headers: Headers, status: int) -> bool:
+        if status in (204, 206, 304) or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        if not content_type.startswith(self.content_types) or content_type.startswith("text/event-stream"):
+            return False
+        content_length = headers.get("content-length")
+        return content_length is None or int(content_length) >= self.minimum_size
+
+
+class CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+
+        self.start_message: Message | None = None
+        self.buffer: list[bytes] = []
+        self.buffered_size: int = 0
+        # None - not decided yet, False - passthrough
+        self.compressor: GzipCompressor | BrotliCompressor | bool | None = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            if not self.middleware.is_compressible(Headers(raw=message["headers"]), message["status"]):
+                self.compressor = False
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.compressor is False:
+            await self.send(message)
+            return
+
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+
+        if self.compressor is None:
+            self.buffer.append(body)
+            self.buffered_size += len(body)
+            if self.buffered_size < self.middleware.minimum_size:
+                if more_body:
+                    return
+                # whole body is small, sending as is
+                self.compressor = False
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": b"".join(self.buffer), "more_body": False})
+                return
+            await self.start_compressing()
+            body, self.buffer = b"".join(self.buffer), []
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.finish()
+        if chunk or not more_body:
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def start_compressing(self) -> None:
+        self.compressor = self.middleware.get_compressor(self.encoding)
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        del headers["content-length"]
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if (etag := headers.get("etag")) and not etag.startswith("W/"):
+            # representation differs from the uncompressed one
+            headers["etag"] = f"W/{etag}"
+        await self.send(self.start_message)
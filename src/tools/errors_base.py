@@ -53,6 +53,14 @@ class ErrorsBase:
     def IMAGE_SAVING_ERROR():
         return "Error occurred while saving image"
 
+    @staticmethod
+    def IMAGE_TYPE_NOT_ALLOWED(allowed: list[str]):
+        return f"Image type is not allowed, expected one of: {', '.join(allowed)}"
+
+    @staticmethod
+    def IMAGE_TOO_LARGE(max_size: int):
+        return f"Image is larger than {max_size} bytes"
+
     @classmethod
     def integrity_error_detailed(cls, exc: Any):
         return f"{cls.DATABASE_ERROR()}: {exc!r}"
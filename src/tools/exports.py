@@ -0,0 +1,93 @@
+import csv
+import io
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator, Literal
+
+import orjson
+from sqlalchemy import Select
+from starlette.responses import StreamingResponse
+
+from src.core.config import DBConfigurer
+from src.core.settings import settings
+
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def default_encoder(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+def to_csv_cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value, default=default_encoder).decode()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def encode_ndjson(rows: list[dict]) -> bytes:
+    return b"".join(
+        orjson.dumps(row, default=default_encoder, option=orjson.OPT_APPEND_NEWLINE) for row in rows
+    )
+
+
+def encode_csv(rows: list[dict], header: list[str] | None = None) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(header)
+    writer.writerows([to_csv_cell(value) for value in row.values()] for row in rows)
+    return buffer.getvalue().encode()
+
+
+async def iter_export(
+        stmt: Select,
+        file_format: ExportFormat,
+        yield_per: int = settings.exports.EXPORTS_YIELD_PER,
+) -> AsyncIterator[bytes]:
+    """
+    Server-side cursor over `stmt`, one encoded chunk per `yield_per` rows.
+
+    Own session: dependency sessions are closed before the response body is sent.
+    Rows are plain mappings of selected columns, so the identity map does not grow
+    and memory does not depend on the result size.
+    """
+    async with DBConfigurer.Session() as session:
+        result = await session.stream(stmt.execution_options(yield_per=yield_per))
+        header = file_format == "csv"
+        async for partition in result.mappings().partitions():
+            if file_format == "csv":
+                yield encode_csv(partition, header=list(partition[0].keys()) if header else None)
+                header = False
+            else:
+                yield encode_ndjson(partition)
+        if header:
+            # empty result: CSV still gets its header
+            yield encode_csv([], header=list(result.keys()))
+
+
+def export_response(
+        stmt: Select,
+        file_format: ExportFormat,
+        filename: str,
+) -> StreamingResponse:
+    extension = "csv" if file_format == "csv" else "ndjson"
+    return StreamingResponse(
+        iter_export(stmt, file_format=file_format),
+        media_type=MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'},
+    )
@@ -1,6 +1,8 @@
 import abc
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.tools.relations_loader import RelationsLoader
+
 
 class ValidRelationsException(Exception):
     """
@@ -24,6 +26,7 @@ class ValidRelationsInspectorBase(abc.ABC):
             **kwargs: Дополнительные аргументы для инициализации.
         """
         self.session: AsyncSession = session
+        self.loader: RelationsLoader = RelationsLoader.from_session(session)
         self.need_inspect: list = []
         self.result: dict = {}
         self.error: Exception | None = None
@@ -0,0 +1,228 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+PARAM_RE = re.compile(r"\$\d+|%\(\w+\)s|%s|\?")
+# IN lists of expanding parameters, asyncpg renders them with casts: ($1::INTEGER, $2::INTEGER)
+PARAMS_LIST_RE = re.compile(r"\?(::\w+)?(?:\s*,\s*\?(::\w+)?)+")
+
+
+def get_statement_shape(statement: str) -> str:
+    """
+    Текст запроса без номеров параметров, списки IN (...) любой длины сведены к одному виду.
+    """
+    return PARAMS_LIST_RE.sub("?, ...", PARAM_RE.sub("?", " ".join(statement.split())))
+
+
+class RequestStats:
+    """
+    Счетчики обращений к БД и Redis в пределах одного запроса (или блока `collect_stats`).
+
+    Хранится в contextvar `current_stats`; sync-эндпоинты в threadpool получают копию контекста,
+    но тот же объект, поэтому их запросы тоже учитываются. Вложенные блоки передают
+    счетчики во внешний (`parent`): бюджет теста видит запросы, посчитанные middleware.
+    """
+
+    def __init__(self, parent: "RequestStats | None" = None):
+        self.parent: RequestStats | None = parent
+        self.started: float = time.perf_counter()
+        self.db_queries: int = 0
+        self.db_time: float = 0.0
+        self.db_rows: int = 0
+        self.redis_commands: int = 0
+        self.redis_time: float = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def add_query(self, statement: str, elapsed: float, rows: int) -> None:
+        self.db_queries += 1
+        self.db_time += elapsed
+        self.db_rows += max(rows, 0)
+        self.shapes[get_statement_shape(statement)] += 1
+        if self.parent is not None:
+            self.parent.add_query(statement=statement, elapsed=elapsed, rows=rows)
+
+    def add_redis(self, commands: int, elapsed: float) -> None:
+        self.redis_commands += commands
+        self.redis_time += elapsed
+        if self.parent is not None:
+            self.parent.add_redis(commands=commands, elapsed=elapsed)
+
+    def get_repeated(self, threshold: int) -> dict[str, int]:
+        """
+        Формы запросов, выполненные не меньше `threshold` раз: признак N+1.
+        """
+        return {shape: count for shape, count in self.shapes.most_common() if count >= threshold}
+
+    def as_dict(self) -> dict[str, int | float]:
+        return {
+            "db_queries": self.db_queries,
+            "db_ms": round(self.db_time * 1000, 2),
+            "db_rows": self.db_rows,
+            "redis_commands": self.redis_commands,
+            "redis_ms": round(self.redis_time * 1000, 2),
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+        }
+
+    def get_server_timing(self) -> str:
+        return ", ".join((
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.db_queries} queries, {self.db_rows} rows"',
+            f'redis;dur={self.redis_time * 1000:.2f};desc="{self.redis_commands} commands"',
+        ))
+
+
+current_stats: ContextVar[RequestStats | None] = ContextVar("current_stats", default=None)
+
+
+# SQLAlchemy
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if current_stats.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = current_stats.get()
+    if stats is None or not conn.info.get("query_started"):
+        return
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats.add_query(statement=statement, elapsed=elapsed, rows=getattr(cursor, "rowcount", -1))
+
+
+def handle_error(exception_context) -> None:
+    # a failed statement has no after_cursor_execute, its start is dropped
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    if event.contains(engine.sync_engine, "after_cursor_execute", after_cursor_execute):
+        return
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
+
+
+# Redis: clients are created per repository, so the client classes are wrapped once
+
+def instrument_redis() -> None:
+    from redis.asyncio.client import Redis, Pipeline
+
+    if getattr(Redis.execute_command, "instrumented", False):
+        return
+
+    def wrap(method, get_commands):
+        async def wrapper(self, *args, **kwargs):
+            stats = current_stats.get()
+            if stats is None:
+                return await method(self, *args, **kwargs)
+            commands = get_commands(self)
+            started = time.perf_counter()
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                stats.add_redis(commands=commands, elapsed=time.perf_counter() - started)
+        wrapper.instrumented = True
+        return wrapper
+
+    Redis.execute_command = wrap(Redis.execute_command, lambda client: 1)
+    # one round trip for all queued commands
+    Pipeline.execute = wrap(Pipeline.execute, lambda pipe: len(pipe.command_stack))
+
+
+@contextmanager
+def collect_stats() -> Iterator[RequestStats]:
+    """
+    Считает запросы внутри блока, в том числе вне HTTP-запроса (скрипты, тесты, задачи).
+    """
+    stats = RequestStats(parent=current_stats.get())
+    token = current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[RequestStats]:
+    """
+    Бюджет запросов для тестов:
+
+        with assert_max_queries(5):
+            await client.get("/api/v1/products/1")
+    """
+    with collect_stats() as stats:
+        yield stats
+    if stats.db_queries > max_queries:
+        shapes = "\n".join(f"{count} x {shape}" for shape, count in stats.shapes.most_common())
+        raise AssertionError(f"{stats.db_queries} queries executed, {max_queries} expected at most:\n{shapes}")
+
+
+class InstrumentationMiddleware:
+    """
+    ASGI middleware: счетчики запросов к БД и Redis на каждый HTTP-запрос.
+
+    - итоги до начала ответа отдаются в заголовке Server-Timing (`server_timing`);
+    - по завершении запроса пишется строка лога с итогами, в `extra` они же словарем;
+    - формы запросов, повторенные не меньше `n_plus_one_threshold` раз, и превышение
+      `max_queries` логируются предупреждением.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            server_timing: bool = True,
+            n_plus_one_threshold: int = 10,
+            max_queries: int = 30,
+    ):
+        self.app = app
+        self.server_timing = server_timing
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.max_queries = max_queries
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.server_timing:
+                MutableHeaders(scope=message).append("Server-Timing", stats.get_server_timing())
+            await send(message)
+
+        with collect_stats() as stats:
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                self.report(scope, stats)
+
+    def report(self, scope: Scope, stats: RequestStats) -> None:
+        route = getattr(scope.get("route"), "path", scope["path"])
+        request = f"{scope['method']} {route}"
+        totals = stats.as_dict()
+        logger.info(
+            "%s: %s" % (request, ", ".join(f"{key}={value}" for key, value in totals.items())),
+            extra={"request": request, "request_stats": totals},
+        )
+        for shape, count in stats.get_repeated(self.n_plus_one_threshold).items():
+            logger.warning(
+                "%s: possible N+1, the same query executed %s times: %s" % (request, count, shape[:300]),
+                extra={"request": request, "query_shape": shape, "query_count": count},
+            )
+        if stats.db_queries > self.max_queries:
+            logger.warning(
+                "%s: %s queries exceed the budget of %s" % (request, stats.db_queries, self.max_queries),
+                extra={"request": request, "request_stats": totals},
+            )
@@ -0,0 +1,152 @@
+import os
+import time
+from typing import Iterable
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+from prometheus_client.metrics_core import Metric
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template, until the last body chunk",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds", "Time to get a connection from the database pool, including new connections",
+    buckets=WAIT_BUCKETS,
+)
+REDIS_CONNECTIONS_IN_USE = Gauge(
+    "redis_connections_in_use", "Redis connections taken from the client pools",
+    multiprocess_mode="livesum",
+)
+RATE_LIMITER_DECISIONS = Counter(
+    "rate_limiter_decisions_total", "Rate limiter decisions", ["decision"],
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by cache and result (hit or miss)", ["cache", "result"],
+)
+SESSION_SIZE = Histogram(
+    "session_size_bytes", "Size of session payloads written to the backend",
+    buckets=(256, 1024, 4096, 16384, 65536, 262144),
+)
+
+
+def record_cache(cache: str, hits: int = 0, misses: int = 0) -> None:
+    if hits:
+        CACHE_REQUESTS.labels(cache=cache, result="hit").inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(cache=cache, result="miss").inc(misses)
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений SQLAlchemy, измеряющий время получения соединения (ожидание свободного или создание нового).
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+
+
+def instrument_redis_pool() -> None:
+    from redis.asyncio.connection import ConnectionPool
+
+    if getattr(ConnectionPool.get_connection, "metered", False):
+        return
+
+    get_connection, release = ConnectionPool.get_connection, ConnectionPool.release
+
+    async def metered_get_connection(self, *args, **kwargs):
+        connection = await get_connection(self, *args, **kwargs)
+        REDIS_CONNECTIONS_IN_USE.inc()
+        return connection
+
+    async def metered_release(self, connection):
+        REDIS_CONNECTIONS_IN_USE.dec()
+        return await release(self, connection)
+
+    metered_get_connection.metered = True
+    ConnectionPool.get_connection = metered_get_connection
+    ConnectionPool.release = metered_release
+
+
+class ScrapeCollector:
+    """
+    Метрики, вычисленные непосредственно перед выдачей (пул БД, очереди Celery и т.п.).
+    """
+
+    def __init__(self, metrics: Iterable[Metric]):
+        self.metrics = list(metrics)
+
+    def collect(self) -> Iterable[Metric]:
+        return self.metrics
+
+
+def get_registry() -> CollectorRegistry:
+    # gunicorn workers write values into PROMETHEUS_MULTIPROC_DIR, the scrape merges them
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics(scrape_metrics: Iterable[Metric] = ()) -> bytes:
+    scrape_registry = CollectorRegistry(auto_describe=False)
+    scrape_registry.register(ScrapeCollector(scrape_metrics))
+    return generate_latest(get_registry()) + generate_latest(scrape_registry)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware: латентность и коды ответов по шаблону маршрута.
+
+    - метка `route` - шаблон пути (`/api/v1/products/{id}`), не сам путь: число рядов ограничено
+      числом маршрутов; запросы, не совпавшие ни с одним маршрутом, идут под `<unmatched>`;
+    - время считается до отправки последнего чанка тела, потоковые ответы учитываются целиком;
+    - пути из `excluded_paths` (сам /metrics) не учитываются.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            excluded_paths: tuple[str, ...] = (),
+    ):
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            HTTP_LATENCY.labels(method=scope["method"], route=route).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method=scope["method"], route=route, status=status_code).inc()
+
@@ -0,0 +1,72 @@
+import hashlib
+import logging
+import os
+from importlib import metadata
+from typing import Any, Iterable, Optional
+
+import orjson
+
+from .static_files import HASH_LENGTH, write_atomically
+
+
+logger = logging.getLogger(__name__)
+
+
+# schema generation depends on them besides the application code
+SCHEMA_PACKAGES = ("fastapi", "pydantic", "fastapi-users")
+
+
+def get_code_hash(directories: Iterable[str], extra: str = "") -> str:
+    """
+    Отпечаток кода, от которого зависит схема OpenAPI: пути и содержимое всех .py файлов `directories`,
+    версии пакетов SCHEMA_PACKAGES и `extra` (заголовки из настроек и таблица маршрутов приложения).
+    """
+    hasher = hashlib.sha256(extra.encode())
+    for package in SCHEMA_PACKAGES:
+        try:
+            hasher.update(f"{package}=={metadata.version(package)}".encode())
+        except metadata.PackageNotFoundError:
+            pass
+    for directory in directories:
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = sorted(name for name in dirs if name != "__pycache__")
+            for name in sorted(files):
+                if name.endswith(".py"):
+                    file_path = os.path.join(root, name)
+                    hasher.update(os.path.relpath(file_path, directory).encode())
+                    with open(file_path, "rb") as file:
+                        hasher.update(file.read())
+    return hasher.hexdigest()[:HASH_LENGTH]
+
+
+class OpenApiCache:
+    """
+    Схема OpenAPI в файле `openapi.{key}.json` каталога `directory`, где key — отпечаток кода:
+    после любого изменения кода файл не находится и схема строится заново.
+    """
+
+    def __init__(self, directory: str, key: str):
+        self.directory = directory
+        self.key = key
+        self.file_path = os.path.join(directory, f"openapi.{key}.json")
+
+    def load(self) -> Optional[dict[str, Any]]:
+        try:
+            with open(self.file_path, "rb") as file:
+                return orjson.loads(file.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, orjson.JSONDecodeError) as exc:
+            logger.warning("Cached OpenAPI schema %r was not loaded: %s" % (self.file_path, exc))
+            return None
+
+    def save(self, schema: dict[str, Any]) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            write_atomically(self.file_path, orjson.dumps(schema))
+            # schemas of previous code versions
+            for name in os.listdir(self.directory):
+                if name.startswith("openapi.") and name.endswith(".json") and name != os.path.basename(self.file_path):
+                    os.remove(os.path.join(self.directory, name))
+        except OSError as exc:
+            logger.warning("OpenAPI schema was not cached to %r: %s" % (self.file_path, exc))
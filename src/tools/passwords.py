@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import cache
+from typing import Any, Callable, Optional
+
+from fastapi_users.password import PasswordHelper
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from pwdlib.hashers.bcrypt import BcryptHasher
+
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordPoolBusy(Exception):
+    pass
+
+
+@cache
+def get_password_helper() -> PasswordHelper:
+    """
+    Хешер паролей приложения с параметрами из настроек. Хеши пишет первый (argon2), bcrypt только проверяет;
+    хеш другого хешера или с другими параметрами заменяется при входе (verify_and_update).
+    """
+    return PasswordHelper(PasswordHash((
+        Argon2Hasher(
+            time_cost=settings.auth.AUTH_PASSWORD_ARGON2_TIME_COST,
+            memory_cost=settings.auth.AUTH_PASSWORD_ARGON2_MEMORY_COST,
+            parallelism=settings.auth.AUTH_PASSWORD_ARGON2_PARALLELISM,
+        ),
+        BcryptHasher(rounds=settings.auth.AUTH_PASSWORD_BCRYPT_ROUNDS),
+    )))
+
+
+# run in the pool processes, module level to be picklable
+
+def hash_password(password: str) -> str:
+    return get_password_helper().hash(password)
+
+
+def verify_and_update_password(password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    return get_password_helper().verify_and_update(password, hashed_password)
+
+
+class PasswordPool:
+    """
+    Хеширование и проверка паролей в пуле процессов, чтобы bcrypt/argon2 не занимали event loop.
+
+    - `workers` процессов (spawn, без копии состояния родителя), 0 — выполнение в самом процессе;
+    - одновременно выполняется и ждет в очереди пула не больше `max_pending` операций, остальные ждут
+      свободного места до `wait_timeout` секунд, затем PasswordPoolBusy (503 для клиента).
+    """
+
+    def __init__(self, workers: int, max_pending: int, wait_timeout: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.wait_timeout = wait_timeout
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self.executor
+
+    async def run(self, func: Callable, *args) -> Any:
+        if not self.workers:
+            return func(*args)
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_pending)
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.wait_timeout)
+        except asyncio.TimeoutError:
+            raise PasswordPoolBusy()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.get_executor(), func, *args)
+        except BrokenProcessPool:
+            # a killed worker breaks the whole pool, the next call starts a new one
+            logger.error("Password pool is broken, restarting")
+            self.executor = None
+            raise
+        finally:
+            self.semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        return await self.run(hash_password, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        return await self.run(verify_and_update_password, password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+password_pool = PasswordPool(
+    workers=settings.auth.AUTH_PASSWORD_WORKERS,
+    max_pending=settings.auth.AUTH_PASSWORD_MAX_PENDING,
+    wait_timeout=settings.auth.AUTH_PASSWORD_WAIT_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,297 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Literal
+from urllib.parse import parse_qs
+
+import orjson
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ProfileMode = Literal["sample", "trace"]
+
+MAX_STACK_DEPTH = 200
+MAX_CACHED_PATHS = 10_000
+
+
+def get_label(code) -> str:
+    return f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Статистический профилировщик: фоновый поток раз в `interval` секунд снимает стек
+    потока, в котором вызван `start` (event loop). Накладные расходы почти не зависят
+    от кода запроса, вес стека - число снимков.
+
+    Стек event loop общий для всех запросов процесса: конкурентные запросы попадают в профиль,
+    ожидание ввода-вывода видно как время в селекторе цикла.
+    """
+    unit = "samples"
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.stopped = threading.Event()
+        self.thread_id: int | None = None
+        self.thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self.thread_id = threading.get_ident()
+        self.thread = threading.Thread(target=self.run, name="sampling-profiler", daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                stack.append(get_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.thread.join()
+
+
+class TracingProfiler:
+    """
+    Детерминированный профилировщик на `sys.setprofile`: каждый вызов и возврат (в том числе
+    C-функций), вес стека - собственное время в микросекундах. Точнее сэмплирующего,
+    но замедляет запрос в разы; одновременно в процессе работает только один.
+
+    Фреймы, начатые до `start`, на стек не попадают: их возвраты пропускаются.
+    """
+    unit = "us"
+    lock = threading.Lock()
+
+    def __init__(self):
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.stack: list[str] = []
+        self.last: int = 0
+
+    def start(self) -> None:
+        if not self.lock.acquire(blocking=False):
+            raise RuntimeError("Another request is being profiled with tracing")
+        self.last = time.perf_counter_ns()
+        sys.setprofile(self.dispatch)
+
+    def dispatch(self, frame, event: str, arg: Any) -> None:
+        now = time.perf_counter_ns()
+        if self.stack:
+            self.stacks[tuple(self.stack)] += now - self.last
+        if event == "call":
+            self.stack.append(get_label(frame.f_code))
+        elif event == "c_call":
+            self.stack.append(f"{getattr(arg, '__qualname__', arg)} (builtin)")
+        elif self.stack:
+            # return, c_return, c_exception
+            self.stack.pop()
+        self.last = time.perf_counter_ns()
+
+    def stop(self) -> None:
+        sys.setprofile(None)
+        self.lock.release()
+        self.stacks = Counter({stack: weight // 1000 for stack, weight in self.stacks.items() if weight >= 1000})
+
+
+def get_collapsed(stacks: Counter[tuple[str, ...]]) -> str:
+    """
+    Стеки в формате collapsed stacks (`frame;frame;frame weight`), который читают
+    flamegraph.pl, speedscope и inferno.
+    """
+    return "\n".join(f"{';'.join(stack)} {weight}" for stack, weight in stacks.items())
+
+
+def parse_collapsed(collapsed: str) -> Counter[tuple[str, ...]]:
+    stacks: Counter[tuple[str, ...]] = Counter()
+    for line in collapsed.splitlines():
+        stack, _, weight = line.rpartition(" ")
+        if stack:
+            stacks[tuple(stack.split(";"))] += int(weight)
+    return stacks
+
+
+def get_top(stacks: Counter[tuple[str, ...]], limit: int = 30) -> list[dict[str, Any]]:
+    """
+    Функции с наибольшим собственным временем (вершина стека) и полным временем
+    (функция где-либо в стеке, рекурсия считается один раз).
+    """
+    self_weight: Counter[str] = Counter()
+    total_weight: Counter[str] = Counter()
+    for stack, weight in stacks.items():
+        self_weight[stack[-1]] += weight
+        for function in set(stack):
+            total_weight[function] += weight
+    overall = sum(stacks.values()) or 1
+    return [
+        {
+            "function": function,
+            "self": weight,
+            "self_percent": round(weight * 100 / overall, 2),
+            "total": total_weight[function],
+            "total_percent": round(total_weight[function] * 100 / overall, 2),
+        }
+        for function, weight in self_weight.most_common(limit)
+    ]
+
+
+class ProfileStore:
+    """
+    Профили на диске, по файлу JSON на запрос; при превышении `max_files` удаляются старейшие.
+    Каталог может быть общим для нескольких процессов.
+    """
+
+    def __init__(self, directory: str, max_files: int = 200):
+        self.directory = Path(directory)
+        self.max_files = max_files
+
+    def get_path(self, profile_id: str) -> Path:
+        if not profile_id.isalnum():
+            raise FileNotFoundError(profile_id)
+        return self.directory / f"{profile_id}.json"
+
+    def save(self, profile: dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.get_path(profile["id"]).write_bytes(orjson.dumps(profile))
+        self.rotate()
+
+    def rotate(self) -> None:
+        files = sorted(self.directory.glob("*.json"), key=lambda path: path.name, reverse=True)
+        for path in files[self.max_files:]:
+            path.unlink(missing_ok=True)
+
+    def get(self, profile_id: str) -> dict[str, Any]:
+        return orjson.loads(self.get_path(profile_id).read_bytes())
+
+    def list(self) -> list[dict[str, Any]]:
+        # newest first, ids start with the creation time
+        result = []
+        for path in sorted(self.directory.glob("*.json"), key=lambda path: path.name, reverse=True):
+            try:
+                profile = orjson.loads(path.read_bytes())
+            except (OSError, orjson.JSONDecodeError):
+                continue
+            profile.pop("collapsed", None)
+            result.append(profile)
+        return result
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware: профиль процессора отдельного запроса.
+
+    - по требованию: заголовок `header` или параметр `query_param` со значением `sample`
+      (или `1`) либо `trace`; профилируется, только если `authorize(scope)` подтвердил права;
+    - выборочно: каждый `every_n`-й запрос каждого маршрута (шаблона пути) - сэмплирующим профилировщиком;
+    - профиль сохраняется в `store`, его id отдается в заголовке `X-Profile-Id`.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            store: ProfileStore,
+            authorize: Callable[[Scope], Awaitable[bool]],
+            header: str = "X-Profile",
+            query_param: str = "profile",
+            sample_interval: float = 0.001,
+            every_n: int = 0,
+            excluded_paths: tuple[str, ...] = (),
+    ):
+        self.app = app
+        self.store = store
+        self.authorize = authorize
+        self.header = header
+        self.query_param = query_param
+        self.sample_interval = sample_interval
+        self.every_n = every_n
+        self.excluded_paths = excluded_paths
+        self.counters: Counter[str] = Counter()
+        self.routes: dict[str, str] = {}
+
+    def get_requested_mode(self, scope: Scope) -> ProfileMode | None:
+        value = Headers(scope=scope).get(self.header)
+        if value is None and self.query_param.encode() in scope["query_string"]:
+            value = parse_qs(scope["query_string"].decode("latin-1")).get(self.query_param, [None])[0]
+        if value in ("1", "sample"):
+            return "sample"
+        if value == "trace":
+            return "trace"
+        return None
+
+    def get_route(self, scope: Scope) -> str:
+        key = f"{scope['method']} {scope['path']}"
+        if key not in self.routes:
+            if len(self.routes) >= MAX_CACHED_PATHS:
+                self.routes.clear()
+            self.routes[key] = next(
+                (route.path for route in scope["app"].router.routes if route.matches(scope)[0] == Match.FULL),
+                "<unmatched>",
+            )
+        return self.routes[key]
+
+    def is_sampled(self, scope: Scope) -> bool:
+        if not self.every_n:
+            return False
+        route = f"{scope['method']} {self.get_route(scope)}"
+        self.counters[route] += 1
+        return self.counters[route] % self.every_n == 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        mode = self.get_requested_mode(scope)
+        if mode is not None and not await self.authorize(scope):
+            mode = None
+        trigger = "request" if mode else "sampling"
+        if mode is None and self.is_sampled(scope):
+            mode = "sample"
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        profiler = SamplingProfiler(self.sample_interval) if mode == "sample" else TracingProfiler()
+        try:
+            profiler.start()
+        except RuntimeError:
+            profiler = SamplingProfiler(self.sample_interval)
+            profiler.start()
+        # time-ordered ids: rotation and listing go by the file name
+        profile_id = f"{time.time_ns():x}{os.urandom(4).hex()}"
+        status_code = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            duration = time.perf_counter() - started
+            profiler.stop()
+            await run_in_threadpool(self.store.save, {
+                "id": profile_id,
+                "created": time.time(),
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(scope.get("route"), "path", None),
+                "status": status_code,
+                "mode": "sample" if isinstance(profiler, SamplingProfiler) else "trace",
+                "trigger": trigger,
+                "unit": profiler.unit,
+                "duration_ms": round(duration * 1000, 2),
+                "collapsed": get_collapsed(profiler.stacks),
+            })
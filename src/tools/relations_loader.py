@@ -0,0 +1,205 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Iterable, Sequence, Type
+
+from sqlalchemy import event, inspect as sa_inspect, select, Result
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.tools.exceptions import CustomException
+from src.tools.metrics import record_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+_MISSING = object()
+
+
+class RelationsLoader:
+    """
+    Пакетный загрузчик ORM-моделей с мемоизацией, привязанный к сессии запроса.
+
+    Все обращения `load` к одной модели, сделанные в пределах одного тика
+    event loop, объединяются в один запрос `WHERE pk IN (...)`. Повторные
+    обращения за тем же ключом (модель, id) возвращаются из кэша.
+    Загрузчик хранится в `session.info`, поэтому живет ровно столько же,
+    сколько сессия, полученная через `DBConfigurer.session_getter`.
+    """
+    SESSION_INFO_KEY = "relations_loader"
+
+    # model -> loader options (joinedload(...), ...), регистрируются доменными модулями
+    options: dict[type, tuple] = {}
+
+    def __init__(self, session: AsyncSession):
+        """
+        Args:
+            session: Асинхронная сессия SQLAlchemy текущего запроса.
+        """
+        self.session: AsyncSession = session
+        self.cache: dict[tuple[type, Any], Any] = {}
+        self.pending: dict[type, dict[Any, asyncio.Future]] = defaultdict(dict)
+        self.dispatch_scheduled: bool = False
+        self.dispatch_task: asyncio.Task | None = None
+
+        self.queries_count: int = 0
+        self.loaded_count: int = 0
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+
+        event.listen(self.session.sync_session, "after_flush", self.on_after_flush)
+
+    @classmethod
+    def from_session(cls, session: AsyncSession) -> "RelationsLoader":
+        """
+        Возвращает загрузчик, привязанный к сессии, создавая его при первом обращении.
+        """
+        loader = session.info.get(cls.SESSION_INFO_KEY)
+        if loader is None:
+            loader = cls(session=session)
+            session.info[cls.SESSION_INFO_KEY] = loader
+        return loader
+
+    @classmethod
+    def register_options(cls, model: type, *options) -> None:
+        """
+        Задает опции загрузки (joinedload и т.п.), применяемые к пакетному запросу модели.
+        """
+        cls.options[model] = options
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "queries": self.queries_count,
+            "loaded": self.loaded_count,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+    async def load(self, model: Type[Any], id: Any) -> Any | None:
+        """
+        Возвращает модель по первичному ключу или None, если запись не найдена.
+        """
+        cached = self.cache.get((model, id))
+        if cached is not None and self.is_alive(cached):
+            self.cache_hits += 1
+            return None if cached is _MISSING else cached
+
+        future = self.pending.get(model, {}).get(id)
+        if future is not None:
+            self.cache_hits += 1
+            return await future
+
+        self.cache_misses += 1
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending[model][id] = future
+        if not self.dispatch_scheduled:
+            self.dispatch_scheduled = True
+            loop.call_soon(self.start_dispatch)
+        return await future
+
+    async def load_many(self, model: Type[Any], ids: Iterable[Any]) -> list[Any | None]:
+        return list(await asyncio.gather(*(self.load(model, id) for id in ids)))
+
+    async def get_one(self, model: Type[Any], id: Any) -> Any:
+        """
+        Как `load`, но при отсутствии записи генерирует CustomException.
+        """
+        orm_model = await self.load(model, id)
+        if orm_model is None:
+            raise CustomException(
+                msg=f"{model.__name__} with id={id} not found"
+            )
+        return orm_model
+
+    async def get_many(self, model: Type[Any], ids: Iterable[Any]) -> list[Any]:
+        ids = list(ids)
+        orm_models = await self.load_many(model, ids)
+        for id, orm_model in zip(ids, orm_models):
+            if orm_model is None:
+                raise CustomException(
+                    msg=f"{model.__name__} with id={id} not found"
+                )
+        return orm_models
+
+    def start_dispatch(self) -> None:
+        self.dispatch_task = asyncio.ensure_future(self.dispatch())
+
+    async def dispatch(self) -> None:
+        # AsyncSession не допускает конкурентных запросов, поэтому все модели,
+        # накопленные за тик (и во время выполнения dispatch), обрабатываются по очереди
+        try:
+            while self.pending:
+                pending, self.pending = self.pending, defaultdict(dict)
+                for model, futures in pending.items():
+                    if not futures:
+                        continue
+                    try:
+                        orm_models = await self.fetch(model, list(futures))
+                    except Exception as exc:
+                        for future in futures.values():
+                            if not future.done():
+                                future.set_exception(exc)
+                        continue
+                    for id, future in futures.items():
+                        orm_model = orm_models.get(id)
+                        self.cache[(model, id)] = orm_model if orm_model is not None else _MISSING
+                        if not future.done():
+                            future.set_result(orm_model)
+        finally:
+            self.dispatch_scheduled = False
+
+    async def fetch(self, model: Type[Any], ids: Sequence[Any]) -> dict[Any, Any]:
+        pk_column = sa_inspect(model).primary_key[0]
+        stmt = select(model).where(pk_column.in_(ids)).options(*self.options.get(model, ()))
+
+        result: Result = await self.session.execute(stmt)
+        orm_models = result.unique().scalars().all()
+
+        self.queries_count += 1
+        self.loaded_count += len(orm_models)
+        logger.debug(
+            "%s: %s %s(s) loaded by 1 query for %s requested id(s)" % (
+                self.__class__.__name__, len(orm_models), model.__name__, len(ids)
+            )
+        )
+        return {getattr(orm_model, pk_column.key): orm_model for orm_model in orm_models}
+
+    def clear(self, model: Type[Any] | None = None, id: Any = None) -> None:
+        if model is None:
+            self.cache.clear()
+        elif id is None:
+            for key in [key for key in self.cache if key[0] is model]:
+                del self.cache[key]
+        else:
+            self.cache.pop((model, id), None)
+
+    def on_after_flush(self, sync_session, flush_context) -> None:
+        # 'new' и 'deleted' здесь еще в состоянии до flush
+        for orm_model in (*sync_session.new, *sync_session.deleted):
+            identity = sa_inspect(orm_model).identity
+            if identity:
+                self.cache.pop((type(orm_model), identity[0]), None)
+        # записи, которых не было до flush, могли появиться
+        for key in [key for key, val in self.cache.items() if val is _MISSING]:
+            del self.cache[key]
+
+    @staticmethod
+    def is_alive(orm_model: Any) -> bool:
+        if orm_model is _MISSING:
+            return True
+        state = sa_inspect(orm_model)
+        return not (state.deleted or state.was_deleted or state.detached)
+
+    @classmethod
+    def log_stats(cls, session: AsyncSession) -> None:
+        loader = session.info.get(cls.SESSION_INFO_KEY)
+        if loader:
+            record_cache("relations_loader", hits=loader.cache_hits, misses=loader.cache_misses)
+        if loader and (loader.queries_count or loader.cache_hits):
+            logger.info(
+                "%s stats: %s query(ies), %s row(s) loaded, %s cache hit(s)" % (
+                    cls.__name__, loader.queries_count, loader.loaded_count, loader.cache_hits
+                )
+            )
@@ -0,0 +1,262 @@
+import asyncio
+import hashlib
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Coroutine
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .instrumentation import get_statement_shape
+from .tracing import current_operation
+
+logger = logging.getLogger(__name__)
+
+
+# read only statements are re-run under EXPLAIN ANALYZE, always inside a rolled back transaction
+ANALYZABLE = ("SELECT", "WITH")
+# the rest are only planned: executed again they would wait for the locks of the original transaction
+EXPLAINABLE = ANALYZABLE + ("INSERT", "UPDATE", "DELETE")
+# data modifying CTE or a row locking SELECT (FOR UPDATE / FOR SHARE)
+WRITES = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|SHARE)\b", re.IGNORECASE)
+# concurrent EXPLAIN ANALYZE runs per process
+MAX_EXPLAINS = 2
+
+current_request: ContextVar[Scope | None] = ContextVar("current_request", default=None)
+
+
+def get_fingerprint(shape: str) -> str:
+    return hashlib.sha1(shape.encode()).hexdigest()[:16]
+
+
+def redact_value(value: Any) -> Any:
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, (list, tuple)):
+        return f"<{type(value).__name__}[{len(value)}]>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """
+    Параметры запроса без значений: только типы (и длины списков), None и bool как есть.
+    """
+    if isinstance(parameters, dict):
+        return {key: redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_value(value) for value in parameters]
+    return redact_value(parameters)
+
+
+def is_analyzable(statement: str) -> bool:
+    return statement.lstrip()[:6].upper().startswith(ANALYZABLE) and not WRITES.search(statement)
+
+
+def get_percentile(values: list[float], percent: float) -> float:
+    # nearest rank, values are sorted
+    return values[min(len(values) - 1, max(0, round(percent / 100 * len(values)) - 1))]
+
+
+class SlowQueryLog:
+    """
+    Журнал медленных запросов движка: запросы дольше `threshold_ms` пишутся в список Redis
+    (общий для всех процессов API и воркеров), не длиннее `log_size` записей.
+
+    - запись: нормализованный текст и его отпечаток, параметры без значений, метод репозитория
+      (`current_operation` из `@traced`), маршрут HTTP-запроса, время и число строк;
+    - доля `explain_ratio` медленных запросов повторяется как `EXPLAIN (ANALYZE, BUFFERS)` на отдельном
+      соединении в транзакции, которая откатывается; для INSERT/UPDATE/DELETE и блокирующих SELECT
+      только `EXPLAIN` без выполнения; план хранится последний на отпечаток;
+    - запись и EXPLAIN выполняются задачами event loop, ответ запроса их не ждет.
+    """
+
+    def __init__(
+            self,
+            threshold_ms: float,
+            key_prefix: str,
+            redis_kwargs: dict[str, Any],
+            explain_ratio: float = 0.05,
+            explain_timeout_ms: int = 5000,
+            log_size: int = 5000,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.entries_key = f"{key_prefix}:entries"
+        self.plans_key = f"{key_prefix}:plans"
+        self.redis_kwargs = redis_kwargs
+        self.explain_ratio = explain_ratio
+        self.explain_timeout_ms = explain_timeout_ms
+        self.log_size = log_size
+
+        self.engine: AsyncEngine | None = None
+        self.tasks: set[asyncio.Task] = set()
+        self.explains: int = 0
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        event.listen(engine.sync_engine, "before_cursor_execute", self.before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", self.after_cursor_execute)
+        event.listen(engine.sync_engine, "handle_error", self.handle_error)
+
+    @staticmethod
+    def is_logged(conn) -> bool:
+        # EXPLAIN runs of the log itself are not logged
+        return conn.get_execution_options().get("slow_query_log", True)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self.is_logged(conn):
+            conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    def handle_error(self, exception_context) -> None:
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("slow_query_started"):
+            connection.info["slow_query_started"].pop()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if not self.is_logged(conn) or not conn.info.get("slow_query_started"):
+            return
+        elapsed = time.perf_counter() - conn.info["slow_query_started"].pop()
+        if elapsed < self.threshold:
+            return
+
+        shape = get_statement_shape(statement)
+        scope = current_request.get()
+        entry = {
+            "fingerprint": get_fingerprint(shape),
+            "statement": shape,
+            "parameters": redact_parameters(parameters),
+            "caller": current_operation.get(),
+            "route": f"{scope['method']} {getattr(scope.get('route'), 'path', scope['path'])}" if scope else None,
+            "duration_ms": round(elapsed * 1000, 2),
+            "rows": getattr(cursor, "rowcount", -1),
+            "executemany": executemany,
+            "time": time.time(),
+        }
+        logger.warning(
+            "Slow query, %s ms in %s: %s" % (entry["duration_ms"], entry["caller"] or entry["route"], shape[:300]),
+            extra={"slow_query": entry},
+        )
+        explain = (
+            not executemany
+            and self.explains < MAX_EXPLAINS
+            and random.random() < self.explain_ratio
+            and statement.lstrip()[:6].upper().startswith(EXPLAINABLE)
+        )
+        self.schedule(self.save(entry, statement if explain else None, parameters))
+
+    def schedule(self, coro: Coroutine) -> None:
+        # cursor events run inside the greenlet of an awaiting coroutine, so the loop is running
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            coro.close()
+            return
+        task = loop.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def get_client(self):
+        # slow queries are rare: a client per write, no pool bound to a particular loop
+        from redis.asyncio import Redis
+        return Redis(**self.redis_kwargs)
+
+    async def save(self, entry: dict[str, Any], statement: str | None, parameters: Any) -> None:
+        analyze = statement is not None and is_analyzable(statement)
+        plan = await self.explain(statement, parameters, analyze) if statement is not None else None
+        try:
+            async with self.get_client() as client:
+                async with client.pipeline(transaction=False) as pipe:
+                    pipe.lpush(self.entries_key, orjson.dumps(entry))
+                    pipe.ltrim(self.entries_key, 0, self.log_size - 1)
+                    if plan is not None:
+                        pipe.hset(self.plans_key, entry["fingerprint"], orjson.dumps({
+                            "time": entry["time"],
+                            "duration_ms": entry["duration_ms"],
+                            "parameters": entry["parameters"],
+                            "analyze": analyze,
+                            "plan": plan,
+                        }))
+                    await pipe.execute()
+        except Exception as exc:
+            logger.warning("Slow query was not saved: %s" % exc)
+
+    async def explain(self, statement: str, parameters: Any, analyze: bool) -> Any:
+        self.explains += 1
+        try:
+            async with self.engine.connect() as conn:
+                conn = await conn.execution_options(slow_query_log=False)
+                async with conn.begin() as transaction:
+                    await conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+                    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+                    plan = (await conn.exec_driver_sql(f"EXPLAIN ({options}) {statement}", parameters)).scalar()
+                    await transaction.rollback()
+            return orjson.loads(plan) if isinstance(plan, (str, bytes)) else plan
+        except Exception as exc:
+            logger.warning("EXPLAIN of a slow query failed: %s" % exc)
+            return None
+        finally:
+            self.explains -= 1
+
+    async def get_report(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """
+        Записи журнала, сгруппированные по отпечатку: число, p50/p95/p99/max, суммарное время,
+        методы и маршруты, последний план. Сначала отпечатки с наибольшим суммарным временем.
+        """
+        async with self.get_client() as client:
+            entries = [orjson.loads(raw) for raw in await client.lrange(self.entries_key, 0, -1)]
+            plans = {key.decode(): orjson.loads(raw) for key, raw in (await client.hgetall(self.plans_key)).items()}
+
+        groups: dict[str, list[dict[str, Any]]] = {}
+        for entry in entries:
+            groups.setdefault(entry["fingerprint"], []).append(entry)
+
+        report = []
+        for fingerprint, group in groups.items():
+            durations = sorted(entry["duration_ms"] for entry in group)
+            # entries are newest first
+            report.append({
+                "fingerprint": fingerprint,
+                "statement": group[0]["statement"],
+                "count": len(group),
+                "p50_ms": get_percentile(durations, 50),
+                "p95_ms": get_percentile(durations, 95),
+                "p99_ms": get_percentile(durations, 99),
+                "max_ms": durations[-1],
+                "total_ms": round(sum(durations), 2),
+                "callers": dict(Counter(entry["caller"] for entry in group).most_common()),
+                "routes": dict(Counter(entry["route"] for entry in group).most_common()),
+                "last_seen": group[0]["time"],
+                "last_parameters": group[0]["parameters"],
+                "plan": plans.get(fingerprint),
+            })
+        report.sort(key=lambda item: item["total_ms"], reverse=True)
+        return report[:limit] if limit else report
+
+    async def clear(self) -> None:
+        async with self.get_client() as client:
+            await client.delete(self.entries_key, self.plans_key)
+
+
+class RequestContextMiddleware:
+    """
+    ASGI middleware: scope текущего HTTP-запроса в contextvar `current_request`,
+    чтобы записи журнала знали маршрут.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = current_request.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request.reset(token)
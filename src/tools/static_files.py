@@ -0,0 +1,203 @@
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import stat
+from typing import Iterable
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+try:
+    import brotli
+except ImportError:     # .br variants are not generated, gzip only
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+
+
+COMPRESSIBLE_EXTENSIONS = {".js", ".css", ".html", ".svg", ".json", ".map", ".txt", ".xml"}
+
+# preferred order
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+HASH_LENGTH = 12
+HASHED_NAME = re.compile(rf"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{{{HASH_LENGTH}}})(?P<suffix>\.[A-Za-z0-9]+)$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def get_file_hash(file_path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        while chunk := file.read(1024 * 1024):
+            hasher.update(chunk)
+    return hasher.hexdigest()[:HASH_LENGTH]
+
+
+def is_compressible(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def write_atomically(file_path: str, content: bytes) -> None:
+    tmp_path = f"{file_path}.part"
+    with open(tmp_path, "wb") as file:
+        file.write(content)
+    os.replace(tmp_path, file_path)
+
+
+def precompress_file(file_path: str) -> list[str]:
+    """
+    Пишет рядом с файлом `.gz` (и `.br`, если установлен brotli) с максимальной степенью сжатия.
+    Уже существующие и не устаревшие варианты не пересоздаются.
+    """
+    source_mtime = os.stat(file_path).st_mtime
+    content = None
+    written = []
+    for encoding, suffix in ENCODINGS:
+        if encoding == "br" and brotli is None:
+            continue
+        compressed_path = file_path + suffix
+        if os.path.exists(compressed_path) and os.stat(compressed_path).st_mtime >= source_mtime:
+            continue
+        if content is None:
+            with open(file_path, "rb") as file:
+                content = file.read()
+        if encoding == "br":
+            write_atomically(compressed_path, brotli.compress(content, quality=11))
+        else:
+            write_atomically(compressed_path, gzip.compress(content, compresslevel=9, mtime=0))
+        written.append(compressed_path)
+    return written
+
+
+def iter_files(directory: str) -> Iterable[str]:
+    for root, _, files in os.walk(directory):
+        for file_name in files:
+            if file_name.endswith((".gz", ".br", ".part")):
+                continue
+            yield os.path.join(root, file_name)
+
+
+def precompress_directory(directory: str) -> list[str]:
+    written = []
+    for file_path in iter_files(directory):
+        if is_compressible(file_path):
+            written.extend(precompress_file(file_path))
+    if written:
+        logger.info("Precompressed %s file(s) in %r" % (len(written), directory))
+    return written
+
+
+def get_accepted_encodings(headers: Headers) -> set[str]:
+    accepted = set()
+    for item in headers.get("accept-encoding", "").split(","):
+        encoding, _, params = item.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if encoding:
+            accepted.add(encoding.strip().lower())
+    if "*" in accepted:
+        accepted.update(encoding for encoding, _ in ENCODINGS)
+    return accepted
+
+
+class HashedStaticFiles(StaticFiles):
+    """
+    StaticFiles с хэшированными URL, долгим кэшированием и предсжатыми вариантами.
+
+    - `url_path("js/app.js")` -> `js/app.<hash>.js`; запрос по актуальному хэшу
+      отдается с `Cache-Control: immutable`, по исходному имени - с `no-cache`
+      (клиент перепроверяет по ETag и получает 304).
+    - пути из `immutable_prefixes` уже адресуются содержимым (media/images),
+      они кэшируются навсегда без манифеста.
+    - для сжимаемых типов отдается `.br`/`.gz` рядом с файлом, выбранный по Accept-Encoding.
+    ETag, If-None-Match и Range обрабатывает FileResponse.
+    """
+
+    def __init__(
+            self,
+            *args,
+            hashed_urls: bool = True,
+            precompress: bool = False,
+            immutable_prefixes: tuple[str, ...] = (),
+            **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.immutable_prefixes = immutable_prefixes
+        # relative path -> content hash
+        self.manifest: dict[str, str] = {}
+
+        if self.directory and os.path.isdir(self.directory):
+            if precompress:
+                precompress_directory(str(self.directory))
+            if hashed_urls:
+                self.build_manifest()
+
+    def build_manifest(self) -> None:
+        directory = str(self.directory)
+        self.manifest = {
+            os.path.relpath(file_path, directory).replace(os.sep, "/"): get_file_hash(file_path)
+            for file_path in iter_files(directory)
+        }
+
+    def url_path(self, path: str) -> str:
+        path = path.lstrip("/")
+        file_hash = self.manifest.get(path)
+        if not file_hash:
+            return path
+        stem, suffix = os.path.splitext(path)
+        return f"{stem}.{file_hash}{suffix}"
+
+    def is_immutable_path(self, path: str) -> bool:
+        return bool(self.immutable_prefixes) and path.startswith(self.immutable_prefixes)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        path = path.replace(os.sep, "/")
+        immutable = self.is_immutable_path(path)
+        if not immutable and (match := HASHED_NAME.match(path)):
+            original = f"{match['stem']}{match['suffix']}"
+            if original in self.manifest:
+                path = original
+                # outdated hash gets current content, but must not be cached forever
+                immutable = self.manifest[original] == match["hash"]
+
+        response = await self.get_encoded_response(path, scope)
+        if response.status_code in (200, 206, 304):
+            response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+        return response
+
+    async def get_encoded_response(self, path: str, scope: Scope) -> Response:
+        if not is_compressible(path):
+            return await super().get_response(path, scope)
+
+        accepted = get_accepted_encodings(Headers(scope=scope))
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                response = self.file_response(full_path, stat_result, scope)
+                media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                if media_type.startswith("text/"):
+                    media_type += "; charset=utf-8"
+                response.headers["content-type"] = media_type
+                response.headers["content-encoding"] = encoding
+                response.headers["vary"] = "Accept-Encoding"
+                return response
+
+        response = await super().get_response(path, scope)
+        response.headers["vary"] = "Accept-Encoding"
+        return response
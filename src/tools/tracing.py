@@ -0,0 +1,494 @@
+import functools
+import inspect
+import logging
+import os
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Iterator, Literal
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+SpanKind = Literal["internal", "server", "client", "producer", "consumer"]
+
+# OTLP enums
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3, "producer": 4, "consumer": 5}
+STATUS_OK, STATUS_ERROR = 1, 2
+
+MAX_STATEMENT_LENGTH = 1000
+
+
+class Span:
+    """
+    Участок трассы. Несэмплированные спаны (`sampled=False`) только переносят контекст
+    (trace_id, решение сэмплирования) и не экспортируются.
+    """
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "name", "kind", "sampled",
+        "start_ns", "end_ns", "attributes", "status", "status_message",
+    )
+
+    def __init__(
+            self,
+            name: str,
+            trace_id: str,
+            parent_id: str | None = None,
+            kind: SpanKind = "internal",
+            sampled: bool = True,
+            attributes: dict[str, Any] | None = None,
+    ):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.sampled = sampled
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.attributes: dict[str, Any] = attributes or {}
+        self.status = STATUS_OK
+        self.status_message = ""
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.sampled:
+            self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status = STATUS_ERROR
+        self.status_message = f"{type(exc).__name__}: {exc}"[:500]
+        self.set_attribute("exception.type", type(exc).__name__)
+
+    def end(self) -> None:
+        self.end_ns = time.time_ns()
+        if self.sampled:
+            tracer.export(self)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": "error" if self.status == STATUS_ERROR else "ok",
+            "status_message": self.status_message,
+            "attributes": self.attributes,
+        }
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str, bool] | None:
+    # 00-<trace_id>-<parent_id>-<flags>
+    parts = (value or "").strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+# innermost @traced callable, known with tracing disabled too (slow query log)
+current_operation: ContextVar[str | None] = ContextVar("current_operation", default=None)
+
+
+# exporters
+
+class FileExporter:
+    """
+    Спаны построчно в JSON (JSON Lines), по одному объекту на спан.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: list[Span]) -> None:
+        with open(self.path, "ab") as file:
+            file.write(b"".join(orjson.dumps(span.as_dict(), option=orjson.OPT_APPEND_NEWLINE) for span in spans))
+
+
+class OtlpHttpExporter:
+    """
+    Отправка в коллектор по OTLP/HTTP в JSON-кодировке (`POST /v1/traces`).
+    """
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    @staticmethod
+    def get_value(value: Any) -> dict[str, Any]:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def get_span(self, span: Span) -> dict[str, Any]:
+        result = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": SPAN_KINDS[span.kind],
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": key, "value": self.get_value(value)} for key, value in span.attributes.items()],
+            "status": {"code": span.status, "message": span.status_message},
+        }
+        if span.parent_id:
+            result["parentSpanId"] = span.parent_id
+        return result
+
+    def export(self, spans: list[Span]) -> None:
+        body = {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": self.service_name}},
+                ]},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [self.get_span(span) for span in spans],
+                }],
+            }],
+        }
+        request = urllib.request.Request(
+            self.endpoint,
+            data=orjson.dumps(body),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class Tracer:
+    """
+    Трассировщик процесса: решение о сэмплировании корневых спанов и пакетный экспорт.
+
+    - корневой спан сэмплируется с вероятностью `sample_ratio`, дочерние (в том числе
+      продолженные по заголовку traceparent) наследуют решение родителя;
+    - законченные спаны копятся в буфере и выгружаются фоновым потоком раз в `export_interval`
+      секунд или по заполнении `batch_size`; поток запускается лениво и заново после fork
+      (prefork-воркеры Celery);
+    - при переполнении буфера (`max_queue_size`) новые спаны отбрасываются, запросы не ждут экспорта.
+    """
+
+    def __init__(self):
+        self.enabled: bool = False
+        self.sample_ratio: float = 1.0
+        self.exporter: FileExporter | OtlpHttpExporter | None = None
+        self.batch_size: int = 512
+        self.max_queue_size: int = 10_000
+        self.export_interval: float = 5.0
+
+        self.queue: list[Span] = []
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.pid: int | None = None
+        self.dropped: int = 0
+
+    def configure(
+            self,
+            exporter: FileExporter | OtlpHttpExporter,
+            sample_ratio: float = 1.0,
+            batch_size: int = 512,
+            max_queue_size: int = 10_000,
+            export_interval: float = 5.0,
+    ) -> None:
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+        self.batch_size = batch_size
+        self.max_queue_size = max_queue_size
+        self.export_interval = export_interval
+        self.enabled = True
+
+    def should_sample(self) -> bool:
+        return self.sample_ratio >= 1.0 or random.random() < self.sample_ratio
+
+    def export(self, span: Span) -> None:
+        with self.lock:
+            if len(self.queue) >= self.max_queue_size:
+                self.dropped += 1
+                return
+            self.queue.append(span)
+            full = len(self.queue) >= self.batch_size
+        self.ensure_worker()
+        if full:
+            self.wakeup.set()
+
+    def ensure_worker(self) -> None:
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.pid = os.getpid()
+            threading.Thread(target=self.run, name="tracing-exporter", daemon=True).start()
+
+    def run(self) -> None:
+        while True:
+            self.wakeup.wait(self.export_interval)
+            self.wakeup.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        while True:
+            with self.lock:
+                batch, self.queue = self.queue[:self.batch_size], self.queue[self.batch_size:]
+                dropped, self.dropped = self.dropped, 0
+            if dropped:
+                logger.warning("%s span(s) dropped, export queue is full" % dropped)
+            if not batch:
+                return
+            try:
+                self.exporter.export(batch)
+            except Exception as exc:
+                logger.warning("%s span(s) not exported: %s" % (len(batch), exc))
+                return
+
+
+tracer = Tracer()
+
+
+def begin_span(
+        name: str,
+        kind: SpanKind = "internal",
+        attributes: dict[str, Any] | None = None,
+        traceparent: str | None = None,
+) -> Span | None:
+    """
+    Создает спан без установки его текущим: для спанов, которые начинаются и заканчиваются
+    в разных обработчиках событий. Возвращает None, если трассировка выключена
+    или родитель не сэмплирован.
+    """
+    if not tracer.enabled:
+        return None
+    parent = current_span.get()
+    if parent is None and (remote := parse_traceparent(traceparent)):
+        trace_id, parent_id, sampled = remote
+    elif parent is None:
+        trace_id, parent_id, sampled = os.urandom(16).hex(), None, tracer.should_sample()
+    elif not parent.sampled:
+        return None
+    else:
+        trace_id, parent_id, sampled = parent.trace_id, parent.span_id, True
+    return Span(
+        name=name, trace_id=trace_id, parent_id=parent_id, kind=kind, sampled=sampled,
+        attributes=attributes if sampled else None,
+    )
+
+
+@contextmanager
+def start_span(
+        name: str,
+        kind: SpanKind = "internal",
+        attributes: dict[str, Any] | None = None,
+        traceparent: str | None = None,
+) -> Iterator[Span | None]:
+    """
+    Спан, текущий внутри блока. Исключения записываются в спан и пробрасываются дальше.
+    """
+    span = begin_span(name=name, kind=kind, attributes=attributes, traceparent=traceparent)
+    if span is None:
+        yield current_span.get()
+        return
+    token = current_span.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.record_exception(exc)
+        raise
+    finally:
+        current_span.reset(token)
+        span.end()
+
+
+def get_traceparent() -> str | None:
+    span = current_span.get()
+    return span.traceparent if span is not None else None
+
+
+async def with_current_span(coro: Coroutine, span: Span | None) -> Any:
+    """
+    Выполняет корутину с заданным текущим спаном: для корутин, запускаемых в другом
+    потоке или event loop (`run_coroutine_threadsafe` не переносит contextvars).
+    """
+    token = current_span.set(span)
+    try:
+        return await coro
+    finally:
+        current_span.reset(token)
+
+
+def wrap_function(func: Callable, name: str) -> Callable:
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            token = current_operation.set(name)
+            try:
+                if not tracer.enabled:
+                    return await func(*args, **kwargs)
+                with start_span(name, attributes={"code.function": name}):
+                    return await func(*args, **kwargs)
+            finally:
+                current_operation.reset(token)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = current_operation.set(name)
+        try:
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with start_span(name, attributes={"code.function": name}):
+                return func(*args, **kwargs)
+        finally:
+            current_operation.reset(token)
+    return wrapper
+
+
+def traced(target: type | Callable) -> type | Callable:
+    """
+    Декоратор класса или функции: каждый вызов - спан `Class.method` / `function`.
+
+    Для класса оборачиваются методы, объявленные в нем самом (обычные, async, static и class),
+    кроме dunder-методов и генераторов. При выключенной трассировке обертка только
+    отмечает метод в `current_operation` и вызывает его.
+    """
+    if not inspect.isclass(target):
+        return wrap_function(target, target.__qualname__)
+
+    for attr, value in list(vars(target).items()):
+        if attr.startswith("__"):
+            continue
+        decorator = type(value) if isinstance(value, (staticmethod, classmethod)) else None
+        func = value.__func__ if decorator else value
+        if not inspect.isfunction(func) or inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func):
+            continue
+        wrapped = wrap_function(func, f"{target.__name__}.{attr}")
+        setattr(target, attr, decorator(wrapped) if decorator else wrapped)
+    return target
+
+
+# SQLAlchemy
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    span = begin_span("db.query", kind="client", attributes={
+        "db.system": "postgresql",
+        "db.statement": statement[:MAX_STATEMENT_LENGTH],
+    })
+    conn.info.setdefault("trace_spans", []).append(span)
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    spans = conn.info.get("trace_spans")
+    span = spans.pop() if spans else None
+    if span is not None:
+        span.set_attribute("db.rows", getattr(cursor, "rowcount", -1))
+        span.end()
+
+
+def handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    spans = connection.info.get("trace_spans") if connection is not None else None
+    span = spans.pop() if spans else None
+    if span is not None:
+        span.record_exception(exception_context.original_exception)
+        span.end()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    if event.contains(engine.sync_engine, "after_cursor_execute", after_cursor_execute):
+        return
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
+
+
+# Redis
+
+def instrument_redis() -> None:
+    from redis.asyncio.client import Redis, Pipeline
+
+    if getattr(Redis.execute_command, "traced", False):
+        return
+
+    def wrap(method, get_attributes):
+        # keeps the guard attributes of the other wrappers
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            if not tracer.enabled or current_span.get() is None:
+                return await method(self, *args, **kwargs)
+            attributes = {"db.system": "redis", **get_attributes(self, args)}
+            with start_span(f"redis {attributes['db.operation']}", kind="client", attributes=attributes):
+                return await method(self, *args, **kwargs)
+        wrapper.traced = True
+        return wrapper
+
+    # command names only, arguments may hold session data
+    Redis.execute_command = wrap(
+        Redis.execute_command, lambda client, args: {"db.operation": str(args[0]) if args else ""},
+    )
+    Pipeline.execute = wrap(
+        Pipeline.execute, lambda pipe, args: {"db.operation": "PIPELINE", "db.commands": len(pipe.command_stack)},
+    )
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware: серверный спан на каждый HTTP-запрос.
+
+    Продолжает трассу из заголовка `traceparent`, имя спана - метод и шаблон маршрута;
+    идентификатор трассы сэмплированных запросов отдается в заголовке `X-Trace-Id`.
+    """
+
+    def __init__(self, app: ASGIApp, excluded_paths: tuple[str, ...] = ()):
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracer.enabled or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        with start_span(
+                f"{scope['method']} {scope['path']}",
+                kind="server",
+                attributes={"http.method": scope["method"], "http.target": scope["path"]},
+                traceparent=Headers(scope=scope).get("traceparent"),
+        ) as span:
+
+            async def send_with_trace_id(message: Message) -> None:
+                if message["type"] == "http.response.start" and span is not None and span.sampled:
+                    MutableHeaders(scope=message).append("X-Trace-Id", span.trace_id)
+                    span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace_id)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if span is not None and route:
+                    span.name = f"{scope['method']} {route}"
+                    span.set_attribute("http.route", route)